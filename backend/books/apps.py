@@ -5,3 +5,7 @@ class BooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
     verbose_name = "книги"
+
+    def ready(self):
+        # Connect signal handlers:
+        from . import signals  # noqa: F401
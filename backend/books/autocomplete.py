@@ -0,0 +1,205 @@
+"""
+In-memory prefix indexes used by autocomplete endpoint for authors, publishers and tags.
+
+Every process keeps its own copy of each index. Indexes are rebuilt lazily, when the version stored in Django cache
+changes - it is bumped by signal handlers in `books/signals.py` when indexed objects are saved or deleted.
+NB: use shared cache backend (not `LocMemCache`) to propagate invalidation to all workers.
+"""
+import bisect
+import itertools
+import re
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from django.core.cache import cache
+from django.db.models import Model
+
+from .models import Author, Publisher, Tag
+from .search import DEFAULT_SIMILARITY_THRESHOLD, fuzzy_search
+
+# Default and maximal number of results returned by `PrefixIndex.search()`
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+# Fuzzy search in DB is only used for queries of at least this length, when there are no prefix matches
+MIN_FUZZY_QUERY_LENGTH = 3
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for case-insensitive matching ("Ёж" matches "еж").
+    """
+    return text.casefold().replace("ё", "е")
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Split normalized text into words.
+    """
+    return re.findall(r"[^\W_]+", normalize(text))
+
+
+class PrefixIndex:
+    """
+    Sorted list of words of object labels, searched by prefix using binary search.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        fields: List[str],
+        label: Callable[[Model], str],
+    ):
+        """
+        :param model: indexed model;
+        :param fields: model fields used to build labels, also used for fuzzy search;
+        :param label: function returning display label for the model instance (with only `fields` loaded).
+        """
+        self.model = model
+        self.fields = fields
+        self.label = label
+        self.version = None
+        self._lock = threading.Lock()
+        # Pair of:
+        # - all labels by `pk`, sorted by label;
+        # - sorted `(word, label, pk)` tuples.
+        self._data: Tuple[Dict[int, str], List[Tuple[str, str, int]]] = ({}, [])
+
+    @property
+    def version_cache_key(self) -> str:
+        return "autocomplete:{model}:version".format(model=self.model._meta.label_lower)
+
+    def invalidate(self) -> None:
+        """
+        Mark index outdated in all processes.
+        """
+        cache.set(self.version_cache_key, uuid.uuid4().hex, None)
+
+    def ensure_fresh(self) -> None:
+        """
+        Rebuild the index if it was invalidated since it was built.
+        """
+        version = cache.get(self.version_cache_key)
+
+        if version is not None and version == self.version:
+            return
+
+        with self._lock:
+            if version is None:
+                version = uuid.uuid4().hex
+                cache.add(self.version_cache_key, version, None)
+                version = cache.get(self.version_cache_key, version)
+
+            if version != self.version:
+                self._build()
+                self.version = version
+
+    def _build(self) -> None:
+        """
+        Load all objects from DB and build sorted list of words.
+        """
+        labels = {
+            instance.pk: self.label(instance)
+            for instance in self.model.objects.only("pk", *self.fields)
+        }
+        words = sorted(
+            (word, label, pk)
+            for pk, label in labels.items()
+            for word in split_words(label)
+        )
+        # Swap reference - concurrent searches see either old or new index, never partially built one.
+        self._data = (dict(sorted(labels.items(), key=lambda item: item[1])), words)
+
+    def search(self, query: str, limit: int = DEFAULT_AUTOCOMPLETE_LIMIT) -> List[dict]:
+        """
+        Return up to `limit` objects, whose labels contain words starting with each of `query` words.
+        If nothing found, fall back to fuzzy search in DB.
+        """
+        self.ensure_fresh()
+        labels, words = self._data
+        query_words = split_words(query)
+
+        if not query_words:
+            return [
+                {"id": pk, "label": label}
+                for pk, label in itertools.islice(labels.items(), limit)
+            ]
+
+        first_word, other_words = query_words[0], query_words[1:]
+        results = []
+        found = set()
+
+        position = bisect.bisect_left(words, (first_word,))
+        while position < len(words) and len(results) < limit:
+            word, label, pk = words[position]
+            position += 1
+
+            if not word.startswith(first_word):
+                break
+            if pk in found:
+                continue
+            if other_words:
+                label_words = split_words(label)
+                if not all(
+                    any(label_word.startswith(query_word) for label_word in label_words)
+                    for query_word in other_words
+                ):
+                    continue
+
+            found.add(pk)
+            results.append({"id": pk, "label": label})
+
+        if not results and len(query.strip()) >= MIN_FUZZY_QUERY_LENGTH:
+            results = self.fuzzy_search(query, limit)
+
+        return results
+
+    def fuzzy_search(self, query: str, limit: int) -> List[dict]:
+        """
+        Find objects similar to `query` in DB (uses trigram indexes).
+        """
+        queryset = fuzzy_search(
+            self.model.objects.only("pk", *self.fields),
+            query,
+            fields=self.fields,
+            threshold=DEFAULT_SIMILARITY_THRESHOLD,
+        )
+        return [
+            {"id": instance.pk, "label": self.label(instance)}
+            for instance in queryset[:limit]
+        ]
+
+
+AUTOCOMPLETE_INDEXES = {
+    "authors": PrefixIndex(
+        model=Author,
+        fields=["last_name", "first_name", "middle_name"],
+        label=lambda author: author.full_name,
+    ),
+    "publishers": PrefixIndex(
+        model=Publisher,
+        fields=["title"],
+        label=lambda publisher: publisher.title,
+    ),
+    "tags": PrefixIndex(
+        model=Tag,
+        fields=["title"],
+        label=lambda tag: tag.title,
+    ),
+}
+
+
+def get_index(kind: str) -> Optional[PrefixIndex]:
+    """
+    Return autocomplete index by its name used in URL.
+    """
+    return AUTOCOMPLETE_INDEXES.get(kind)
+
+
+def invalidate_index(model: Type[Model]) -> None:
+    """
+    Mark indexes of `model` outdated.
+    """
+    for index in AUTOCOMPLETE_INDEXES.values():
+        if index.model is model:
+            index.invalidate()
@@ -0,0 +1,133 @@
+"""
+Conditional GET for detail and list views: responses carry `ETag` and `Last-Modified` validators, and requests
+with matching `If-None-Match` get `304 Not Modified` without serializing objects.
+
+Validators are computed with single aggregate query over objects the response is built from (the object of
+the detail view, filtered objects of the list view - all of them, not only the page): maximal `updated` timestamps
+of the objects and related objects (e.g. items of the list and their books), and numbers of the objects - deleted
+objects don't change maximal timestamps. Orders of objects (e.g. items of the list), which change without
+`updated` timestamps (moves save only `order`), are accounted for by hash of `(pk, order)` pairs. Related models without timestamps (authors, publishers, tags, users,
+many-to-many relations) are accounted for by their versions, see `books/response_cache.py`. The ETag also depends
+on the URL, the user and the rendered format.
+
+NB: `If-Modified-Since` alone never gets `304`: `Last-Modified` (maximal timestamp) isn't changed by deleted objects
+and related objects without timestamps, so the ETag is the only reliable validator.
+"""
+import datetime
+import hashlib
+from typing import Callable, List, Optional, Tuple, Type
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import CharField, Count, Max, Model, QuerySet, Value
+from django.db.models.functions import MD5, Concat
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+from .response_cache import get_model_versions
+
+
+def get_etag(*values) -> str:
+    """
+    Return weak ETag identifying the values.
+    """
+    digest = hashlib.md5("|".join(str(value) for value in values).encode())
+    return 'W/"{digest}"'.format(digest=digest.hexdigest())
+
+
+def set_validators(response, etag: str, last_modified: Optional[datetime.datetime]):
+    if response.status_code not in (200, 304):
+        return response
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Set `ETag` and `Last-Modified` of GET responses, respond `304 Not Modified` to requests with matching
+    `If-None-Match`.
+    """
+
+    # Timestamps of objects and related objects (lookups), which change with serialized data
+    conditional_updated_fields: List[str] = ["updated"]
+    # Numbers of objects and related objects (lookups, counted distinct) - change when objects are deleted
+    conditional_count_fields: List[str] = ["pk"]
+    # Orders of objects and related objects (lookups), which change without `updated` timestamps
+    conditional_order_fields: List[str] = []
+    # Serialized related models without `updated` timestamps
+    conditional_models: List[Type[Model]] = []
+
+    def get_conditional_queryset(self) -> QuerySet:
+        """
+        Return QuerySet of objects the response is built from: the object of detail view,
+        or filtered objects of list view.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_validators(
+        self, request: Request
+    ) -> Tuple[str, Optional[datetime.datetime]]:
+        """
+        Return ETag and last modification time of the response.
+        """
+        queryset = self.get_conditional_queryset()
+        aggregates = {
+            "updated_{index}".format(index=index): Max(field)
+            for index, field in enumerate(self.conditional_updated_fields)
+        }
+        aggregates.update(
+            {
+                "count_{index}".format(index=index): Count(field, distinct=True)
+                for index, field in enumerate(self.conditional_count_fields)
+            }
+        )
+        for index, field in enumerate(self.conditional_order_fields):
+            pk_field = field[: -len("order")] + "pk"
+            aggregates["order_{index}".format(index=index)] = MD5(
+                StringAgg(
+                    Concat(pk_field, Value(":"), field, output_field=CharField()),
+                    delimiter=",",
+                    ordering=[pk_field],
+                )
+            )
+        # Aggregated by pks, so that joins of filters (e.g. by related objects) don't limit aggregated relations.
+        values = queryset.model._default_manager.filter(
+            pk__in=queryset.order_by().values("pk")
+        ).aggregate(**aggregates)
+
+        timestamps = [
+            value
+            for key, value in values.items()
+            if key.startswith("updated_") and value is not None
+        ]
+        etag = get_etag(
+            request.get_full_path(),
+            request.user.pk,
+            request.accepted_media_type,
+            *values.values(),
+            *get_model_versions(self.conditional_models),
+        )
+        return etag, max(timestamps) if timestamps else None
+
+    def get_conditional_response(
+        self, request: Request, handler: Callable, *args, **kwargs
+    ):
+        """
+        Respond `304 Not Modified` if the client has the current response, otherwise call `handler`.
+        """
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def get(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().get, *args, **kwargs)
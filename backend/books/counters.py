@@ -0,0 +1,68 @@
+"""
+Denormalized counters: numbers of books of authors, publishers and tags (`books_count`) and of items of lists
+(`items_count`), so that they are serialized and sorted by without aggregating relations.
+
+Counters are changed by signal handlers in `books/signals.py` with `UPDATE ... SET count = count + delta` (`F()`
+expressions) in the transaction of the change: concurrent changes don't overwrite each other's counts, and counts
+are rolled back along with the change. Many-to-many relations are counted by rows actually added or removed.
+
+Changes which don't send signals (`QuerySet.update()`, raw SQL) make counters drift: bulk changes of the app
+update counters explicitly (e.g. `apply_list_operations()`), and `python manage.py recount` repairs the rest.
+"""
+from typing import Dict, Iterable, Type
+
+from django.db.models import Count, F, Model
+
+from .models import Author, Book, List, ListItem, Publisher, Tag
+from .response_cache import invalidate_model_responses
+
+# Model -> (counter field, counted relation)
+COUNTERS = {
+    Author: ("books_count", "books"),
+    Publisher: ("books_count", "books"),
+    Tag: ("books_count", "books"),
+    List: ("items_count", "items"),
+}
+# Model -> foreign key to the model with counter
+COUNTED_FOREIGN_KEYS = {
+    Book: "publisher",
+    ListItem: "list",
+}
+
+
+def change_counter(model: Type[Model], pks: Iterable[int], delta: int) -> None:
+    """
+    Add `delta` to the counter of objects with `pks`.
+    """
+    pks = [pk for pk in pks if pk is not None]
+    if not pks or not delta:
+        return
+    field = COUNTERS[model][0]
+    model._default_manager.filter(pk__in=pks).update(**{field: F(field) + delta})
+    # Updates don't send signals.
+    invalidate_model_responses(model)
+
+
+def recount(model: Type[Model]) -> int:
+    """
+    Set counters of the model to actual numbers of related objects, return number of repaired objects.
+    """
+    field, relation = COUNTERS[model]
+    drifted = list(
+        model._default_manager.annotate(actual_count=Count(relation))
+        .exclude(**{field: F("actual_count")})
+        .order_by()
+    )
+    for instance in drifted:
+        setattr(instance, field, instance.actual_count)
+    if drifted:
+        model._default_manager.bulk_update(drifted, [field])
+        invalidate_model_responses(model)
+    return len(drifted)
+
+
+def recount_all() -> Dict[Type[Model], int]:
+    """
+    Repair counters of all models, return numbers of repaired objects by models.
+    """
+    return {model: recount(model) for model in COUNTERS}
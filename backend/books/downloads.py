@@ -0,0 +1,194 @@
+"""
+Delivery of book files (`Book.file`) with access control, see `BookDownloadView`.
+
+Access is checked by Django, but the file itself is sent, depending on `BOOK_FILES_DELIVERY` setting:
+
+- "x-accel-redirect": by nginx, from internal location `BOOK_FILES_ACCEL_REDIRECT_LOCATION` (production);
+- "x-sendfile": by Apache / lighttpd with `mod_xsendfile`;
+- "django": by Django, `FileResponse` with HTTP Range requests support (development).
+
+Links to files can't carry `Authorization` header, so files are downloaded with signed links, which expire in
+`BOOK_DOWNLOAD_LINK_MAX_AGE` seconds - see `get_download_url()`.
+"""
+import mimetypes
+import os
+import re
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import content_disposition_header, http_date
+from rest_framework.request import Request
+
+BOOK_FILES_DELIVERY_DJANGO = "django"
+BOOK_FILES_DELIVERY_X_ACCEL_REDIRECT = "x-accel-redirect"
+BOOK_FILES_DELIVERY_X_SENDFILE = "x-sendfile"
+
+DOWNLOAD_SIGNATURE_PARAM = "signature"
+DOWNLOAD_SIGNATURE_SALT = "books.downloads"
+
+# Size of chunks read from the file when serving HTTP Range request
+RANGE_CHUNK_SIZE = 64 * 1024
+# Only single range is supported, e.g. "bytes=0-1023", "bytes=1024-", "bytes=-512"
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    Requested byte range is outside of the file.
+    """
+
+
+def get_file_url(book_pk: int) -> str:
+    """
+    Return unsigned API URL of the book's file (for staff users, see `BookDownloadView`), served instead of
+    the storage URL, which isn't accessible.
+    """
+    return reverse("book-download", kwargs={"pk": book_pk})
+
+
+def get_download_url(book_pk: int) -> str:
+    """
+    Return signed link to download the book's file. The link expires in `BOOK_DOWNLOAD_LINK_MAX_AGE` seconds.
+    """
+    signature = signing.TimestampSigner(salt=DOWNLOAD_SIGNATURE_SALT).sign(str(book_pk))
+    return "{url}?{param}={signature}".format(
+        url=get_file_url(book_pk),
+        param=DOWNLOAD_SIGNATURE_PARAM,
+        signature=quote(signature),
+    )
+
+
+def is_download_signature_valid(book_pk: int, signature: Optional[str]) -> bool:
+    """
+    Check signature of the link returned by `get_download_url()`.
+    """
+    if not signature:
+        return False
+    try:
+        value = signing.TimestampSigner(salt=DOWNLOAD_SIGNATURE_SALT).unsign(
+            signature, max_age=settings.BOOK_DOWNLOAD_LINK_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return value == str(book_pk)
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Return first and last byte positions (inclusive) requested by HTTP `Range` header, or `None` if the whole file
+    should be sent (no header, unsupported or multiple ranges). Raise `RangeNotSatisfiable` if the range is outside
+    of the file.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def read_range(file, start: int, end: int) -> Iterator[bytes]:
+    """
+    Yield bytes from `start` to `end` (inclusive) of the file, then close it.
+    """
+    try:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def file_response(request: Request, file: FieldFile, content_type: str) -> HttpResponse:
+    """
+    Send the file by Django, supporting single range HTTP Range requests (and `If-Range` with date).
+    """
+    storage, name = file.storage, file.name
+    size = storage.size(name)
+    last_modified = http_date(storage.get_modified_time(name).timestamp())
+
+    byte_range = None
+    if request.headers.get("If-Range", last_modified) == last_modified:
+        try:
+            byte_range = parse_range_header(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = "bytes */{size}".format(size=size)
+            return response
+
+    if byte_range is None:
+        response = FileResponse(storage.open(name, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(storage.open(name, "rb"), start, end),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = "bytes {start}-{end}/{size}".format(
+            start=start, end=end, size=size
+        )
+
+    response["Accept-Ranges"] = "bytes"
+    response["Last-Modified"] = last_modified
+    return response
+
+
+def serve_file(
+    request: Request, file: FieldFile, filename: str, as_attachment: bool = False
+) -> HttpResponse:
+    """
+    Return response sending the file, using method set by `BOOK_FILES_DELIVERY` setting.
+    `filename` is suggested to the browser for saving the file.
+    """
+    content_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+    delivery = settings.BOOK_FILES_DELIVERY
+
+    if delivery == BOOK_FILES_DELIVERY_X_ACCEL_REDIRECT:
+        # nginx sends the file (supporting Range requests) with headers set here.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(
+            settings.BOOK_FILES_ACCEL_REDIRECT_LOCATION + file.name
+        )
+    elif delivery == BOOK_FILES_DELIVERY_X_SENDFILE:
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = file.path
+    else:
+        response = file_response(request, file, content_type)
+
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment, filename
+    )
+    return response
+
+
+def get_download_filename(title: str, name: str) -> str:
+    """
+    Return file name for the downloaded book file: book's title with the extension of the stored file.
+    """
+    return title.strip() + os.path.splitext(name)[1]
@@ -0,0 +1,315 @@
+"""
+Sparse fieldsets: let API clients choose which fields to get, using `?fields=` / `?omit=` GET parameters.
+
+Examples:
+- `?fields=id,title,authors.last_name` - only book's id, title and last names of its authors;
+- `?omit=user,tags,authors.middle_name` - everything except listed fields.
+
+`SparseFieldsetsSerializerMixin` prunes the serializer tree, `SparseFieldsetsViewMixin` prunes the QuerySet:
+unused `select_related()` / `prefetch_related()` lookups are skipped and unused columns are deferred with `.only()`.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from django.utils.functional import cached_property
+from imagekit.models import ImageSpecField
+from rest_framework import serializers
+
+# Parsed fieldset: field name -> nested fieldset, or `None` meaning "the whole field".
+Fieldset = Dict[str, Optional["Fieldset"]]
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def parse_fieldset(value: str) -> Fieldset:
+    """
+    Parse comma-separated list of dotted field paths into tree, e.g.
+    "id,authors.last_name" -> `{"id": None, "authors": {"last_name": None}}`.
+    """
+    fieldset = {}
+
+    for path in value.split(","):
+        names = [name.strip() for name in path.split(".")]
+        if not all(names):
+            continue
+
+        node = fieldset
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                # The whole field is already requested
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    return fieldset
+
+
+def get_nested_serializer(field) -> Optional[serializers.Serializer]:
+    """
+    Return nested serializer for `field` (unwrapping `many=True`), or `None` if field isn't a serializer.
+    """
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.Serializer):
+        return field
+    return None
+
+
+def keep_fields(serializer: serializers.Serializer, fieldset: Fieldset) -> None:
+    """
+    Remove fields not listed in `fieldset` from `serializer`, recursively.
+    """
+    for field_name in list(serializer.fields.keys()):
+        if field_name not in fieldset:
+            del serializer.fields[field_name]
+            continue
+
+        nested = get_nested_serializer(serializer.fields[field_name])
+        if nested is not None and fieldset[field_name] is not None:
+            keep_fields(nested, fieldset[field_name])
+
+
+def omit_fields(serializer: serializers.Serializer, fieldset: Fieldset) -> None:
+    """
+    Remove fields listed in `fieldset` from `serializer`, recursively.
+    """
+    for field_name, nested_fieldset in fieldset.items():
+        if field_name not in serializer.fields:
+            continue
+
+        if nested_fieldset is None:
+            del serializer.fields[field_name]
+            continue
+
+        nested = get_nested_serializer(serializer.fields[field_name])
+        if nested is not None:
+            omit_fields(nested, nested_fieldset)
+
+
+class SparseFieldsetsSerializerMixin(serializers.ModelSerializer):
+    """
+    Prune serialized fields using `?fields=` / `?omit=` GET parameters of the request.
+    Only applied when the serializer is the top-level one, nested serializers are pruned by it.
+    """
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+        request = self.context.get("request")
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+
+        if request is None or parent is not None:
+            return fields
+
+        fields_param = request.query_params.get(FIELDS_PARAM)
+        omit_param = request.query_params.get(OMIT_PARAM)
+
+        if fields_param:
+            keep_fields(self, parse_fieldset(fields_param))
+        if omit_param:
+            omit_fields(self, parse_fieldset(omit_param))
+
+        return fields
+
+
+class SparseFieldsetsViewMixin:
+    """
+    Prune QuerySet using fields actually serialized, when `?fields=` / `?omit=` GET parameters are present:
+
+    - skip `select_related()` / `prefetch_related()` of relations which are not serialized;
+    - load only columns used by serialized fields.
+
+    `sparse_fieldsets_required_fields` lists fields used by the view itself, e.g. for permission checks.
+    """
+
+    sparse_fieldsets_required_fields: List[str] = []
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        query_params = self.request.query_params
+
+        if self.request.method not in ("GET", "HEAD") or not (
+            query_params.get(FIELDS_PARAM) or query_params.get(OMIT_PARAM)
+        ):
+            return queryset
+
+        return self.prune_queryset(queryset)
+
+    def prune_queryset(self, queryset: QuerySet) -> QuerySet:
+        """
+        Remove unused related lookups and defer unused columns.
+        """
+        serializer = get_nested_serializer(self.get_serializer(many=False))
+        usage = FieldUsage()
+        usage.collect_serializer(serializer, queryset.model)
+        for path in self.sparse_fieldsets_required_fields:
+            usage.collect_path(path.split("__"), queryset.model)
+        for ordering in self.get_ordering_fields(queryset):
+            names = ordering.lstrip("-").split("__")
+            if names[0] not in queryset.query.annotations:
+                usage.collect_path(names, queryset.model)
+
+        # `prefetch_related()`:
+        prefetch_lookups = []
+        for lookup in queryset._prefetch_related_lookups:
+            if isinstance(lookup, Prefetch):
+                if lookup.prefetch_to in usage.relations:
+                    prefetch_lookups.append(lookup)
+                continue
+            pruned = usage.longest_used_path(lookup)
+            if pruned and pruned not in prefetch_lookups:
+                prefetch_lookups.append(pruned)
+        queryset = queryset.prefetch_related(None).prefetch_related(*prefetch_lookups)
+
+        # `select_related()`:
+        select_related = queryset.query.select_related
+        selected = []
+        if isinstance(select_related, dict):
+            for lookup in flatten_select_related(select_related):
+                pruned = usage.longest_used_path(lookup)
+                if pruned and pruned not in selected:
+                    selected.append(pruned)
+            queryset = queryset.select_related(None)
+            if selected:
+                queryset = queryset.select_related(*selected)
+
+        # `only()`:
+        only_fields = usage.only_fields(queryset.model, selected)
+        if only_fields is not None:
+            queryset = queryset.only(*only_fields)
+
+        return queryset
+
+    def get_ordering_fields(self, queryset: QuerySet) -> List[str]:
+        """
+        Fields used to order results, they are read by paginators.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        ordering += list(getattr(self.paginator, "ordering", None) or [])
+        return [field for field in ordering if isinstance(field, str) and field != "?"]
+
+
+def flatten_select_related(select_related: dict, prefix: str = "") -> List[str]:
+    """
+    Convert `Query.select_related` tree to the list of lookups.
+    """
+    lookups = []
+    for name, nested in select_related.items():
+        path = prefix + name
+        lookups.append(path)
+        lookups += flatten_select_related(nested, path + "__")
+    return lookups
+
+
+class FieldUsage:
+    """
+    Collects model columns and relations used by serializer fields.
+    """
+
+    def __init__(self):
+        # Relation paths, e.g. "items", "items__book"
+        self.relations: Set[str] = set()
+        # Column paths, e.g. "title", "items__book__title"
+        self.columns: Set[str] = set()
+        # Relation paths (or "" for the root model), whose objects need all columns loaded
+        self.whole_objects: Set[str] = set()
+
+    def collect_serializer(
+        self, serializer: serializers.Serializer, model, prefix: Tuple[str, ...] = ()
+    ) -> None:
+        for field in serializer.fields.values():
+            if field.source == "*":
+                self.whole_objects.add("__".join(prefix))
+                continue
+
+            nested = get_nested_serializer(field)
+            if nested is not None and len(field.source_attrs) == 1:
+                related_model = self.collect_path(field.source_attrs, model, prefix)
+                if related_model is not None:
+                    self.collect_serializer(
+                        nested, related_model, prefix + tuple(field.source_attrs)
+                    )
+                else:
+                    # Possibly prefetched with `Prefetch(to_attr=...)` - keep the lookup.
+                    self.relations.add("__".join(prefix + tuple(field.source_attrs)))
+                continue
+
+            self.collect_path(field.source_attrs, model, prefix)
+
+    def collect_path(
+        self, names: List[str], model, prefix: Tuple[str, ...] = ()
+    ) -> Optional[Model]:
+        """
+        Register usage of (possibly dotted) field path of `model`.
+        Return model of the last relation in the path, or `None` if the path ends with a column.
+        """
+        for name in names:
+            path = "__".join(prefix + (name,))
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                attribute = getattr(model, name, None)
+                if isinstance(attribute, ImageSpecField):
+                    self.columns.add("__".join(prefix + (attribute.source,)))
+                else:
+                    # Property or method - can't tell which columns it uses.
+                    self.whole_objects.add("__".join(prefix))
+                return None
+
+            if not model_field.is_relation:
+                self.columns.add(path)
+                return None
+
+            self.relations.add(path)
+            if model_field.concrete and not model_field.many_to_many:
+                # Forward FK column
+                self.columns.add(path)
+            prefix += (name,)
+            model = model_field.related_model
+
+        return model
+
+    def longest_used_path(self, lookup: str) -> str:
+        """
+        Return the longest prefix of `lookup` consisting of used relations.
+        """
+        names = lookup.split("__")
+        used = []
+        for name in names:
+            if "__".join(used + [name]) not in self.relations:
+                break
+            used.append(name)
+        return "__".join(used)
+
+    def only_fields(self, model, selected: List[str]) -> Optional[List[str]]:
+        """
+        Return arguments for `QuerySet.only()` for the root model and `selected` relations,
+        or `None` if all the root model's columns are needed.
+        """
+        if "" in self.whole_objects:
+            return None
+
+        only_fields = {model._meta.pk.name}
+        prefixes = [""] + [lookup + "__" for lookup in selected]
+
+        for lookup in selected:
+            if lookup in self.whole_objects:
+                related_model = model
+                for name in lookup.split("__"):
+                    related_model = related_model._meta.get_field(name).related_model
+                only_fields.update(
+                    lookup + "__" + field.name
+                    for field in related_model._meta.concrete_fields
+                )
+
+        for column in self.columns:
+            head, _, name = column.rpartition("__")
+            if (head + "__" if head else "") in prefixes:
+                only_fields.add(column)
+
+        return sorted(only_fields)
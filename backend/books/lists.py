@@ -0,0 +1,194 @@
+"""
+Batch changes of items of the book `List`, see `ListItemBatchView`.
+
+Operations are applied in order to the list in memory: books are added (to the end or at `position`), removed
+or moved to `position` (0-based index in the list after preceding operations). Then the changes are written with
+a few queries, whatever the number of operations: removed items are deleted with single `DELETE`, new items are
+inserted with `bulk_create()`, and new orders of moved items are saved with single `bulk_update()`.
+
+None of these queries sends signals, so what signal handlers in `books/signals.py` do per item is done here once:
+the counter of the list's items is changed (`change_counter()`), and cached responses and ETags depending
+on list items are invalidated (`invalidate_model_responses()`).
+
+Orders are sparse (see `books/ordering.py`): added and moved items get orders in gaps between their neighbours,
+other items keep their orders.
+"""
+from typing import List as ListType
+
+from django.db import IntegrityError
+from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+
+from .counters import change_counter
+from .models import Book, List, ListItem
+from .ordering import get_orders_between, renumber
+from .response_cache import invalidate_model_responses
+
+OPERATION_ADD = "add"
+OPERATION_REMOVE = "remove"
+OPERATION_MOVE = "move"
+OPERATIONS = [OPERATION_ADD, OPERATION_REMOVE, OPERATION_MOVE]
+
+# Maximum number of operations in a batch
+BATCH_MAX_OPERATIONS = 1000
+# Unique constraint of `ListItem` on `(list, book)`
+LIST_BOOK_UNIQUE_CONSTRAINT = "listitem_list_book_unique"
+
+
+def get_duplicate_book_error(book_pk: int, list_pk: int) -> str:
+    return "Book pk={book} already added to the list pk={list}!".format(
+        book=book_pk, list=list_pk
+    )
+
+
+def is_duplicate_book_error(error: IntegrityError) -> bool:
+    """
+    Check if `IntegrityError` is raised by the unique constraint on `(list, book)` of `ListItem`.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == LIST_BOOK_UNIQUE_CONSTRAINT
+
+
+def delete_without_signals(queryset: QuerySet) -> int:
+    """
+    Delete objects of the QuerySet with single `DELETE`, without collecting them and without sending `pre_delete` /
+    `post_delete` signals, return number of deleted objects. Only for objects not referenced by other objects,
+    whose signal handlers' work is done by the caller.
+
+    NB: uses private `QuerySet._raw_delete()` - `QuerySet.delete()` uses it the same way for models without
+    signal handlers and relations.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def apply_list_operations(
+    list_instance: List, operations: ListType[dict]
+) -> ListType[ListItem]:
+    """
+    Apply validated operations (see `ListItemOperationSerializer`) to items of the list. Raise `ValidationError`
+    (and change nothing) if any operation can't be applied. Return all items of the list in new order.
+
+    Should be called in transaction, with the list locked.
+    """
+    items = list(list_instance.items.order_by("order", "id"))
+    items_by_book = {item.book_id: item for item in items}
+    added_book_pks = {
+        operation["book"]
+        for operation in operations
+        if operation["op"] == OPERATION_ADD
+    }
+    existing_book_pks = set(
+        Book.objects.filter(pk__in=added_book_pks).values_list("pk", flat=True)
+    )
+
+    errors = {}
+    removed_pks = []
+    moved_pks = set()
+
+    for index, operation in enumerate(operations):
+        book_pk = operation["book"]
+        item = items_by_book.get(book_pk)
+
+        if operation["op"] == OPERATION_ADD:
+            if book_pk not in existing_book_pks:
+                errors[index] = {
+                    "book": ["Book pk={book} does not exist.".format(book=book_pk)]
+                }
+                continue
+            if item is not None:
+                errors[index] = {
+                    "book": [get_duplicate_book_error(book_pk, list_instance.pk)]
+                }
+                continue
+            item = ListItem(
+                list=list_instance,
+                book_id=book_pk,
+                description=operation.get("description"),
+            )
+            items.insert(operation.get("position", len(items)), item)
+            items_by_book[book_pk] = item
+            continue
+
+        if item is None:
+            errors[index] = {
+                "book": [
+                    "Book pk={book} is not in the list pk={list}.".format(
+                        book=book_pk, list=list_instance.pk
+                    )
+                ]
+            }
+            continue
+
+        items.remove(item)
+        if operation["op"] == OPERATION_REMOVE:
+            del items_by_book[book_pk]
+            if item.pk is not None:
+                removed_pks.append(item.pk)
+        else:
+            items.insert(operation["position"], item)
+            moved_pks.add(item.pk)
+
+    if errors:
+        raise ValidationError({"operations": errors})
+
+    if removed_pks:
+        # NB: signals aren't sent - the counter, cached responses and ETags are updated below, once for all items.
+        delete_without_signals(ListItem.objects.filter(pk__in=removed_pks))
+
+    changed_items = set_orders(items, moved_pks)
+    new_items = [item for item in items if item.pk is None]
+    try:
+        # NB: `OrderedModel`'s `bulk_create()` would append new items to the end of the list.
+        QuerySet(ListItem).bulk_create(new_items)
+    except IntegrityError as error:
+        # The book was added concurrently by `ListItemCreateView`, which doesn't lock the list.
+        # `ValidationError` rolls back the whole transaction - no more queries are made in the broken one.
+        if not is_duplicate_book_error(error):
+            raise
+        raise ValidationError(
+            {
+                "operations": [
+                    "Some of the books were added to the list pk={list} concurrently.".format(
+                        list=list_instance.pk
+                    )
+                ]
+            }
+        )
+    ListItem.objects.bulk_update(changed_items, ["order"])
+    # Bulk changes don't send signals: update the counter, cached responses and ETags by hand.
+    change_counter(List, [list_instance.pk], len(new_items) - len(removed_pks))
+    invalidate_model_responses(ListItem)
+    return items
+
+
+def set_orders(items: ListType[ListItem], moved_pks: set) -> ListType[ListItem]:
+    """
+    Set orders of new and moved items (in their new places in `items`) between orders of their neighbours,
+    which keep their orders. If there's no room in some gap, renumber all items.
+    Return saved items with changed orders.
+    """
+    changed_items = []
+    placed = []
+    before = None
+
+    for item in items + [None]:
+        if item is not None and (item.pk is None or item.pk in moved_pks):
+            placed.append(item)
+            continue
+
+        if placed:
+            orders = get_orders_between(
+                before, item.order if item is not None else None, len(placed)
+            )
+            if orders is None:
+                return renumber(items)
+            for placed_item, order in zip(placed, orders):
+                placed_item.order = order
+                if placed_item.pk is not None:
+                    changed_items.append(placed_item)
+            placed = []
+
+        if item is not None:
+            before = item.order
+
+    return changed_items
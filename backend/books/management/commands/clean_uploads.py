@@ -0,0 +1,37 @@
+"""
+Remove abandoned chunked uploads (see `books/uploads.py`) along with their files.
+
+Usage:
+    python manage.py clean_uploads              # uploads not updated for 24 hours
+    python manage.py clean_uploads --hours 1
+"""
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from books.models import UploadSession
+from books.uploads import delete_upload
+
+
+class Command(BaseCommand):
+    help = "Remove abandoned chunked uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=24,
+            help="Remove uploads not updated for this number of hours (default: 24).",
+        )
+
+    def handle(self, *args, **options):
+        updated_before = timezone.now() - datetime.timedelta(hours=options["hours"])
+        sessions = UploadSession.objects.filter(updated__lt=updated_before)
+
+        removed = 0
+        for session in sessions.iterator():
+            delete_upload(session)
+            removed += 1
+
+        self.stdout.write("Removed uploads: {removed}".format(removed=removed))
@@ -0,0 +1,82 @@
+"""
+Move files uploaded before content-addressed storage was used (see `core/storage.py`) to content-addressed names,
+removing duplicates, and recount references to stored files.
+
+Should be run once after deployment, and may be run again to fix reference counts.
+
+Usage:
+    python manage.py deduplicate_files
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from books.response_cache import invalidate_model_responses
+from core.images import generate_thumbnails, get_image_sources
+from core.models import StoredFile
+from core.storage import (
+    count_references,
+    delete_thumbnails,
+    get_all_content_addressed_fields,
+    is_content_addressed,
+)
+
+
+class Command(BaseCommand):
+    help = "Move uploaded files to content-addressed storage and recount references to them."
+
+    def handle(self, *args, **options):
+        image_sources = set(get_image_sources())
+
+        for model, field_name in get_all_content_addressed_fields():
+            storage = model._meta.get_field(field_name).storage
+            names = (
+                model._default_manager.exclude(**{field_name: ""})
+                .exclude(**{field_name + "__isnull": True})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+
+            moved = missing = 0
+            for name in names:
+                if is_content_addressed(name):
+                    continue
+                if not storage.exists(name):
+                    missing += 1
+                    continue
+
+                with storage.open(name, "rb") as file:
+                    new_name = storage.save(name, file)
+                # `update()` doesn't change `updated` timestamps and doesn't send signals.
+                model._default_manager.filter(**{field_name: name}).update(
+                    **{field_name: new_name}
+                )
+                storage.delete(name)
+                delete_thumbnails(name)
+                if (model, field_name) in image_sources:
+                    generate_thumbnails(model, field_name, new_name)
+                moved += 1
+
+            if moved:
+                invalidate_model_responses(model)
+            self.stdout.write(
+                "{label}.{field}: {moved} files moved, {missing} missing".format(
+                    label=model._meta.label_lower,
+                    field=field_name,
+                    moved=moved,
+                    missing=missing,
+                )
+            )
+
+        references = count_references()
+        with transaction.atomic():
+            StoredFile.objects.all().delete()
+            StoredFile.objects.bulk_create(
+                StoredFile(name=name, references=count)
+                for name, count in references.items()
+            )
+
+        self.stdout.write(
+            "Stored files: {files}, references: {references}".format(
+                files=len(references), references=sum(references.values())
+            )
+        )
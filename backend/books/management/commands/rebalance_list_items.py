@@ -0,0 +1,70 @@
+"""
+Renumber items of lists with small gaps between orders (see `books/ordering.py`), so that moves of items keep
+updating single rows. Should be run periodically, e.g. nightly.
+
+Usage:
+    python manage.py rebalance_list_items               # lists with gaps smaller than `REBALANCE_MIN_GAP`
+    python manage.py rebalance_list_items --min-gap 1   # only lists with equal orders
+    python manage.py rebalance_list_items --all
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Lag
+
+from books.models import List, ListItem
+from books.ordering import REBALANCE_MIN_GAP, rebalance
+from books.response_cache import invalidate_model_responses
+
+
+class Command(BaseCommand):
+    help = "Renumber items of lists with small gaps between orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-gap",
+            type=int,
+            default=REBALANCE_MIN_GAP,
+            help="Renumber lists with gaps between orders smaller than this (default: {default}).".format(
+                default=REBALANCE_MIN_GAP
+            ),
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Renumber all lists.",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            list_pks = set(ListItem.objects.values_list("list_id", flat=True))
+        else:
+            list_pks = set(
+                ListItem.objects.annotate(
+                    previous_order=Window(
+                        Lag("order"),
+                        partition_by=[F("list_id")],
+                        order_by=[F("order").asc(), F("id").asc()],
+                    )
+                )
+                .filter(order__lt=F("previous_order") + options["min_gap"])
+                .order_by()
+                .values_list("list_id", flat=True)
+            )
+
+        updated = 0
+        for list_pk in sorted(list_pks):
+            with transaction.atomic():
+                # Lock the list - like batch changes of its items do.
+                List.objects.select_for_update().filter(pk=list_pk).exists()
+                updated += rebalance(ListItem.objects.filter(list_id=list_pk))
+
+        if updated:
+            # Bulk updates don't send signals.
+            invalidate_model_responses(ListItem)
+
+        self.stdout.write(
+            "Lists renumbered: {lists}, items updated: {updated}".format(
+                lists=len(list_pks), updated=updated
+            )
+        )
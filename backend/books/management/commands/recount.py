@@ -0,0 +1,22 @@
+"""
+Repair denormalized counters of books of authors, publishers and tags and of items of lists (see
+`books/counters.py`), which drift after changes not sending signals, e.g. raw SQL or loaded fixtures with counters.
+
+Usage:
+    python manage.py recount
+"""
+from django.core.management.base import BaseCommand
+
+from books.counters import recount_all
+
+
+class Command(BaseCommand):
+    help = "Repair counters of books of authors, publishers and tags and of items of lists."
+
+    def handle(self, *args, **options):
+        for model, repaired in recount_all().items():
+            self.stdout.write(
+                "{model}: {repaired} counters repaired".format(
+                    model=model._meta.label, repaired=repaired
+                )
+            )
@@ -0,0 +1,58 @@
+"""
+Store dimensions and placeholders of images uploaded before they were computed on upload
+(see `core.images.update_image_metadata()`).
+
+Usage:
+    python manage.py update_image_metadata            # images without stored dimensions
+    python manage.py update_image_metadata --force    # all images
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from books.response_cache import invalidate_model_responses
+from core.images import get_model, update_image_metadata
+
+
+class Command(BaseCommand):
+    help = "Store dimensions and placeholders of uploaded images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Process all images, also ones with stored dimensions.",
+        )
+
+    def handle(self, *args, **options):
+        for label, (
+            source_field_name,
+            prefix,
+        ) in settings.IMAGE_METADATA_FIELDS.items():
+            model = get_model(label)
+            metadata_field_names = [
+                prefix + "_width",
+                prefix + "_height",
+                prefix + "_placeholder",
+            ]
+            queryset = model.objects.exclude(**{source_field_name: ""}).exclude(
+                **{source_field_name + "__isnull": True}
+            )
+            if not options["force"]:
+                queryset = queryset.filter(**{prefix + "_width__isnull": True})
+
+            updated = 0
+            for instance in queryset.only("pk", source_field_name).iterator():
+                update_image_metadata(instance, force=True)
+                if getattr(instance, prefix + "_width") is None:
+                    continue
+                # `update()` doesn't change `updated` timestamps and doesn't send signals.
+                model.objects.filter(pk=instance.pk).update(
+                    **{name: getattr(instance, name) for name in metadata_field_names}
+                )
+                updated += 1
+
+            if updated:
+                invalidate_model_responses(model)
+            self.stdout.write(
+                "{label}: {updated} images updated".format(label=label, updated=updated)
+            )
@@ -0,0 +1,64 @@
+# Generated by Django 4.2 on 2026-10-17 20:25
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+# Frozen copy of `books.search.book_search_vector()` as of this migration.
+SEARCH_CONFIGS = ['russian', 'english']
+
+
+def weighted_vector(expression, weight):
+    vector = None
+    for config in SEARCH_CONFIGS:
+        other = SearchVector(expression, config=config, weight=weight)
+        vector = other if vector is None else vector + other
+    return vector
+
+
+def populate_search_vector(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    Author = apps.get_model('books', 'Author')
+    authors_names = (
+        Author.objects.filter(books=OuterRef('pk'))
+        .values('books')
+        .annotate(
+            names=StringAgg(
+                Concat('last_name', Value(' '), 'first_name', Value(' '), 'middle_name'),
+                delimiter=' ',
+            )
+        )
+        .values('names')
+    )
+    Book.objects.update(
+        search_vector=(
+            weighted_vector('title', 'A')
+            + weighted_vector(Subquery(authors_names), 'B')
+            + weighted_vector('description', 'C')
+            + weighted_vector('contents', 'D')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0013_remove_listitem_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='поисковый вектор'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='book_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-17 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0016_book_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThumbnailTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='модель')),
+                ('field', models.CharField(max_length=100, verbose_name='поле')),
+                ('name', models.CharField(max_length=255, verbose_name='имя файла')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='создана')),
+            ],
+            options={
+                'verbose_name': 'задача генерации миниатюр',
+                'verbose_name_plural': 'задачи генерации миниатюр',
+                'ordering': ['created'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='thumbnailtask',
+            constraint=models.UniqueConstraint(fields=('model', 'field', 'name'), name='unique_thumbnail_task'),
+        ),
+    ]
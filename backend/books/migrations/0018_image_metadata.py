@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-17 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0017_thumbnailtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='portrait_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='высота портрета'),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='portrait_placeholder',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1000, verbose_name='заглушка портрета'),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='portrait_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='ширина портрета'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='cover_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='высота обложки'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='cover_placeholder',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1000, verbose_name='заглушка обложки'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='cover_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='ширина обложки'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-17 21:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('books', '0018_image_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('field', models.CharField(choices=[('file', 'файл книги'), ('cover_image', 'обложка')], max_length=20, verbose_name='поле')),
+                ('filename', models.CharField(max_length=255, verbose_name='имя файла')),
+                ('size', models.PositiveBigIntegerField(verbose_name='размер')),
+                ('sha256', models.CharField(max_length=64, verbose_name='контрольная сумма SHA-256')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='получено байт')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='создана')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='изменена')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='books.book', verbose_name='книга')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='пользователь')),
+            ],
+            options={
+                'verbose_name': 'сессия загрузки',
+                'verbose_name_plural': 'сессии загрузки',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-17 21:08
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0019_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='имя файла')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='число ссылок')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='создан')),
+            ],
+            options={
+                'verbose_name': 'сохранённый файл',
+                'verbose_name_plural': 'сохранённые файлы',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='author',
+            name='portrait',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to='images/authors/', verbose_name='портрет'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='cover_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to='images/covers/', verbose_name='обложка'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to='books/', verbose_name='файл книги'),
+        ),
+    ]
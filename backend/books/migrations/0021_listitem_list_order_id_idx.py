@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0020_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listitem',
+            index=models.Index(fields=['list', 'order', 'id'], name='listitem_list_order_id_idx'),
+        ),
+    ]
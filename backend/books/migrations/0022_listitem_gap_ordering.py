@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-17 21:21
+
+from django.db import migrations, models
+from django.db.models import F
+
+# `books.ordering.ORDER_GAP` at the time of the migration
+ORDER_GAP = 2**20
+
+
+def spread_orders(apps, schema_editor):
+    # Contiguous orders 0, 1, 2, ... -> ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP, ...
+    ListItem = apps.get_model('books', 'ListItem')
+    ListItem.objects.update(order=(F('order') + 1) * ORDER_GAP)
+
+
+def compact_orders(apps, schema_editor):
+    ListItem = apps.get_model('books', 'ListItem')
+    items = list(ListItem.objects.order_by('list_id', 'order', 'id').only('id', 'list_id', 'order'))
+    list_id, order = None, 0
+    for item in items:
+        order = order + 1 if item.list_id == list_id else 0
+        list_id = item.list_id
+        item.order = order
+    ListItem.objects.bulk_update(items, ['order'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0021_listitem_list_order_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='listitem',
+            options={'ordering': ['order', 'id'], 'verbose_name': 'элемент списка', 'verbose_name_plural': 'элементы списков'},
+        ),
+        migrations.AlterField(
+            model_name='listitem',
+            name='order',
+            field=models.PositiveBigIntegerField(db_index=True, editable=False, verbose_name='order'),
+        ),
+        migrations.RunPython(spread_orders, compact_orders),
+    ]
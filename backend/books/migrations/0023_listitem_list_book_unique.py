@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-17 21:28
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_items(apps, schema_editor):
+    # Keep the first added item of each book in the list.
+    ListItem = apps.get_model('books', 'ListItem')
+    duplicates = (
+        ListItem.objects.values('list_id', 'book_id')
+        .annotate(items=Count('id'), first_id=Min('id'))
+        .filter(items__gt=1)
+    )
+    for duplicate in duplicates:
+        ListItem.objects.filter(list_id=duplicate['list_id'], book_id=duplicate['book_id']).exclude(
+            pk=duplicate['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0022_listitem_gap_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='listitem',
+            constraint=models.UniqueConstraint(fields=('list', 'book'), name='listitem_list_book_unique'),
+        ),
+    ]
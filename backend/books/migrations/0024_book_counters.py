@@ -0,0 +1,68 @@
+# Generated by Django 4.2 on 2026-10-17 21:53
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_related(queryset, field):
+    # Number of rows of the queryset referencing the counted object.
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('*'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    ListItem = apps.get_model('books', 'ListItem')
+    apps.get_model('books', 'Author').objects.update(
+        books_count=count_related(Book.authors.through.objects.all(), 'author_id')
+    )
+    apps.get_model('books', 'Publisher').objects.update(
+        books_count=count_related(Book.objects.all(), 'publisher_id')
+    )
+    apps.get_model('books', 'Tag').objects.update(
+        books_count=count_related(Book.tags.through.objects.all(), 'tag_id')
+    )
+    apps.get_model('books', 'List').objects.update(
+        items_count=count_related(ListItem.objects.all(), 'list_id')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0023_listitem_list_book_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='books_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='количество книг'),
+        ),
+        migrations.AddField(
+            model_name='list',
+            name='items_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='количество книг'),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='books_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='количество книг'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='books_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='количество книг'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
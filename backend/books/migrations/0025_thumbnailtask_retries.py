@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-17 22:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0024_book_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thumbnailtask',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, verbose_name='попытки'),
+        ),
+        migrations.AddField(
+            model_name='thumbnailtask',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='выполнить после'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 22:35
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0025_thumbnailtask_retries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tag',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='tag_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-17 23:08
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0026_tag_title_trgm_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='claimed',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='занят'),
+        ),
+    ]
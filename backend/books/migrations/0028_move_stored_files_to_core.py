@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-17 23:12
+
+from django.db import migrations
+
+MOVED_MODELS = ['storedfile', 'thumbnailtask']
+
+
+# Moved with the models, so that their permissions are kept (on a new database content types are created
+# after migrations, there's nothing to move).
+def move_content_types(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    ContentType.objects.filter(app_label='books', model__in=MOVED_MODELS).update(app_label='core')
+
+
+def restore_content_types(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    ContentType.objects.filter(app_label='core', model__in=MOVED_MODELS).update(app_label='books')
+
+
+# `StoredFile` and `ThumbnailTask` models are moved to `core` app with their data.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0027_storedfile_claimed'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AlterModelTable(name='storedfile', table='core_storedfile'),
+                migrations.AlterModelTable(name='thumbnailtask', table='core_thumbnailtask'),
+            ],
+            state_operations=[
+                migrations.DeleteModel(name='StoredFile'),
+                migrations.DeleteModel(name='ThumbnailTask'),
+            ],
+        ),
+        migrations.RunPython(move_content_types, restore_content_types),
+    ]
@@ -1,10 +1,19 @@
+import uuid
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFit, SmartResize
-from ordered_model.models import OrderedModel
+
+from core.images import AVIF_OPTIONS, AVIF_SUPPORTED, WEBP_OPTIONS
+from core.storage import content_addressed_storage
+
+from .ordering import GapOrderedModel
 
 
 class Tag(models.Model):
@@ -25,11 +34,24 @@ class Tag(models.Model):
         verbose_name=_("название"),
         max_length=32,
     )
+    # Maintained by signal handlers, see `books/counters.py`.
+    books_count = models.IntegerField(
+        verbose_name=_("количество книг"),
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ["title"]
         verbose_name = _("метка")
         verbose_name_plural = _("метки")
+        indexes = [
+            GinIndex(
+                fields=["title"],
+                name="tag_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -53,11 +75,24 @@ class Publisher(models.Model):
         verbose_name=_("название"),
         max_length=128,
     )
+    # Maintained by signal handlers, see `books/counters.py`.
+    books_count = models.IntegerField(
+        verbose_name=_("количество книг"),
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ["title"]
         verbose_name = _("издательство")
         verbose_name_plural = _("издательства")
+        indexes = [
+            GinIndex(
+                fields=["title"],
+                name="publisher_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -104,6 +139,27 @@ class Author(models.Model):
         null=True,
         blank=True,
         upload_to="images/authors/",
+        storage=content_addressed_storage,
+    )
+    # Set on upload, see `core.images.update_image_metadata()`.
+    portrait_width = models.PositiveIntegerField(
+        verbose_name=_("ширина портрета"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    portrait_height = models.PositiveIntegerField(
+        verbose_name=_("высота портрета"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    portrait_placeholder = models.CharField(
+        verbose_name=_("заглушка портрета"),
+        max_length=1000,
+        blank=True,
+        default="",
+        editable=False,
     )
     # NB: from `django-imagekit` docs: ImageSpecFields are virtual — they add no fields to your database and don't
     # require a database.
@@ -113,11 +169,48 @@ class Author(models.Model):
         format="JPEG",
         options={"quality": 100},
     )
+    # Smaller renditions in modern formats, see `core.images.SrcsetField`.
+    portrait_thumbnail_webp = ImageSpecField(
+        source="portrait",
+        processors=[SmartResize(width=132, height=176, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    if AVIF_SUPPORTED:
+        portrait_thumbnail_avif = ImageSpecField(
+            source="portrait",
+            processors=[SmartResize(width=132, height=176, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
+    # Maintained by signal handlers, see `books/counters.py`.
+    books_count = models.IntegerField(
+        verbose_name=_("количество книг"),
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ["last_name"]
         verbose_name = _("автор")
         verbose_name_plural = _("авторы")
+        indexes = [
+            GinIndex(
+                fields=["last_name"],
+                name="author_last_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["first_name"],
+                name="author_first_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["middle_name"],
+                name="author_middle_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -204,6 +297,27 @@ class Book(models.Model):
         null=True,
         blank=True,
         upload_to="images/covers/",
+        storage=content_addressed_storage,
+    )
+    # Set on upload, see `core.images.update_image_metadata()`.
+    cover_width = models.PositiveIntegerField(
+        verbose_name=_("ширина обложки"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    cover_height = models.PositiveIntegerField(
+        verbose_name=_("высота обложки"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    cover_placeholder = models.CharField(
+        verbose_name=_("заглушка обложки"),
+        max_length=1000,
+        blank=True,
+        default="",
+        editable=False,
     )
     # NB: from `django-imagekit` docs: ImageSpecFields are virtual — they add no fields to your database and don't
     # require a database.
@@ -225,19 +339,69 @@ class Book(models.Model):
         format="JPEG",
         options={"quality": 100},
     )
+    # Smaller renditions in modern formats, see `core.images.SrcsetField`.
+    cover_thumbnail_small_webp = ImageSpecField(
+        source="cover_image",
+        processors=[ResizeToFit(width=64, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    cover_thumbnail_medium_webp = ImageSpecField(
+        source="cover_image",
+        processors=[ResizeToFit(width=128, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    cover_thumbnail_large_webp = ImageSpecField(
+        source="cover_image",
+        processors=[ResizeToFit(width=256, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    if AVIF_SUPPORTED:
+        cover_thumbnail_small_avif = ImageSpecField(
+            source="cover_image",
+            processors=[ResizeToFit(width=64, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
+        cover_thumbnail_medium_avif = ImageSpecField(
+            source="cover_image",
+            processors=[ResizeToFit(width=128, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
+        cover_thumbnail_large_avif = ImageSpecField(
+            source="cover_image",
+            processors=[ResizeToFit(width=256, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
     file = models.FileField(
         verbose_name=_("файл книги"),
         null=True,
         blank=True,
         upload_to="books/",
+        storage=content_addressed_storage,
     )
     created = models.DateTimeField(verbose_name=_("создана"), auto_now_add=True)
     updated = models.DateTimeField(verbose_name=_("изменена"), auto_now=True)
+    # NB: maintained by signal handlers in `books/signals.py`, see `books/search.py` for details.
+    search_vector = SearchVectorField(
+        verbose_name=_("поисковый вектор"),
+        null=True,
+        editable=False,
+    )
 
     class Meta:
         ordering = ["-created"]
         verbose_name = _("книга")
         verbose_name_plural = _("книги")
+        indexes = [
+            GinIndex(fields=["search_vector"], name="book_search_vector_idx"),
+            # Used by `BookCursorPagination`:
+            models.Index(fields=["-created", "id"], name="book_created_id_idx"),
+        ]
 
     def __str__(self):
         return "{book}".format(
@@ -358,6 +522,12 @@ class List(models.Model):
         verbose_name=_("публичный"),
         default=False,
     )
+    # Maintained by signal handlers, see `books/counters.py`.
+    items_count = models.IntegerField(
+        verbose_name=_("количество книг"),
+        default=0,
+        editable=False,
+    )
     created = models.DateTimeField(verbose_name=_("создан"), auto_now_add=True)
     updated = models.DateTimeField(verbose_name=_("изменен"), auto_now=True)
 
@@ -370,7 +540,7 @@ class List(models.Model):
         return self.title
 
 
-class ListItem(OrderedModel):
+class ListItem(GapOrderedModel):
     """
     Represents an item of the user-created book list.
     """
@@ -396,15 +566,27 @@ class ListItem(OrderedModel):
     created = models.DateTimeField(verbose_name=_("создана"), auto_now_add=True)
     updated = models.DateTimeField(verbose_name=_("изменена"), auto_now=True)
 
-    # NB: `order` field is added by `OrderedModel`!
+    # NB: `order` field is added by `GapOrderedModel` - orders are sparse, see `books/ordering.py`!
     #
     # This is to properly set order of `ListItem`'s within `List`s:
     order_with_respect_to = "list"
 
-    class Meta(OrderedModel.Meta):
-        ordering = ["order"]
+    class Meta(GapOrderedModel.Meta):
+        ordering = ["order", "id"]
         verbose_name = _("элемент списка")
         verbose_name_plural = _("элементы списков")
+        indexes = [
+            # Used by `ListItemCursorPagination`:
+            models.Index(
+                fields=["list", "order", "id"], name="listitem_list_order_id_idx"
+            ),
+        ]
+        constraints = [
+            # The book is added to the list once, see `books.lists.is_duplicate_book_error()`:
+            models.UniqueConstraint(
+                fields=["list", "book"], name="listitem_list_book_unique"
+            ),
+        ]
 
     def __str__(self):
         return "#{order} в {list_title} - {book_title}".format(
@@ -412,3 +594,83 @@ class ListItem(OrderedModel):
             list_title=self.list.title,
             book_title=self.book.title,
         )
+
+    def get_position(self) -> int:
+        """
+        Return 0-based position of the item in the list (orders are sparse, see `books/ordering.py`).
+        NB: makes a query - positions of enumerated items are counted by `ListItemPositionListSerializer`.
+        """
+        return (
+            ListItem.objects.filter(list_id=self.list_id)
+            .filter(
+                models.Q(order__lt=self.order)
+                | models.Q(order=self.order, id__lt=self.id)
+            )
+            .count()
+        )
+
+
+class UploadSession(models.Model):
+    """
+    Resumable chunked upload of the book's file or cover image, see `books/uploads.py`.
+    Received chunks are written to the session's file in `UPLOADS_ROOT`.
+    """
+
+    FIELD_FILE = "file"
+    FIELD_COVER_IMAGE = "cover_image"
+    FIELD_CHOICES = [
+        (FIELD_FILE, _("файл книги")),
+        (FIELD_COVER_IMAGE, _("обложка")),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    user = models.ForeignKey(
+        verbose_name=_("пользователь"),
+        to=get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    book = models.ForeignKey(
+        verbose_name=_("книга"),
+        to=Book,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    field = models.CharField(
+        verbose_name=_("поле"),
+        max_length=20,
+        choices=FIELD_CHOICES,
+    )
+    filename = models.CharField(
+        verbose_name=_("имя файла"),
+        max_length=255,
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name=_("размер"),
+    )
+    sha256 = models.CharField(
+        verbose_name=_("контрольная сумма SHA-256"),
+        max_length=64,
+    )
+    offset = models.PositiveBigIntegerField(
+        verbose_name=_("получено байт"),
+        default=0,
+    )
+    created = models.DateTimeField(verbose_name=_("создана"), auto_now_add=True)
+    updated = models.DateTimeField(verbose_name=_("изменена"), auto_now=True)
+
+    class Meta:
+        ordering = ["-created"]
+        verbose_name = _("сессия загрузки")
+        verbose_name_plural = _("сессии загрузки")
+
+    def __str__(self):
+        return "{filename} ({offset}/{size})".format(
+            filename=self.filename,
+            offset=self.offset,
+            size=self.size,
+        )
@@ -0,0 +1,175 @@
+"""
+Gap-based ordering of `OrderedModel`s, used for `ListItem`s.
+
+`django-ordered-model` keeps orders contiguous (0, 1, 2, ...), so inserting, moving or deleting an object shifts
+orders of all objects in between with range UPDATE, locking the rows. `GapOrderedModel` keeps orders sparse
+instead:
+
+- new objects are appended `ORDER_GAP` after the last one;
+- moved object gets an order in the middle of the gap between its new neighbours - single row is updated;
+- deleted objects leave gaps, nothing is shifted.
+
+When there's no room left between neighbours (after ~20 moves into the same gap), the whole group (e.g. all items
+of the list) is renumbered with `ORDER_GAP` steps, see `rebalance()`. Groups with small gaps are renumbered
+in advance by `python manage.py rebalance_list_items`, run periodically.
+
+Objects with equal orders (possible when appended concurrently) are ordered by `id`.
+"""
+from typing import List, Optional, Tuple
+
+from django.db import models
+from django.db.models import Count, Max, QuerySet
+from django.utils.translation import gettext_lazy as _
+from ordered_model.models import (
+    OrderedModel,
+    OrderedModelBase,
+    OrderedModelManager,
+    OrderedModelQuerySet,
+)
+
+# Step between orders of appended (and rebalanced) objects: ~20 moves into the same gap fit into it
+ORDER_GAP = 2**20
+# Maximum value of `PositiveBigIntegerField`
+MAX_ORDER = 2**63 - 1
+# Groups with smaller gaps between orders are renumbered in advance, see `rebalance_list_items` command
+REBALANCE_MIN_GAP = 2**10
+
+
+def get_orders_between(
+    before: Optional[int], after: Optional[int], count: int = 1
+) -> Optional[List[int]]:
+    """
+    Return `count` evenly spaced orders between orders of neighbours (`None` meaning there's no neighbour
+    on that side), or `None` if there's no room for them.
+    """
+    if after is None:
+        start = before if before is not None else 0
+        orders = [start + ORDER_GAP * (index + 1) for index in range(count)]
+        return orders if not orders or orders[-1] <= MAX_ORDER else None
+
+    # Orders are positive, 0 is kept as the lower bound.
+    start = before if before is not None else 0
+    step = (after - start) // (count + 1)
+    if step < 1:
+        return None
+    return [start + step * (index + 1) for index in range(count)]
+
+
+def renumber(objects: list) -> list:
+    """
+    Set orders of objects (new and saved ones, in desired order) with `ORDER_GAP` steps.
+    Return saved objects with changed orders.
+    """
+    changed = []
+    for index, obj in enumerate(objects):
+        order = ORDER_GAP * (index + 1)
+        if obj.order != order:
+            obj.order = order
+            if obj.pk is not None:
+                changed.append(obj)
+    return changed
+
+
+def rebalance(queryset: QuerySet) -> int:
+    """
+    Renumber objects of the group (e.g. `list_instance.items.all()`) with `ORDER_GAP` steps, keeping their order.
+    Return number of updated objects.
+    """
+    changed = renumber(list(queryset.order_by("order", "id").only("id", "order")))
+    queryset.model.objects.bulk_update(changed, ["order"])
+    return len(changed)
+
+
+class GapOrderedModelQuerySet(OrderedModelQuerySet):
+    def get_next_order(self) -> int:
+        """
+        Return order of the object appended to the group.
+        """
+        return (self.get_max_order() or 0) + ORDER_GAP
+
+    def get_next_order_and_position(self) -> Tuple[int, int]:
+        """
+        Return order and 0-based position of the object appended to the group, with a single query.
+        """
+        result = self.aggregate(max_order=Max("order"), count=Count("pk"))
+        return (result["max_order"] or 0) + ORDER_GAP, result["count"]
+
+
+class GapOrderedModelManager(
+    OrderedModelManager.from_queryset(GapOrderedModelQuerySet)
+):
+    pass
+
+
+class GapOrderedModel(OrderedModel):
+    """
+    `OrderedModel` with sparse orders: creating, moving (`to()`, `up()`, `top()`, `above()`, ...) or deleting
+    an object updates only its own row.
+    """
+
+    order = models.PositiveBigIntegerField(_("order"), editable=False, db_index=True)
+
+    objects = GapOrderedModelManager()
+
+    class Meta(OrderedModel.Meta):
+        abstract = True
+
+    @classmethod
+    def _on_ordered_model_delete(cls, sender=None, instance=None, **kwargs):
+        """
+        Deleted objects leave gaps - there's nothing to shift.
+        """
+
+    def save(self, *args, **kwargs):
+        """
+        Append new object (or object moved to another group) to the end of its group.
+        Its 0-based position in the group is set as `position` attribute.
+        """
+        if self.order is None or self._wrt_map() != self._original_wrt_map:
+            (
+                self.order,
+                self.position,
+            ) = self.get_ordering_queryset().get_next_order_and_position()
+        super(OrderedModelBase, self).save(*args, **kwargs)
+        self._original_wrt_map = self._wrt_map()
+
+    def delete(self, *args, extra_update=None, **kwargs):
+        self._was_deleted_via_delete_method = True
+        return super(OrderedModelBase, self).delete(*args, **kwargs)
+
+    def move_between(
+        self, before: Optional["GapOrderedModel"], after: Optional["GapOrderedModel"]
+    ):
+        """
+        Move the object between neighbours (`None` meaning the start or the end of the group).
+        """
+        orders = get_orders_between(
+            before.order if before else None, after.order if after else None
+        )
+        if orders is None:
+            rebalance(self.get_ordering_queryset())
+            for neighbour in (before, after):
+                if neighbour is not None:
+                    neighbour.refresh_from_db(fields=["order"])
+            orders = get_orders_between(
+                before.order if before else None, after.order if after else None
+            )
+
+        self.order = orders[0]
+        self.save(update_fields=["order"])
+
+    def to(self, order: int, extra_update=None):
+        """
+        Move the object to the place of the object with `order` (moving it up or down), like `OrderedModel.to()`.
+        """
+        if order is None or order == self.order:
+            return
+
+        queryset = self.get_ordering_queryset().exclude(pk=self.pk)
+        if order < self.order:
+            after = queryset.filter(order__gte=order).order_by("order", "id").first()
+            before = queryset.filter(order__lt=order).order_by("order", "id").last()
+        else:
+            before = queryset.filter(order__lte=order).order_by("order", "id").last()
+            after = queryset.filter(order__gt=order).order_by("order", "id").first()
+        self.move_between(before, after)
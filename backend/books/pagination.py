@@ -0,0 +1,133 @@
+"""
+Pagination classes for API views from `books` app.
+"""
+from typing import Optional
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Basic pagination class for Book list.
+    """
+
+    page_size = 10
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "page": self.page.number,
+                "total_pages": self.page.paginator.num_pages,
+                "results": data,
+            }
+        )
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for Book list.
+
+    Unlike `StandardResultsSetPagination`, does not use OFFSET and does not count all results,
+    so every page is equally cheap to get. Results are always ordered by `(-created, id)`.
+    """
+
+    page_size = 10
+    ordering = ("-created", "id")
+
+
+class ListItemCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for items of the book `List`, ordered by `(order, id)`.
+    Page size can be changed with `?page_size=`.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("order", "id")
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator which uses PostgreSQL planner's row estimate instead of exact `COUNT(*)` for large results.
+
+    Exact count is still used when the estimate is below `exact_count_threshold`.
+    `count_is_exact` attribute tells which one was used.
+    """
+
+    exact_count_threshold = 1000
+
+    def __init__(self, *args, exact_count_threshold: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if exact_count_threshold is not None:
+            self.exact_count_threshold = exact_count_threshold
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self.estimate_count()
+
+        if estimate is None or estimate < self.exact_count_threshold:
+            self.count_is_exact = True
+            return super().count
+
+        self.count_is_exact = False
+        return estimate
+
+    def estimate_count(self) -> Optional[int]:
+        """
+        Return estimated number of objects, or `None` if there's no estimate.
+
+        For unfiltered QuerySets use `pg_class.reltuples` (as of last ANALYZE), otherwise use row estimate from
+        the query's EXPLAIN.
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return None
+
+        queryset = self.object_list.order_by()
+        connection = connections[queryset.db]
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where and not queryset.query.distinct:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+                # `reltuples` is -1 (or 0 for PostgreSQL < 14) for tables never analyzed.
+                return row[0] if row and row[0] > 0 else None
+
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountResultsSetPagination(StandardResultsSetPagination):
+    """
+    Same as `StandardResultsSetPagination`, but does not count large results exactly (see `EstimatedCountPaginator`).
+    Response contains `count_is_exact` flag.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_exact": self.page.paginator.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "page": self.page.number,
+                "total_pages": self.page.paginator.num_pages,
+                "results": data,
+            }
+        )
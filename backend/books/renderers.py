@@ -0,0 +1,58 @@
+"""
+Fast JSON renderer, enabled in `REST_FRAMEWORK` settings (see `USE_ORJSON` setting).
+"""
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    Render JSON using `orjson`, output is the same as of `JSONRenderer` (compact, not ASCII-only).
+
+    Types not supported by `orjson` natively (`Decimal`, lazy translation strings etc.) and `datetime`s (to keep
+    `JSONEncoder`'s format with milliseconds) are converted by DRF's `JSONEncoder`.
+    Falls back to `JSONRenderer` when `orjson` isn't installed, pretty printing is requested (`indent`),
+    or `orjson` fails, e.g. on integers larger than 64 bits.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson is not None
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as `JSONRenderer`: escape U+2028 and U+2029 to output JSON that is a strict javascript subset.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+    def default(self, obj):
+        """
+        Convert objects not supported by `orjson` the same way as `JSONRenderer` does.
+        """
+        return self.encoder_class().default(obj)
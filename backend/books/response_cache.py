@@ -0,0 +1,143 @@
+"""
+Cache of API responses for anonymous visitors: catalogue reads (books, authors, publishers, public lists) are the
+same for all of them, so each response is rendered once and then served from Django cache, without queries.
+
+Responses are cached by views with `CachedAnonymousResponseMixin`, under the key built from:
+- the absolute URL of the request (links in responses are absolute) with query params sorted by name;
+- the negotiated media type with its params (e.g. `application/json; indent=4`);
+- versions of models the response depends on (`cache_models` of the view).
+
+Versions are random tokens stored in the cache. They are bumped by signal handlers in `books/signals.py` when
+objects of the models are saved or deleted, or when their many-to-many relations change, and explicitly after bulk
+changes which don't send signals (e.g. `apply_list_operations()`). Responses cached with old versions are never
+requested again and expire after `RESPONSE_CACHE_TIMEOUT` seconds. Invalidation is per model: a new `Note` doesn't
+invalidate the book catalogue.
+
+NB: use shared cache backend (file or Redis, see `CACHE_BACKEND` setting) to propagate invalidation to all workers.
+"""
+import hashlib
+import uuid
+from typing import Iterable, List, Type
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.request import Request
+
+# Only responses rendered with these renderers are cached (not the browsable API)
+CACHED_RENDERER_FORMATS = {"json"}
+# Headers of cached responses, including validators set by `ConditionalGetMixin` and `Vary: Accept` set by DRF
+CACHED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Vary"]
+
+
+def get_version_cache_key(model: Type[Model]) -> str:
+    return "responses:{model}:version".format(model=model._meta.label_lower)
+
+
+def get_model_versions(models: Iterable[Type[Model]]) -> List[str]:
+    """
+    Return current versions of models (with single cache request), setting missing ones.
+    """
+    keys = [get_version_cache_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model: Type[Model]) -> None:
+    """
+    Invalidate cached responses depending on the model.
+    """
+    cache.set(get_version_cache_key(model), uuid.uuid4().hex, None)
+
+
+def invalidate_model_responses(model: Type[Model]) -> None:
+    """
+    Invalidate cached responses depending on the model now - so that requests in the current transaction
+    don't get stale responses, and once more after the transaction is committed - responses cached meanwhile
+    by concurrent requests were built from the data read before the commit.
+    """
+    bump_model_version(model)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_model_version(model))
+
+
+def get_response_cache_key(request: Request, models: Iterable[Type[Model]]) -> str:
+    """
+    Return the cache key of the response to the request, depending on its negotiated media type and versions
+    of `models`.
+    """
+    url = request.build_absolute_uri(request.path)
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    versions = ":".join(get_model_versions(models))
+    digest = hashlib.md5(
+        "{url}?{query}|{media_type}|{versions}".format(
+            url=url,
+            query=query,
+            media_type=request.accepted_media_type,
+            versions=versions,
+        ).encode()
+    )
+    return "responses:{digest}".format(digest=digest.hexdigest())
+
+
+def is_response_cacheable(request: Request) -> bool:
+    """
+    Check if the response to the request can be cached: GET (or HEAD) request of anonymous visitor,
+    rendered as JSON.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and request.accepted_renderer.format in CACHED_RENDERER_FORMATS
+    )
+
+
+class CachedAnonymousResponseMixin:
+    """
+    Cache successful responses to GET requests of anonymous visitors.
+    """
+
+    # Models, changes of which invalidate cached responses
+    cache_models: List[Type[Model]] = []
+
+    def get(self, request, *args, **kwargs):
+        if not is_response_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = get_response_cache_key(request, self.cache_models)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content, headers=headers)
+            # The ETag is valid while versions of models the response depends on are the same.
+            return get_conditional_response(
+                request, etag=headers.get("ETag"), response=response
+            )
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key,
+                    (
+                        response.content,
+                        {
+                            name: response[name]
+                            for name in CACHED_HEADERS
+                            if name in response
+                        },
+                    ),
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            )
+        return response
@@ -0,0 +1,167 @@
+"""
+Search helpers for models from `books` app.
+
+Full-text search for `Book`s: each book has a `search_vector` column (`tsvector`, GIN-indexed), built from the title,
+authors' names, description and contents, both with "russian" and "english" text search configurations.
+The column is kept up to date by signal handlers in `books/signals.py`.
+
+Fuzzy (typo-tolerant) search for `Author`s and `Publisher`s uses `pg_trgm` similarity, backed by GIN trigram indexes.
+"""
+import re
+from typing import List, Optional
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    CombinedSearchVector,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Concat, Greatest
+
+# Text search configurations used both to build `search_vector` and to parse search queries.
+SEARCH_CONFIGS = [
+    "russian",
+    "english",
+]
+# `pg_trgm` default value of `pg_trgm.similarity_threshold`.
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+
+def _weighted_vector(expression, weight: str) -> CombinedSearchVector:
+    """
+    Return `expression` converted to `tsvector` with each of `SEARCH_CONFIGS`, labeled with `weight`.
+    """
+    vectors = [
+        SearchVector(expression, config=config, weight=weight)
+        for config in SEARCH_CONFIGS
+    ]
+    vector = vectors[0]
+    for other in vectors[1:]:
+        vector = vector + other
+    return vector
+
+
+def book_search_vector() -> CombinedSearchVector:
+    """
+    Return expression used to compute `Book.search_vector`.
+
+    Fields are weighted: title (A) > authors' names (B) > description (C) > contents (D).
+    NB: migration `0014_book_search_vector` has its own frozen copy of the expression.
+    """
+    from .models import Author
+
+    authors_names = (
+        Author.objects.filter(books=OuterRef("pk"))
+        .values("books")
+        .annotate(
+            names=StringAgg(
+                Concat(
+                    "last_name",
+                    Value(" "),
+                    "first_name",
+                    Value(" "),
+                    "middle_name",
+                ),
+                delimiter=" ",
+            )
+        )
+        .values("names")
+    )
+    return (
+        _weighted_vector("title", "A")
+        + _weighted_vector(Subquery(authors_names), "B")
+        + _weighted_vector("description", "C")
+        + _weighted_vector("contents", "D")
+    )
+
+
+def update_search_vector(queryset: QuerySet) -> None:
+    """
+    Recompute `search_vector` for all books in `queryset` with single UPDATE query.
+    """
+    queryset.update(search_vector=book_search_vector())
+
+
+def build_search_query(query: str) -> Optional[SearchQuery]:
+    """
+    Convert user's input into `SearchQuery`.
+
+    Every word of the input is treated as a prefix, so that "волк" finds "Волкодав", and all words must be present.
+    Return `None` if there's nothing to search for.
+    """
+    terms = re.findall(r"[^\W_]+", query)
+
+    if not terms:
+        return None
+
+    raw_query = " & ".join("{term}:*".format(term=term) for term in terms)
+    search_queries = [
+        SearchQuery(raw_query, config=config, search_type="raw")
+        for config in SEARCH_CONFIGS
+    ]
+    search_query = search_queries[0]
+    for other in search_queries[1:]:
+        search_query = search_query | other
+    return search_query
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter `queryset` of `Book`s using full-text search, ordering results by relevance.
+    """
+    search_query = build_search_query(query)
+
+    if search_query is None:
+        return queryset.none()
+
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created")
+    )
+
+
+def parse_similarity_threshold(value: Optional[str]) -> float:
+    """
+    Convert `threshold` GET parameter to float in range [`DEFAULT_SIMILARITY_THRESHOLD`, 1], falling back
+    to default value. Lower thresholds aren't allowed, as they can't use trigram indexes (see `fuzzy_search()`).
+    """
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SIMILARITY_THRESHOLD
+
+    return min(max(threshold, DEFAULT_SIMILARITY_THRESHOLD), 1.0)
+
+
+def fuzzy_search(
+    queryset: QuerySet,
+    query: str,
+    fields: List[str],
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+) -> QuerySet:
+    """
+    Filter `queryset` leaving objects with any of `fields` similar to `query` (similarity at least `threshold`),
+    ordered by similarity.
+
+    `%` operator (which uses GIN trigram indexes and compares similarity with the default threshold) narrows down
+    candidates first, so thresholds lower than `DEFAULT_SIMILARITY_THRESHOLD` act as the default one. The threshold
+    is compared explicitly - `pg_trgm.similarity_threshold` setting isn't changed, as it would persist in the reused
+    database connection.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{"{field}__trigram_similar".format(field=field): query})
+
+    similarities = [TrigramSimilarity(field, query) for field in fields]
+    similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+    return (
+        queryset.filter(condition)
+        .annotate(similarity=similarity)
+        .filter(similarity__gte=threshold)
+        .order_by("-similarity", *queryset.model._meta.ordering)
+    )
@@ -7,10 +7,26 @@ SomeListSerializer or SomeMinimalSerializer - concise serializer.
 
 For simple models, only "detail" serializers are present.
 """
+import re
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from .models import Tag, Publisher, Author, Book, Note, List, ListItem
+from core.images import SrcsetField, ThumbnailField, ThumbnailFieldsSerializerMixin
+
+from .downloads import get_file_url
+from .fieldsets import SparseFieldsetsSerializerMixin
+from .lists import (
+    BATCH_MAX_OPERATIONS,
+    OPERATION_MOVE,
+    OPERATIONS,
+    get_duplicate_book_error,
+    is_duplicate_book_error,
+)
+from .models import Tag, Publisher, Author, Book, Note, List, ListItem, UploadSession
 from users.serializers import CustomUserMinimalSerializer
 
 
@@ -25,6 +41,7 @@ class TagDetailSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "user",
+            "books_count",
         ]
 
 
@@ -39,6 +56,7 @@ class PublisherDetailSerializer(serializers.ModelSerializer):
             "id",
             "user",
             "title",
+            "books_count",
         ]
 
 
@@ -74,9 +92,12 @@ class AuthorMinimalSerializer(serializers.ModelSerializer):
         ]
 
 
-class AuthorURLRepresentationMixin(serializers.ModelSerializer):
+class AuthorURLRepresentationMixin(
+    ThumbnailFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Deliver consistent relative URLs of author portrait images.
+    NB: thumbnails are serialized with cached URLs by `ThumbnailFieldsSerializerMixin`.
     """
 
     def to_representation(self, instance):
@@ -85,19 +106,23 @@ class AuthorURLRepresentationMixin(serializers.ModelSerializer):
         Issue: https://forum.djangoproject.com/t/drf-imagefield-serializes-entire-url-with-domain-name/6975
         """
         ret = super().to_representation(instance)
-        ret["portrait"] = instance.portrait.url if instance.portrait else ""
-        ret["portrait_thumbnail"] = (
-            instance.portrait_thumbnail.url if instance.portrait else ""
-        )
+        # NB: fields may be omitted by `SparseFieldsetsSerializerMixin`.
+        if "portrait" in ret:
+            ret["portrait"] = instance.portrait.url if instance.portrait else ""
         return ret
 
 
-class AuthorDetailSerializer(AuthorURLRepresentationMixin, serializers.ModelSerializer):
+class AuthorDetailSerializer(
+    SparseFieldsetsSerializerMixin,
+    AuthorURLRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """
     Serializer for Author model - detailed.
     """
 
     user = CustomUserMinimalSerializer(many=False)
+    portrait_srcset = SrcsetField(source="portrait")
 
     class Meta:
         model = Author
@@ -110,6 +135,11 @@ class AuthorDetailSerializer(AuthorURLRepresentationMixin, serializers.ModelSeri
             "description",
             "portrait",
             "portrait_thumbnail",
+            "portrait_srcset",
+            "portrait_width",
+            "portrait_height",
+            "portrait_placeholder",
+            "books_count",
         ]
 
 
@@ -118,6 +148,8 @@ class AuthorCreateSerializer(AuthorURLRepresentationMixin, serializers.ModelSeri
     Serializer for Author model - used to create new authors.
     """
 
+    portrait_srcset = SrcsetField(source="portrait")
+
     class Meta:
         model = Author
         fields = [
@@ -129,12 +161,20 @@ class AuthorCreateSerializer(AuthorURLRepresentationMixin, serializers.ModelSeri
             "description",
             "portrait",
             "portrait_thumbnail",
+            "portrait_srcset",
+            "portrait_width",
+            "portrait_height",
+            "portrait_placeholder",
         ]
 
 
-class BookURLRepresentationMixin(serializers.ModelSerializer):
+class BookURLRepresentationMixin(
+    ThumbnailFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Deliver consistent relative URLs of cover images and attached file.
+    NB: thumbnails are serialized with cached URLs by `ThumbnailFieldsSerializerMixin`; the file is served
+    through the API (see `get_file_url()`), not from media storage.
     """
 
     def to_representation(self, instance):
@@ -143,21 +183,21 @@ class BookURLRepresentationMixin(serializers.ModelSerializer):
         Issue: https://forum.djangoproject.com/t/drf-imagefield-serializes-entire-url-with-domain-name/6975
         """
         ret = super().to_representation(instance)
-        ret["cover_image"] = instance.cover_image.url if instance.cover_image else ""
-        ret["cover_thumbnail_small"] = (
-            instance.cover_thumbnail_small.url if instance.cover_image else ""
-        )
-        ret["cover_thumbnail_medium"] = (
-            instance.cover_thumbnail_medium.url if instance.cover_image else ""
-        )
-        ret["cover_thumbnail_large"] = (
-            instance.cover_thumbnail_large.url if instance.cover_image else ""
-        )
-        ret["file"] = instance.file.url if instance.file else ""
+        # NB: fields may be omitted by `SparseFieldsetsSerializerMixin`.
+        if "cover_image" in ret:
+            ret["cover_image"] = (
+                instance.cover_image.url if instance.cover_image else ""
+            )
+        if "file" in ret:
+            ret["file"] = get_file_url(instance.pk) if instance.file else ""
         return ret
 
 
-class BookListSerializer(BookURLRepresentationMixin, serializers.ModelSerializer):
+class BookListSerializer(
+    SparseFieldsetsSerializerMixin,
+    BookURLRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """
     Serializer for Book model - for use in list view.
 
@@ -168,6 +208,7 @@ class BookListSerializer(BookURLRepresentationMixin, serializers.ModelSerializer
     authors = AuthorMinimalSerializer(many=True)
     publisher = PublisherDetailSerializer(many=False)
     tags = TagDetailSerializer(many=True)
+    cover_srcset = SrcsetField(source="cover_image")
 
     class Meta:
         model = Book
@@ -184,13 +225,21 @@ class BookListSerializer(BookURLRepresentationMixin, serializers.ModelSerializer
             "cover_thumbnail_small",
             "cover_thumbnail_medium",
             "cover_thumbnail_large",
+            "cover_srcset",
+            "cover_width",
+            "cover_height",
+            "cover_placeholder",
             "file",
             "created",
             "updated",
         ]
 
 
-class BookDetailSerializer(BookURLRepresentationMixin, serializers.ModelSerializer):
+class BookDetailSerializer(
+    SparseFieldsetsSerializerMixin,
+    BookURLRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """
     Serializer for Book model - for detailed view.
     """
@@ -199,6 +248,7 @@ class BookDetailSerializer(BookURLRepresentationMixin, serializers.ModelSerializ
     authors = AuthorDetailSerializer(many=True)
     publisher = PublisherDetailSerializer(many=False)
     tags = TagDetailSerializer(many=True)
+    cover_srcset = SrcsetField(source="cover_image")
 
     class Meta:
         model = Book
@@ -218,6 +268,10 @@ class BookDetailSerializer(BookURLRepresentationMixin, serializers.ModelSerializ
             "cover_thumbnail_small",
             "cover_thumbnail_medium",
             "cover_thumbnail_large",
+            "cover_srcset",
+            "cover_width",
+            "cover_height",
+            "cover_placeholder",
             "file",
             "created",
             "updated",
@@ -229,6 +283,8 @@ class BookCreateSerializer(BookURLRepresentationMixin, serializers.ModelSerializ
     Serializer for Book model - to create new books.
     """
 
+    cover_srcset = SrcsetField(source="cover_image")
+
     class Meta:
         model = Book
         fields = [
@@ -247,13 +303,46 @@ class BookCreateSerializer(BookURLRepresentationMixin, serializers.ModelSerializ
             "cover_thumbnail_small",
             "cover_thumbnail_medium",
             "cover_thumbnail_large",
+            "cover_srcset",
+            "cover_width",
+            "cover_height",
+            "cover_placeholder",
             "file",
             "created",
             "updated",
         ]
 
 
-class ListItemDetailSerializer(serializers.ModelSerializer):
+class ListItemPositionListSerializer(serializers.ListSerializer):
+    """
+    Serialize items of the list (given in list order) with their positions, without a query per item: positions
+    are counted from `positions_start` of the context (position of the first item of the page), 0 by default.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        for position, item in enumerate(items, self.context.get("positions_start", 0)):
+            item.position = position
+        return super().to_representation(items)
+
+
+class ListItemPositionMixin(serializers.ModelSerializer):
+    """
+    Serialize 0-based position of the item in the list as `order`, instead of its sparse `order` (see
+    `books/ordering.py`). Positions are set by `ListItemPositionListSerializer` for enumerated items and on
+    appending for created ones (`GapOrderedModel.save()`), never queried per item.
+    NB: set `list_serializer_class = ListItemPositionListSerializer` in `Meta`.
+    """
+
+    order = serializers.SerializerMethodField()
+
+    def get_order(self, instance: ListItem) -> Optional[int]:
+        return getattr(instance, "position", None)
+
+
+class ListItemDetailSerializer(
+    ListItemPositionMixin, SparseFieldsetsSerializerMixin, serializers.ModelSerializer
+):
     """
     Detailed serializer for `ListItem`.
     """
@@ -262,6 +351,7 @@ class ListItemDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ListItem
+        list_serializer_class = ListItemPositionListSerializer
         fields = [
             "id",
             "order",
@@ -272,7 +362,9 @@ class ListItemDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class ListItemListSerializer(serializers.ModelSerializer):
+class ListItemListSerializer(
+    ListItemPositionMixin, SparseFieldsetsSerializerMixin, serializers.ModelSerializer
+):
     """
     Compact serializer for `ListItem`.
     """
@@ -281,6 +373,7 @@ class ListItemListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ListItem
+        list_serializer_class = ListItemPositionListSerializer
         fields = [
             "id",
             "order",
@@ -291,13 +384,14 @@ class ListItemListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ListItemMinimalSerializer(serializers.ModelSerializer):
+class ListItemMinimalSerializer(ListItemPositionMixin, serializers.ModelSerializer):
     """
     Used to create and delete `ListItem`s.
     """
 
     class Meta:
         model = ListItem
+        list_serializer_class = ListItemPositionListSerializer
         fields = [
             "id",
             "list",
@@ -308,29 +402,57 @@ class ListItemMinimalSerializer(serializers.ModelSerializer):
             "updated",
         ]
 
-    def is_valid(self, *, raise_exception=False):
+    def save(self, **kwargs):
         """
-        Do not allow adding the book to the same list more than once.
+        Do not allow adding the book to the same list more than once: duplicates are reported by the unique
+        constraint on insert, which is correct under concurrent requests and costs no extra query.
         """
-        book_pk = self.initial_data.get("book")
-        list_pk = self.initial_data.get("list")
-        # Ensure that there's no `ListItem`s with these book and list already:
-        list_items = ListItem.objects.filter(
-            book=book_pk,
-            list=list_pk,
-        )
-
-        if list_items.count():
-            error = "Book pk={book} already added to the list pk={list}!".format(
-                book=book_pk,
-                list=list_pk,
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            if not is_duplicate_book_error(error):
+                raise
+            raise ValidationError(
+                [
+                    get_duplicate_book_error(
+                        self.validated_data["book"].pk, self.validated_data["list"].pk
+                    )
+                ]
             )
-            raise ValidationError([error])
 
-        return super().is_valid()
 
+class ListItemOperationSerializer(serializers.Serializer):
+    """
+    Single operation of `ListItemBatchSerializer`: add the book to the list, remove it or move it to `position`.
+    """
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    book = serializers.IntegerField(min_value=1)
+    position = serializers.IntegerField(min_value=0, required=False)
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
 
-class ListListSerializer(serializers.ModelSerializer):
+    def validate(self, attrs: dict) -> dict:
+        if attrs["op"] == OPERATION_MOVE and "position" not in attrs:
+            raise ValidationError({"position": ["Position is required to move item."]})
+        return attrs
+
+
+class ListItemBatchSerializer(serializers.Serializer):
+    """
+    Batch of operations with `ListItem`s of the List, see `books/lists.py`.
+    """
+
+    operations = serializers.ListField(
+        child=ListItemOperationSerializer(),
+        allow_empty=False,
+        max_length=BATCH_MAX_OPERATIONS,
+    )
+
+
+class ListListSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """
     List serializer for user-created `List` of books.
     Much more compact (in terms of data transferred) version than `ListDetailSerializer`.
@@ -347,13 +469,59 @@ class ListListSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "is_public",
+            "items_count",
             "items",
             "created",
             "updated",
         ]
 
 
-class ListDetailSerializer(serializers.ModelSerializer):
+class ListItemCoverSerializer(serializers.ModelSerializer):
+    """
+    Cover thumbnail of the book in the list - for use in `ListSummarySerializer`.
+    """
+
+    title = serializers.CharField(source="book.title")
+    cover_thumbnail_small = ThumbnailField(source="book.cover_image")
+    cover_placeholder = serializers.CharField(source="book.cover_placeholder")
+
+    class Meta:
+        model = ListItem
+        fields = [
+            "book",
+            "title",
+            "cover_thumbnail_small",
+            "cover_placeholder",
+        ]
+
+
+class ListSummarySerializer(
+    SparseFieldsetsSerializerMixin, serializers.ModelSerializer
+):
+    """
+    Summary of user-created `List` of books: number of items and first covers instead of all items.
+    Expects `cover_items` prefetched, see `ListListView`.
+    """
+
+    user = CustomUserMinimalSerializer(many=False)
+    covers = ListItemCoverSerializer(many=True, source="cover_items")
+
+    class Meta:
+        model = List
+        fields = [
+            "id",
+            "user",
+            "title",
+            "description",
+            "is_public",
+            "items_count",
+            "covers",
+            "created",
+            "updated",
+        ]
+
+
+class ListDetailSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """
     Detailed serializer for user-created `List` of books.
     """
@@ -369,7 +537,44 @@ class ListDetailSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "is_public",
+            "items_count",
             "items",
             "created",
             "updated",
         ]
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for `UploadSession` - chunked upload of the book's file or cover image.
+    """
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "book",
+            "field",
+            "filename",
+            "size",
+            "sha256",
+            "offset",
+            "created",
+            "updated",
+        ]
+        read_only_fields = ["offset"]
+
+    def validate_size(self, value: int) -> int:
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise ValidationError(
+                "File size must be from 1 to {max_size} bytes.".format(
+                    max_size=settings.UPLOAD_MAX_SIZE
+                )
+            )
+        return value
+
+    def validate_sha256(self, value: str) -> str:
+        value = value.lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", value):
+            raise ValidationError("SHA-256 checksum must be 64 hex digits.")
+        return value
@@ -0,0 +1,331 @@
+"""
+Signal handlers for models from `books` app.
+
+Connected in `BooksConfig.ready()`.
+"""
+from typing import List as ListType
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core.images import update_image_metadata
+from core.storage import add_reference, get_content_addressed_fields, release_reference
+
+from .autocomplete import invalidate_index
+from .counters import COUNTED_FOREIGN_KEYS, change_counter
+from .models import Author, Book, List, ListItem, Publisher, Tag
+from .response_cache import invalidate_model_responses
+from .search import update_search_vector
+
+
+@receiver(post_save, sender=Book)
+def update_book_search_vector(sender, instance: Book, **kwargs):
+    """
+    Recompute search vector of the saved book.
+    """
+    update_search_vector(Book.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def update_search_vector_on_authors_changed(
+    sender, instance, action: str, reverse: bool, pk_set, **kwargs
+):
+    """
+    Recompute search vectors when books' authors change (from either side of the relation).
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            update_search_vector(Book.objects.filter(pk=instance.pk))
+        return
+
+    # `instance` is an `Author` here, `pk_set` contains books' pks.
+    if action == "pre_clear":
+        instance._search_book_pks = list(instance.books.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        update_search_vector(Book.objects.filter(pk__in=pk_set))
+    elif action == "post_clear":
+        update_search_vector(
+            Book.objects.filter(pk__in=getattr(instance, "_search_book_pks", []))
+        )
+
+
+@receiver(post_save, sender=Author)
+def update_search_vector_on_author_saved(sender, instance: Author, **kwargs):
+    """
+    Author's name is a part of the search vector of all his books.
+    """
+    update_search_vector(Book.objects.filter(authors=instance))
+
+
+@receiver(pre_delete, sender=Author)
+def remember_books_of_deleted_author(sender, instance: Author, **kwargs):
+    """
+    Remember author's books before the relations are removed along with the author.
+    """
+    instance._search_book_pks = list(instance.books.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Author)
+def update_search_vector_on_author_deleted(sender, instance: Author, **kwargs):
+    """
+    Remove deleted author's name from search vectors of his books.
+    """
+    update_search_vector(
+        Book.objects.filter(pk__in=getattr(instance, "_search_book_pks", []))
+    )
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_autocomplete_index(sender, **kwargs):
+    """
+    Rebuild autocomplete index when authors, publishers or tags change.
+    """
+    invalidate_index(sender)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=List)
+@receiver(post_delete, sender=List)
+@receiver(post_save, sender=ListItem)
+@receiver(post_delete, sender=ListItem)
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_responses(sender, update_fields=None, **kwargs):
+    """
+    Invalidate cached responses depending on the changed model (see `books/response_cache.py`).
+    """
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        # Users' last logins are never serialized.
+        return
+    invalidate_model_responses(sender)
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+@receiver(m2m_changed, sender=Book.tags.through)
+def invalidate_cached_responses_on_relations_changed(sender, action: str, **kwargs):
+    """
+    Invalidate cached responses with books when books' authors or tags change (from either side of the relation).
+    Relations are versioned separately - they don't change books' `updated` timestamps (see `books/conditional.py`).
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_model_responses(sender)
+
+
+@receiver(pre_save, sender=Book)
+@receiver(pre_save, sender=Author)
+@receiver(pre_save, sender=get_user_model())
+def set_image_metadata(sender, instance, raw: bool, **kwargs):
+    """
+    Store dimensions and placeholder of the uploaded image (not yet saved to the storage at this point).
+    """
+    if not raw:
+        update_image_metadata(instance)
+
+
+def get_compared_fields(model, files: bool = True) -> ListType[str]:
+    """
+    Return names of fields, which `post_save` handlers compare with their stored values: files (references to them
+    are counted) and foreign keys to objects with counters.
+    """
+    fields = get_content_addressed_fields(model) if files else []
+    if model in COUNTED_FOREIGN_KEYS:
+        fields.append(COUNTED_FOREIGN_KEYS[model])
+    return fields
+
+
+def is_field_saved(model, field_name: str, update_fields=None) -> bool:
+    if update_fields is None:
+        return True
+    field = model._meta.get_field(field_name)
+    return field.name in update_fields or field.attname in update_fields
+
+
+@receiver(pre_save, sender=Book)
+@receiver(pre_save, sender=Author)
+@receiver(pre_save, sender=ListItem)
+@receiver(pre_save, sender=get_user_model())
+def remember_stored_values(sender, instance, raw: bool, update_fields=None, **kwargs):
+    """
+    Remember stored values of compared fields (see `get_compared_fields()`) before the object is saved,
+    with single query.
+    """
+    fields = [
+        sender._meta.get_field(field_name).attname
+        # References to files aren't counted for loaded fixtures.
+        for field_name in get_compared_fields(sender, files=not raw)
+        if is_field_saved(sender, field_name, update_fields)
+    ]
+    stored_values = None
+    if instance.pk is not None and fields:
+        stored_values = (
+            sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+        )
+    instance._stored_values = stored_values or {}
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=get_user_model())
+def update_stored_file_references(
+    sender, instance, raw: bool, update_fields=None, **kwargs
+):
+    """
+    Add references to newly saved files and release references to replaced ones (not for loaded fixtures - their
+    files are counted by `python manage.py deduplicate_files`).
+    """
+    if raw:
+        return
+    old_names = getattr(instance, "_stored_values", {})
+    for field_name in get_content_addressed_fields(sender):
+        if not is_field_saved(sender, field_name, update_fields):
+            continue
+        old_name = old_names.get(field_name) or ""
+        new_name = getattr(instance, field_name).name or ""
+        if new_name == old_name:
+            continue
+        if new_name:
+            add_reference(new_name)
+        if old_name:
+            release_reference(old_name)
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=get_user_model())
+def release_stored_files(sender, instance, **kwargs):
+    """
+    Release references to files of the deleted object.
+    """
+    for field_name in get_content_addressed_fields(sender):
+        name = getattr(instance, field_name).name
+        if name:
+            release_reference(name)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=ListItem)
+def update_parent_counter(
+    sender, instance, created: bool, update_fields=None, **kwargs
+):
+    """
+    Count the new book of the publisher (item of the list), or move the book between publishers' counters
+    (see `books/counters.py`).
+    NB: fixtures are counted too (`raw` saves) - run `recount` command after loading fixtures with counters.
+    """
+    field = sender._meta.get_field(COUNTED_FOREIGN_KEYS[sender])
+    if not is_field_saved(sender, field.name, update_fields):
+        return
+    parent_pk = getattr(instance, field.attname)
+    old_parent_pk = getattr(instance, "_stored_values", {}).get(field.attname)
+    if parent_pk != old_parent_pk:
+        change_counter(field.related_model, [old_parent_pk], -1)
+        change_counter(field.related_model, [parent_pk], 1)
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=ListItem)
+def decrement_parent_counter(sender, instance, origin=None, **kwargs):
+    """
+    Uncount the deleted book of the publisher (item of the list).
+    """
+    field = sender._meta.get_field(COUNTED_FOREIGN_KEYS[sender])
+    parent_pk = getattr(instance, field.attname)
+    if isinstance(origin, field.related_model) and origin.pk == parent_pk:
+        # Deleted along with the parent - its counter is deleted too.
+        return
+    change_counter(field.related_model, [parent_pk], -1)
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+@receiver(m2m_changed, sender=Book.tags.through)
+def update_books_counters_on_relations_changed(
+    sender, instance, action: str, reverse: bool, model, pk_set, **kwargs
+):
+    """
+    Update numbers of books of authors (tags) by relations actually added or removed, from either side
+    of the relation: `pk_set` of `remove()` may contain unrelated objects, so removed relations are read beforehand.
+    """
+    field = next(
+        field
+        for field in Book._meta.many_to_many
+        if field.remote_field.through is sender
+    )
+    if reverse:
+        # `instance` is an `Author` (`Tag`) here, `pk_set` contains books' pks.
+        instance_field, related_field = (
+            field.m2m_reverse_field_name(),
+            field.m2m_field_name(),
+        )
+    else:
+        instance_field, related_field = (
+            field.m2m_field_name(),
+            field.m2m_reverse_field_name(),
+        )
+
+    if action in ("pre_remove", "pre_clear"):
+        relations = sender.objects.filter(**{instance_field: instance.pk})
+        if action == "pre_remove":
+            relations = relations.filter(**{related_field + "__in": pk_set})
+        instance._counted_related_pks = list(
+            relations.values_list(related_field + "_id", flat=True)
+        )
+        return
+    if action == "post_add":
+        related_pks, delta = pk_set, 1
+    elif action in ("post_remove", "post_clear"):
+        related_pks, delta = getattr(instance, "_counted_related_pks", []), -1
+        instance._counted_related_pks = []
+    else:
+        return
+
+    if reverse:
+        change_counter(type(instance), [instance.pk], delta * len(related_pks))
+    else:
+        change_counter(model, related_pks, delta)
+
+
+@receiver(pre_delete, sender=Book)
+def remember_authors_and_tags_of_deleted_book(sender, instance: Book, **kwargs):
+    """
+    Remember authors and tags of the book before the relations are removed along with the book (without signals).
+    """
+    instance._counted_relations = {
+        Author: list(
+            Book.authors.through.objects.filter(book_id=instance.pk).values_list(
+                "author_id", flat=True
+            )
+        ),
+        Tag: list(
+            Book.tags.through.objects.filter(book_id=instance.pk).values_list(
+                "tag_id", flat=True
+            )
+        ),
+    }
+
+
+@receiver(post_delete, sender=Book)
+def decrement_books_counters_of_deleted_book(sender, instance: Book, **kwargs):
+    """
+    Uncount the deleted book of its authors and tags.
+    """
+    for model, pks in getattr(instance, "_counted_relations", {}).items():
+        change_counter(model, pks, -1)
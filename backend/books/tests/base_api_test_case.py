@@ -1,6 +1,7 @@
 import json
 
 from django.conf import settings
+from django.core.cache import cache
 
 from rest_framework.test import APITestCase
 
@@ -34,6 +35,8 @@ class BaseAPITest(APITestCase):
         """
         Login to get auth token for further tests.
         """
+        # Rolled back changes of previous tests don't invalidate cached responses.
+        cache.clear()
         url = "/api/v1/token/login/"
         response = self.client.post(
             url,
@@ -96,7 +99,9 @@ class BaseAPITest(APITestCase):
             )
 
         if book_instance.file:
-            self.assertEqual(book_data["file"], book_instance.file.url)
+            self.assertEqual(
+                book_data["file"], f"/api/v1/books/{book_instance.pk}/download/"
+            )
 
         self.assertEqual(
             book_data["created"], book_instance.created.astimezone().isoformat()
@@ -140,7 +145,7 @@ class BaseAPITest(APITestCase):
         Check each field serialized using `ListItemListSerializer`.
         """
         self.assertEqual(list_item_data["id"], list_item_instance.pk)
-        self.assertEqual(list_item_data["order"], list_item_instance.order)
+        self.assertEqual(list_item_data["order"], list_item_instance.get_position())
         self.assertEqual(list_item_data["description"], list_item_instance.description)
         self.assertEqual(
             list_item_data["created"],
@@ -212,7 +217,9 @@ class BaseAPITest(APITestCase):
             )
 
         if book_instance.file:
-            self.assertEqual(book_data["file"], book_instance.file.url)
+            self.assertEqual(
+                book_data["file"], f"/api/v1/books/{book_instance.pk}/download/"
+            )
 
         self.assertEqual(
             book_data["created"], book_instance.created.astimezone().isoformat()
@@ -271,7 +278,7 @@ class BaseAPITest(APITestCase):
         Check each field serialized using `ListItemDetailSerializer`.
         """
         self.assertEqual(list_item_data["id"], list_item_instance.pk)
-        self.assertEqual(list_item_data["order"], list_item_instance.order)
+        self.assertEqual(list_item_data["order"], list_item_instance.get_position())
         self.assertEqual(list_item_data["description"], list_item_instance.description)
         self.assertEqual(
             list_item_data["created"],
@@ -4,11 +4,14 @@
 #
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.test import tag as tag_test
 
 from rest_framework import status
 
 from books.models import Author
+from books.search import DEFAULT_SIMILARITY_THRESHOLD
 
 from .base_api_test_case import BaseAPITest
 
@@ -96,6 +99,86 @@ class AuthorsAPITest(BaseAPITest):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(len(authors), authors_filtered.count())
 
+    def test_authors_list_with_fuzzy_query_api(self):
+        """
+        Ensure that `AuthorListView` with `?query=...&fuzzy=true`:
+
+        - finds authors by last, first or middle name despite typos in the query;
+        - orders results by similarity;
+        - respects `?threshold=` parameter.
+        """
+        zhukovsky = Author.objects.create(
+            last_name="Zhukovsky",
+            first_name="Vasily",
+            middle_name="Andreyevich",
+        )
+        zhukov = Author.objects.create(last_name="Zhukov")
+
+        url = "/api/v1/authors/?query=Zhukovskiy&fuzzy=true"
+        response = self.client.get(
+            url,
+        )
+
+        authors = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author["id"] for author in authors],
+            [zhukovsky.pk, zhukov.pk],
+        )
+
+        url = "/api/v1/authors/?query=Vasiliy&fuzzy=true"
+        response = self.client.get(
+            url,
+        )
+
+        authors = json.loads(response.content)
+        self.assertEqual([author["id"] for author in authors], [zhukovsky.pk])
+
+        url = "/api/v1/authors/?query=Zhukovskiy&fuzzy=true&threshold=0.6"
+        response = self.client.get(
+            url,
+        )
+
+        authors = json.loads(response.content)
+        self.assertEqual([author["id"] for author in authors], [zhukovsky.pk])
+
+        # Thresholds lower than the default one act as the default one (trigram indexes are used).
+        url = "/api/v1/authors/?query=Zhukovskiy&fuzzy=true&threshold=0.05"
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                url,
+            )
+
+        authors = json.loads(response.content)
+        self.assertEqual(
+            [author["id"] for author in authors], [zhukovsky.pk, zhukov.pk]
+        )
+        self.assertIn(
+            '"books_author"."last_name" % \'Zhukovskiy\'',
+            context.captured_queries[-1]["sql"],
+        )
+
+        # The threshold isn't left in the database session.
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW pg_trgm.similarity_threshold")
+            self.assertEqual(float(cursor.fetchone()[0]), DEFAULT_SIMILARITY_THRESHOLD)
+
+    def test_authors_list_with_fuzzy_false_api(self):
+        """
+        Ensure that `AuthorListView` with `?fuzzy=false` or `?fuzzy=0` searches by substring, not fuzzily.
+        """
+        Author.objects.create(last_name="Zhukovsky")
+
+        for fuzzy in ["false", "0"]:
+            url = f"/api/v1/authors/?query=Zhukovskiy&fuzzy={fuzzy}"
+            response = self.client.get(
+                url,
+            )
+
+            authors = json.loads(response.content)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(authors, [])
+
     def test_authors_create_fails_without_auth_api(self):
         """
         Ensure that `AuthorCreateView` using POST method:
@@ -0,0 +1,155 @@
+#
+# Tests for `autocomplete/` endpoint.
+#
+import json
+
+from django.core.cache import cache
+from rest_framework import status
+
+from books.models import Author, Publisher, Tag
+
+from .base_api_test_case import BaseAPITest
+
+
+class AutocompleteAPITest(BaseAPITest):
+    """
+    Test `autocomplete/` DRF API endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Indexes are kept in memory between tests, while DB changes are rolled back - force rebuild.
+        cache.clear()
+
+    def test_autocomplete_authors_api(self):
+        """
+        Ensure that `AutocompleteView` for authors:
+
+        - is located at expected URL;
+        - return `id` and `label` (full name) of authors with words starting with each word of the query;
+        - sets `Cache-Control` header.
+        """
+        author_instance = Author.objects.get(last_name="Мартин")
+
+        for query in ["мар", "Роб", "мартин ро"]:
+            url = f"/api/v1/autocomplete/authors/?query={query}"
+            response = self.client.get(
+                url,
+            )
+
+            results = json.loads(response.content)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn(
+                {"id": author_instance.pk, "label": author_instance.full_name},
+                results,
+            )
+            self.assertIn("max-age=", response["Cache-Control"])
+
+            for result in results:
+                self.assertEqual(set(result.keys()), {"id", "label"})
+
+        url = "/api/v1/autocomplete/authors/?query=мартин фа"
+        response = self.client.get(
+            url,
+        )
+
+        results = json.loads(response.content)
+        self.assertNotIn(author_instance.pk, [result["id"] for result in results])
+
+    def test_autocomplete_publishers_and_tags_api(self):
+        """
+        Ensure that `AutocompleteView` works for publishers and tags.
+        """
+        publisher_instance = Publisher.objects.get(title="Packt")
+        tag_instance = Tag.objects.get(title="Python")
+
+        url = "/api/v1/autocomplete/publishers/?query=pack"
+        response = self.client.get(
+            url,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            [{"id": publisher_instance.pk, "label": "Packt"}],
+        )
+
+        url = "/api/v1/autocomplete/tags/?query=pyth"
+        response = self.client.get(
+            url,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            [{"id": tag_instance.pk, "label": "Python"}],
+        )
+
+    def test_autocomplete_limit_api(self):
+        """
+        Ensure that `AutocompleteView` respects `?limit=` parameter, also without query.
+        """
+        url = "/api/v1/autocomplete/tags/?limit=5"
+        response = self.client.get(
+            url,
+        )
+
+        results = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["label"] for result in results],
+            list(Tag.objects.order_by("title").values_list("title", flat=True)[:5]),
+        )
+
+    def test_autocomplete_index_refreshed_on_save_api(self):
+        """
+        Ensure that `AutocompleteView` index is refreshed when objects are created, changed and deleted.
+        """
+        url = "/api/v1/autocomplete/publishers/?query=quux"
+        self.assertEqual(json.loads(self.client.get(url).content), [])
+
+        publisher_instance = Publisher.objects.create(title="Quux Press")
+        self.assertEqual(
+            json.loads(self.client.get(url).content),
+            [{"id": publisher_instance.pk, "label": "Quux Press"}],
+        )
+
+        publisher_instance.title = "Quuxbooks"
+        publisher_instance.save()
+        self.assertEqual(
+            json.loads(self.client.get(url).content),
+            [{"id": publisher_instance.pk, "label": "Quuxbooks"}],
+        )
+
+        publisher_instance.delete()
+        self.assertEqual(json.loads(self.client.get(url).content), [])
+
+    def test_autocomplete_fuzzy_fallback_api(self):
+        """
+        Ensure that `AutocompleteView` falls back to fuzzy search when there are no prefix matches.
+        """
+        author_instance = Author.objects.create(
+            last_name="Zhukovsky", first_name="Vasily"
+        )
+
+        url = "/api/v1/autocomplete/authors/?query=Zhukovskiy"
+        response = self.client.get(
+            url,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            [{"id": author_instance.pk, "label": "Zhukovsky Vasily"}],
+        )
+
+    def test_autocomplete_unknown_kind_api(self):
+        """
+        Ensure that `AutocompleteView` return `HTTP_404_NOT_FOUND` for unknown kind of objects.
+        """
+        url = "/api/v1/autocomplete/books/?query=python"
+        response = self.client.get(
+            url,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
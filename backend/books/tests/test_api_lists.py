@@ -314,3 +314,129 @@ class ListsAPITest(BaseAPITest):
             )
 
             self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_lists_list_sparse_fieldsets_api(self):
+        """
+        Ensure that `ListListView` with `?fields=` return only requested fields of lists and nested items / books.
+        """
+        url = "/api/v1/lists/?fields=id,title,items.book.id,items.book.title"
+        with self.assertNumQueries(4):
+            # Validators, lists, their items and items' books
+            response = self.client.get(
+                url,
+            )
+
+        lists_data = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(lists_data), List.objects.filter(is_public=True).count())
+
+        for list_data in lists_data:
+            list_instance = List.objects.get(pk=list_data["id"])
+            self.assertEqual(
+                list_data,
+                {
+                    "id": list_instance.pk,
+                    "title": list_instance.title,
+                    "items": [
+                        {"book": {"id": item.book.pk, "title": item.book.title}}
+                        for item in list_instance.items.all()
+                    ],
+                },
+            )
+
+    def test_lists_detail_sparse_fieldsets_api(self):
+        """
+        Ensure that `ListDetailView` with `?fields=` still checks access to private lists.
+        """
+        others_private_list = (
+            List.objects.filter(
+                is_public=False,
+            )
+            .exclude(user=self.new_user)
+            .first()
+        )
+        own_private_list = List.objects.filter(
+            user=self.new_user,
+            is_public=False,
+        ).first()
+
+        url = f"/api/v1/lists/{others_private_list.pk}/?fields=id,title"
+        response = self.client.get(
+            url,
+            **{"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        url = f"/api/v1/lists/{own_private_list.pk}/?fields=id,title"
+        response = self.client.get(
+            url,
+            **{"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {"id": own_private_list.pk, "title": own_private_list.title},
+        )
+
+    def test_lists_list_summary_api(self):
+        """
+        Ensure that `ListListView` with `?summary=true` return number of items and first covers of lists.
+        """
+        url = "/api/v1/lists/?summary=true"
+        with self.assertNumQueries(3):
+            # Validators, lists with their users and items count, first items with covers
+            response = self.client.get(
+                url,
+            )
+
+        lists_data = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(lists_data), List.objects.filter(is_public=True).count())
+
+        for list_data in lists_data:
+            list_instance = List.objects.get(pk=list_data["id"])
+            self.assertEqual(list_data["items_count"], list_instance.items.count())
+            self.assertNotIn("items", list_data)
+            cover_items = list_instance.items.exclude(book__cover_image="").exclude(
+                book__cover_image__isnull=True
+            )[:12]
+            self.assertEqual(
+                [cover["book"] for cover in list_data["covers"]],
+                [item.book_id for item in cover_items],
+            )
+            for cover, item in zip(list_data["covers"], cover_items):
+                self.assertEqual(cover["title"], item.book.title)
+                self.assertEqual(
+                    cover["cover_thumbnail_small"], item.book.cover_thumbnail_small.url
+                )
+
+    def test_lists_list_summary_with_bookid_api(self):
+        """
+        Ensure that `ListListView` with `?summary=true&book_id=...` counts all items of the lists,
+        and covers are available with sparse fieldsets.
+        """
+        url = "/api/v1/lists/?summary=true&book_id=1&fields=id,items_count,covers.book"
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                url,
+            )
+
+        lists_data = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        list_instances = List.objects.filter(items__book_id=1, is_public=True)
+        self.assertEqual(
+            lists_data,
+            [
+                {
+                    "id": list_instance.pk,
+                    "items_count": list_instance.items.count(),
+                    "covers": [
+                        {"book": item.book_id}
+                        for item in list_instance.items.exclude(
+                            book__cover_image=""
+                        ).exclude(book__cover_image__isnull=True)[:12]
+                    ],
+                }
+                for list_instance in list_instances
+            ],
+        )
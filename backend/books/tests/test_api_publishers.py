@@ -63,6 +63,51 @@ class PublishersAPITest(BaseAPITest):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(len(publishers), publishers_filtered.count())
 
+    def test_publishers_list_with_fuzzy_query_api(self):
+        """
+        Ensure that `PublisherListView` with `?query=...&fuzzy=true`:
+
+        - finds publishers despite typos in the query;
+        - orders results by similarity;
+        - respects `?threshold=` parameter.
+        """
+        Publisher.objects.create(title="Maninger")
+
+        url = "/api/v1/publishers/?query=Maning&fuzzy=true"
+        response = self.client.get(
+            url,
+        )
+
+        publishers = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [publisher["title"] for publisher in publishers],
+            ["Manning", "Maninger"],
+        )
+
+        url = "/api/v1/publishers/?query=Maning&fuzzy=true&threshold=0.9"
+        response = self.client.get(
+            url,
+        )
+
+        publishers = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(publishers), 0)
+
+    def test_publishers_list_with_fuzzy_false_api(self):
+        """
+        Ensure that `PublisherListView` with `?fuzzy=false` or `?fuzzy=0` searches by substring, not fuzzily.
+        """
+        for fuzzy in ["false", "0"]:
+            url = f"/api/v1/publishers/?query=Maning&fuzzy={fuzzy}"
+            response = self.client.get(
+                url,
+            )
+
+            publishers = json.loads(response.content)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(publishers, [])
+
     def test_publishers_create_fails_without_auth_api(self):
         """
         Ensure that `PublisherListView` using POST method:
@@ -0,0 +1,162 @@
+#
+# Tests for conditional GET (`ETag` / `Last-Modified`), see `books/conditional.py`.
+#
+from django.utils.http import http_date
+from rest_framework import status
+
+from books.models import Book, List, ListItem, Note, Tag
+
+from .base_api_test_case import BaseAPITest
+
+
+class ConditionalGetTest(BaseAPITest):
+    """
+    Test validators of detail and list views and `304 Not Modified` responses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {"HTTP_AUTHORIZATION": "Token " + self.auth_token}
+
+    def get_etag(self, url: str) -> str:
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def assertNotModified(self, url: str, etag: str):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_not_modified(self):
+        """
+        Ensure that unchanged responses aren't serialized again.
+        """
+        book = Book.objects.first()
+        list_instance = List.objects.filter(is_public=True).first()
+        for url in [
+            "/api/v1/books/",
+            f"/api/v1/books/{book.pk}/",
+            "/api/v1/notes/",
+            "/api/v1/lists/?summary=true",
+            f"/api/v1/lists/{list_instance.pk}/",
+            f"/api/v1/lists/{list_instance.pk}/items/",
+        ]:
+            etag = self.get_etag(url)
+            self.assertTrue(etag.startswith('W/"'))
+            self.assertNotModified(url, etag)
+
+        url = f"/api/v1/lists/{list_instance.pk}/"
+        etag = self.get_etag(url)
+        with self.assertNumQueries(2):
+            # List, validators (the token is cached)
+            self.assertNotModified(url, etag)
+
+        # `If-Modified-Since` alone doesn't prove that nothing was deleted.
+        last_modified = self.client.get(url, **self.headers)["Last-Modified"]
+        self.assertEqual(
+            last_modified,
+            http_date(
+                max(
+                    list_instance.updated,
+                    *list_instance.items.values_list("updated", flat=True),
+                    *list_instance.items.values_list("book__updated", flat=True),
+                ).timestamp()
+            ),
+        )
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified, **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_validators_change_with_data(self):
+        """
+        Ensure that changes of objects, their related objects and relations change the ETag.
+        """
+        list_instance = List.objects.filter(is_public=True).first()
+        book = list_instance.items.first().book
+        url = f"/api/v1/lists/{list_instance.pk}/"
+        book_url = f"/api/v1/books/{book.pk}/"
+        etags = {self.get_etag(url), self.get_etag(book_url)}
+
+        book.title = "Changed title"
+        book.save()
+        etags |= {self.get_etag(url), self.get_etag(book_url)}
+        self.assertEqual(len(etags), 4)
+
+        book.tags.add(Tag.objects.create(title="New tag"))
+        etags |= {self.get_etag(url), self.get_etag(book_url)}
+        self.assertEqual(len(etags), 6)
+
+        ListItem.objects.filter(list=list_instance).last().delete()
+        etags.add(self.get_etag(url))
+        self.assertEqual(len(etags), 7)
+
+        # Other users get other ETags.
+        self.headers = {}
+        self.assertNotIn(self.get_etag(url), etags)
+
+    def test_validators_change_with_order(self):
+        """
+        Ensure that moves of list items, which save only orders, change the ETag.
+        """
+        list_instance = List.objects.create(
+            user=self.new_user, title="Ordered list", is_public=True
+        )
+        books = list(Book.objects.order_by("pk")[:3])
+        for book in books:
+            ListItem.objects.create(list=list_instance, book=book)
+        urls = [
+            f"/api/v1/lists/{list_instance.pk}/",
+            f"/api/v1/lists/{list_instance.pk}/items/",
+        ]
+        etags = {self.get_etag(url) for url in urls}
+
+        list_instance.items.first().bottom()
+        etags |= {self.get_etag(url) for url in urls}
+        self.assertEqual(len(etags), 4)
+
+        response = self.client.post(
+            f"/api/v1/lists/{list_instance.pk}/items/batch/",
+            {"operations": [{"op": "move", "book": books[2].pk, "position": 0}]},
+            format="json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etags |= {self.get_etag(url) for url in urls}
+        self.assertEqual(len(etags), 6)
+
+    def test_note_validators(self):
+        """
+        Ensure that notes are validated, and other users' notes are still forbidden.
+        """
+        note = Note.objects.create(
+            user=self.new_user, book=Book.objects.first(), text="Note"
+        )
+        url = f"/api/v1/notes/{note.pk}/"
+        etag = self.get_etag(url)
+        self.assertNotModified(url, etag)
+
+        note.text = "Changed text"
+        note.save()
+        self.assertNotEqual(self.get_etag(url), etag)
+
+        other_note = Note.objects.exclude(user=self.new_user).first()
+        response = self.client.get(
+            f"/api/v1/notes/{other_note.pk}/", HTTP_IF_NONE_MATCH="*", **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cached_responses_validated(self):
+        """
+        Ensure that anonymous visitors' responses served from cache keep validators and may be not modified.
+        """
+        url = "/api/v1/books/"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response["ETag"], etag)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
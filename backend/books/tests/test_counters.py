@@ -0,0 +1,154 @@
+#
+# Tests for denormalized counters of books and list items, see `books/counters.py`.
+#
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from books.models import Author, Book, List, ListItem, Publisher, Tag
+
+from .base_api_test_case import BaseAPITest
+
+
+class CountersTest(BaseAPITest):
+    """
+    Test maintenance of counters by signal handlers, their repair and ordering by them.
+    """
+
+    def assertCountersActual(self):
+        for model, field, relation in [
+            (Author, "books_count", "books"),
+            (Publisher, "books_count", "books"),
+            (Tag, "books_count", "books"),
+            (List, "items_count", "items"),
+        ]:
+            for instance in model.objects.annotate(actual_count=Count(relation)):
+                self.assertEqual(getattr(instance, field), instance.actual_count)
+
+    def test_fixtures_counted(self):
+        """
+        Ensure that books and items loaded from fixtures are counted.
+        """
+        self.assertCountersActual()
+        self.assertTrue(Author.objects.filter(books_count__gt=0).exists())
+
+    def test_counters_follow_changes(self):
+        """
+        Ensure that counters change with books, their relations from either side and list items.
+        """
+        publisher, other_publisher = Publisher.objects.all()[:2]
+        author = Author.objects.first()
+        tag = Tag.objects.create(title="New tag")
+        book = Book.objects.create(title="New book", publisher=publisher)
+        book.authors.add(author)
+        book.tags.add(tag)
+        book.tags.add(tag)
+        self.assertCountersActual()
+
+        book.publisher = other_publisher
+        book.save()
+        unrelated_author = Author.objects.exclude(pk=author.pk).first()
+        book.authors.remove(author, unrelated_author)
+        tag.books.add(*Book.objects.all()[:3])
+        self.assertCountersActual()
+
+        tag.books.remove(Book.objects.first())
+        book.tags.clear()
+        self.assertCountersActual()
+
+        list_instance = List.objects.first()
+        item = ListItem.objects.create(list=list_instance, book=book)
+        self.assertCountersActual()
+        item.delete()
+        book.delete()
+        self.assertCountersActual()
+
+        list_instance.delete()
+        Publisher.objects.filter(pk=publisher.pk).delete()
+        self.assertCountersActual()
+
+    def test_stored_row_read_once(self):
+        """
+        Ensure that the book's stored row is read once before saving, for both files and counters.
+        """
+        book = Book.objects.exclude(publisher=None).first()
+        book.publisher = Publisher.objects.exclude(pk=book.publisher_id).first()
+        with CaptureQueriesContext(connection) as context:
+            book.save()
+        queries = [query["sql"] for query in context.captured_queries]
+        update_index = next(
+            index
+            for index, sql in enumerate(queries)
+            if sql.startswith('UPDATE "books_book"')
+        )
+        self.assertEqual(
+            len([sql for sql in queries[:update_index] if sql.startswith("SELECT")]), 1
+        )
+        self.assertCountersActual()
+
+    def test_batch_counted(self):
+        """
+        Ensure that batch changes of list items update the list's counter with a single query,
+        whatever the number of removed items.
+        """
+        list_instance = List.objects.create(user=self.new_user, title="Batch list")
+        books = list(Book.objects.all()[:6])
+        for book in books[:4]:
+            ListItem.objects.create(list=list_instance, book=book)
+
+        query_counts = []
+        for operations in [
+            [{"op": "remove", "book": books[0].pk}],
+            [{"op": "remove", "book": book.pk} for book in books[1:4]]
+            + [{"op": "add", "book": book.pk} for book in books[4:]],
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    f"/api/v1/lists/{list_instance.pk}/items/batch/",
+                    {"operations": operations},
+                    format="json",
+                    **{"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            query_counts.append(len(context.captured_queries))
+
+        # The second batch also inserts items.
+        self.assertEqual(query_counts[1], query_counts[0] + 1)
+        list_instance.refresh_from_db()
+        self.assertEqual(list_instance.items_count, 2)
+        self.assertCountersActual()
+
+    def test_recount(self):
+        """
+        Ensure that drifted counters are repaired by `recount` command.
+        """
+        Author.objects.update(books_count=100)
+        List.objects.filter(pk=List.objects.first().pk).update(items_count=-1)
+        stdout = StringIO()
+        call_command("recount", stdout=stdout)
+        self.assertIn(
+            "books.Author: {count} counters repaired".format(
+                count=Author.objects.count()
+            ),
+            stdout.getvalue(),
+        )
+        self.assertIn("books.List: 1 counters repaired", stdout.getvalue())
+        self.assertCountersActual()
+
+    def test_ordering(self):
+        """
+        Ensure that authors, publishers and lists are ordered by counters.
+        """
+        for url, field in [
+            ("/api/v1/authors/?ordering=-books_count", "books_count"),
+            ("/api/v1/publishers/?ordering=-books_count", "books_count"),
+            ("/api/v1/lists/?summary=true&ordering=-items_count", "items_count"),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts = [data[field] for data in response.data]
+            self.assertEqual(counts, sorted(counts, reverse=True))
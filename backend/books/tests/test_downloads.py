@@ -0,0 +1,146 @@
+#
+# Tests for book files download endpoints, see `books/downloads.py`.
+#
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from books.models import Book
+from users.models import CustomUser
+
+from .test_images import TemporaryMediaRootTestCase
+
+FILE_CONTENT = bytes(range(256)) * 40
+
+
+class BookDownloadTest(TemporaryMediaRootTestCase):
+    """
+    Test `BookDownloadView` and `BookDownloadLinkView`.
+    """
+
+    client_class = APIClient
+
+    def setUp(self):
+        super().setUp()
+        self.book = Book.objects.create(
+            title="Чистый код",
+            file=SimpleUploadedFile("clean_code.pdf", FILE_CONTENT),
+        )
+        self.url = "/api/v1/books/{pk}/download/".format(pk=self.book.pk)
+        self.staff_token = Token.objects.create(
+            user=CustomUser.objects.create_user("staff", is_staff=True)
+        ).key
+        self.user_token = Token.objects.create(
+            user=CustomUser.objects.create_user("user")
+        ).key
+
+    def get(self, url: str, token: str = None, **headers):
+        if token:
+            headers["HTTP_AUTHORIZATION"] = "Token " + token
+        return self.client.get(url, **headers)
+
+    def test_download_access(self):
+        """
+        Ensure that only staff users, or requests with valid signed link, can download the file.
+        """
+        response = self.get(self.url, self.staff_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), FILE_CONTENT)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(
+            response["Content-Disposition"],
+            "inline; filename*=utf-8''%D0%A7%D0%B8%D1%81%D1%82%D1%8B%D0%B9%20%D0%BA%D0%BE%D0%B4.pdf",
+        )
+
+        self.assertEqual(self.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            self.get(self.url, self.user_token).status_code, status.HTTP_403_FORBIDDEN
+        )
+        self.assertEqual(
+            self.get(self.url + "?signature=" + str(self.book.pk)).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        link_url = "/api/v1/books/{pk}/download_link/".format(pk=self.book.pk)
+        self.assertEqual(
+            self.get(link_url, self.user_token).status_code, status.HTTP_403_FORBIDDEN
+        )
+        response = self.get(link_url, self.staff_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        signed_url = response.data["url"]
+        self.assertTrue(signed_url.startswith(self.url + "?signature="))
+
+        response = self.get(signed_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), FILE_CONTENT)
+
+        other_book = Book.objects.create(
+            title="Other book", file=SimpleUploadedFile("other.pdf", b"other")
+        )
+        response = self.get(
+            signed_url.replace(
+                "/{pk}/".format(pk=self.book.pk), "/{pk}/".format(pk=other_book.pk)
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_range_requests(self):
+        """
+        Ensure that HTTP Range requests are supported when the file is sent by Django.
+        """
+        size = len(FILE_CONTENT)
+
+        for header, start, end in [
+            ("bytes=0-99", 0, 99),
+            ("bytes=10000-", 10000, size - 1),
+            ("bytes=-100", size - 100, size - 1),
+            ("bytes=5000-999999", 5000, size - 1),
+        ]:
+            response = self.get(self.url, self.staff_token, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+            self.assertEqual(
+                b"".join(response.streaming_content), FILE_CONTENT[start : end + 1]
+            )
+            self.assertEqual(response["Content-Length"], str(end - start + 1))
+            self.assertEqual(
+                response["Content-Range"],
+                "bytes {start}-{end}/{size}".format(start=start, end=end, size=size),
+            )
+
+        response = self.get(self.url, self.staff_token, HTTP_RANGE="bytes=99999-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], "bytes */{size}".format(size=size))
+
+        # Multiple ranges and outdated `If-Range` - the whole file is sent.
+        for headers in [
+            {"HTTP_RANGE": "bytes=0-9,20-29"},
+            {
+                "HTTP_RANGE": "bytes=0-9",
+                "HTTP_IF_RANGE": "Sat, 01 Jan 2000 00:00:00 GMT",
+            },
+        ]:
+            response = self.get(self.url, self.staff_token, **headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(b"".join(response.streaming_content), FILE_CONTENT)
+
+    @override_settings(
+        BOOK_FILES_DELIVERY="x-accel-redirect",
+        BOOK_FILES_ACCEL_REDIRECT_LOCATION="/protected-media/",
+    )
+    def test_x_accel_redirect(self):
+        """
+        Ensure that with `BOOK_FILES_DELIVERY = "x-accel-redirect"` the file is sent by nginx.
+        """
+        response = self.get(self.url, self.staff_token, HTTP_RANGE="bytes=0-99")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"], "/protected-media/" + self.book.file.name
+        )
+        self.assertEqual(response["Content-Type"], "application/pdf")
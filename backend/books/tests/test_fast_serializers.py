@@ -0,0 +1,75 @@
+#
+# Tests for fast serializers from `books/fast_serializers.py`.
+#
+import json
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from books.fast_serializers import BookListFastSerializer
+from books.models import Book
+from books.serializers import BookListSerializer
+
+from .base_api_test_case import BaseAPITest
+
+
+class BookListFastSerializerTest(BaseAPITest):
+    """
+    Test `BookListFastSerializer`.
+    """
+
+    def test_output_is_identical_to_book_list_serializer(self):
+        """
+        Ensure that `BookListFastSerializer` output, rendered to JSON, is byte-identical to `BookListSerializer`
+        output - for books with and without images, publisher, user, authors and tags.
+        """
+        book_instance = Book.objects.filter(authors__isnull=False).first()
+        book_instance.publisher = None
+        book_instance.user = None
+        book_instance.cover_image = None
+        book_instance.year = None
+        book_instance.save()
+        book_instance.tags.clear()
+
+        queryset = (
+            Book.objects.all()
+            .prefetch_related(
+                "authors",
+                "tags",
+            )
+            .select_related(
+                "publisher",
+                "user",
+            )
+        )
+        request = Request(APIRequestFactory().get("/api/v1/books/"))
+
+        expected = JSONRenderer().render(
+            BookListSerializer(queryset, many=True, context={"request": request}).data
+        )
+        result = JSONRenderer().render(
+            BookListFastSerializer(BookListFastSerializer.get_values(queryset)).data
+        )
+
+        self.assertEqual(result, expected)
+        self.assertEqual(len(json.loads(result)), Book.objects.count())
+
+    def test_book_list_view_uses_fast_serializer(self):
+        """
+        Ensure that `BookListView` serializes books with `BookListFastSerializer` using fixed number of queries.
+        """
+        url = "/api/v1/books/"
+        with self.assertNumQueries(5):
+            # Validators, count, books, their authors and tags
+            response = self.client.get(
+                url,
+            )
+
+        list_page = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["id"] for book in list_page["results"]],
+            list(Book.objects.values_list("id", flat=True)[:10]),
+        )
@@ -0,0 +1,300 @@
+#
+# Tests for processing of uploaded images: thumbnails, dimensions and placeholders, see `core/images.py`.
+#
+import base64
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from books.models import Book
+from books.serializers import BookDetailSerializer
+from core.images import AVIF_SUPPORTED, get_rendition_urls, get_spec_field_names
+from core.models import ThumbnailTask
+
+# JPEG, WebP and (if supported) AVIF thumbnails
+THUMBNAIL_FIELDS = get_spec_field_names(Book, "cover_image")
+ALL_THUMBNAILS_EXIST = [True] * len(THUMBNAIL_FIELDS)
+
+
+def make_image_file(
+    name: str = "cover.jpg", color: tuple = (200, 100, 50)
+) -> SimpleUploadedFile:
+    """
+    Return uploaded JPEG image. Images of the same color are stored as the same file (see `core/storage.py`).
+    """
+    content = io.BytesIO()
+    Image.new("RGB", (300, 400), color=color).save(content, format="JPEG")
+    return SimpleUploadedFile(name, content.getvalue(), content_type="image/jpeg")
+
+
+class TemporaryMediaRootTestCase(TestCase):
+    """
+    Store uploaded files and thumbnails in temporary directory.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # `django-imagekit` caches state of thumbnail files.
+        cache.clear()
+
+    def thumbnails_exist(self, book: Book) -> list:
+        return [
+            os.path.exists(getattr(book, field_name).path)
+            for field_name in THUMBNAIL_FIELDS
+        ]
+
+
+class ThumbnailsGenerationTest(TemporaryMediaRootTestCase):
+    """
+    Test generation of `Book` cover thumbnails on upload.
+    """
+
+    def test_thumbnails_generated_on_upload(self):
+        """
+        Ensure that thumbnails are generated when the book with cover image is saved.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+
+        book = Book.objects.get(pk=book.pk)
+        self.assertEqual(self.thumbnails_exist(book), ALL_THUMBNAILS_EXIST)
+
+    def test_thumbnails_not_generated_on_read(self):
+        """
+        Ensure that getting thumbnail URL doesn't generate missing thumbnail.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        book = Book.objects.get(pk=book.pk)
+        os.remove(book.cover_thumbnail_small.path)
+
+        book = Book.objects.get(pk=book.pk)
+        self.assertTrue(book.cover_thumbnail_small.url)
+        self.assertFalse(os.path.exists(book.cover_thumbnail_small.path))
+
+    def test_modern_format_thumbnails(self):
+        """
+        Ensure that WebP thumbnails are generated and serialized as `srcset`s by MIME type, preferred formats first.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        book = Book.objects.get(pk=book.pk)
+
+        with Image.open(book.cover_thumbnail_medium_webp.path) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.width, 128)
+
+        srcset = BookDetailSerializer(book).data["cover_srcset"]
+        mime_types = ["image/webp", "image/jpeg"]
+        if AVIF_SUPPORTED:
+            mime_types.insert(0, "image/avif")
+        self.assertEqual(list(srcset), mime_types)
+        self.assertEqual(
+            srcset["image/webp"],
+            "{small} 64w, {medium} 128w, {large} 256w".format(
+                small=book.cover_thumbnail_small_webp.url,
+                medium=book.cover_thumbnail_medium_webp.url,
+                large=book.cover_thumbnail_large_webp.url,
+            ),
+        )
+
+        book.cover_image = None
+        self.assertEqual(BookDetailSerializer(book).data["cover_srcset"], {})
+
+    @override_settings(THUMBNAILS_GENERATION="queue")
+    def test_thumbnails_generated_by_worker(self):
+        """
+        Ensure that with `THUMBNAILS_GENERATION = "queue"` thumbnails are generated by `process_thumbnails` worker.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        book = Book.objects.get(pk=book.pk)
+
+        self.assertEqual(
+            list(ThumbnailTask.objects.values_list("model", "field", "name")),
+            [("books.book", "cover_image", book.cover_image.name)],
+        )
+        self.assertFalse(any(self.thumbnails_exist(book)))
+
+        call_command("process_thumbnails", "--once", stdout=io.StringIO())
+
+        self.assertEqual(self.thumbnails_exist(book), ALL_THUMBNAILS_EXIST)
+        self.assertFalse(ThumbnailTask.objects.exists())
+
+    @override_settings(THUMBNAILS_GENERATION="queue")
+    def test_failed_thumbnail_tasks_retried(self):
+        """
+        Ensure that failed tasks stay in the queue and are retried after the delay.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        book = Book.objects.get(pk=book.pk)
+        with open(book.cover_image.path, "rb") as file:
+            content = file.read()
+        os.remove(book.cover_image.path)
+
+        call_command(
+            "process_thumbnails", "--once", stdout=io.StringIO(), stderr=io.StringIO()
+        )
+        task = ThumbnailTask.objects.get()
+        self.assertEqual(task.attempts, 1)
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertFalse(any(self.thumbnails_exist(book)))
+
+        with open(book.cover_image.path, "wb") as file:
+            file.write(content)
+        ThumbnailTask.objects.update(run_after=timezone.now())
+        call_command("process_thumbnails", "--once", stdout=io.StringIO())
+
+        self.assertEqual(self.thumbnails_exist(book), ALL_THUMBNAILS_EXIST)
+        self.assertFalse(ThumbnailTask.objects.exists())
+
+
+class RenditionURLsTest(TestCase):
+    """
+    Test cached thumbnail URLs, see `get_rendition_urls()`.
+    """
+
+    def test_thumbnail_urls_cached(self):
+        """
+        Ensure that serializers return the same thumbnail URLs as `ImageSpecField`s, computed once per source image.
+        """
+        get_rendition_urls.cache_clear()
+        books = [
+            Book(pk=pk, title="Test book", cover_image="images/covers/cover.jpg")
+            for pk in range(1, 4)
+        ]
+
+        data = BookDetailSerializer(books, many=True).data
+
+        for book_data in data:
+            for field_name in THUMBNAIL_FIELDS[:3]:
+                self.assertEqual(
+                    book_data[field_name], getattr(books[0], field_name).url
+                )
+        self.assertEqual(get_rendition_urls.cache_info().misses, 1)
+
+        book = Book(pk=4, title="Test book")
+        self.assertEqual(BookDetailSerializer(book).data["cover_thumbnail_small"], "")
+
+
+class ImageMetadataTest(TemporaryMediaRootTestCase):
+    """
+    Test dimensions and placeholders of uploaded images, see `update_image_metadata()`.
+    """
+
+    def test_metadata_stored_on_upload(self):
+        """
+        Ensure that dimensions and placeholder are stored when the image is uploaded, and cleared when it's removed.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        book = Book.objects.get(pk=book.pk)
+
+        self.assertEqual((book.cover_width, book.cover_height), (300, 400))
+        self.assertTrue(book.cover_placeholder.startswith("data:image/webp;base64,"))
+        self.assertLess(len(book.cover_placeholder), 300)
+        with Image.open(
+            io.BytesIO(base64.b64decode(book.cover_placeholder.split(",")[1]))
+        ) as placeholder:
+            self.assertEqual(placeholder.size, (12, 16))
+
+        data = BookDetailSerializer(book).data
+        self.assertEqual(
+            (data["cover_width"], data["cover_height"], data["cover_placeholder"]),
+            (300, 400, book.cover_placeholder),
+        )
+
+        book.cover_image = None
+        book.save()
+        book = Book.objects.get(pk=book.pk)
+        self.assertEqual((book.cover_width, book.cover_height), (None, None))
+        self.assertEqual(book.cover_placeholder, "")
+
+    def test_update_image_metadata_command(self):
+        """
+        Ensure that `update_image_metadata` stores metadata of images uploaded before.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        Book.objects.filter(pk=book.pk).update(
+            cover_width=None, cover_height=None, cover_placeholder=""
+        )
+
+        stdout = io.StringIO()
+        call_command("update_image_metadata", stdout=stdout)
+
+        self.assertIn("books.book: 1 images updated", stdout.getvalue())
+        book = Book.objects.get(pk=book.pk)
+        self.assertEqual((book.cover_width, book.cover_height), (300, 400))
+        self.assertTrue(book.cover_placeholder)
+
+
+class GenerateThumbnailsCommandTest(TemporaryMediaRootTestCase):
+    """
+    Test `generate_thumbnails` management command.
+    """
+
+    def call_command(self, *args) -> str:
+        stdout = io.StringIO()
+        call_command("generate_thumbnails", "--workers", "1", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_generate_missing_thumbnails(self):
+        """
+        Ensure that `generate_thumbnails` generates only missing thumbnails, unless `--force` is used.
+        """
+        books = [
+            Book.objects.create(
+                title="Test book", cover_image=make_image_file(color=color)
+            )
+            for color in [(200, 100, 50), (50, 100, 200)]
+        ]
+        os.remove(books[0].cover_thumbnail_small.path)
+        os.remove(books[1].cover_thumbnail_large.path)
+
+        total = 2 * len(THUMBNAIL_FIELDS)
+
+        output = self.call_command("--model", "books.book")
+        self.assertIn("Images to process: 2", output)
+        self.assertIn(
+            "Generated: 2, up-to-date: {up_to_date}".format(up_to_date=total - 2),
+            output,
+        )
+        for book in books:
+            self.assertEqual(self.thumbnails_exist(book), ALL_THUMBNAILS_EXIST)
+
+        output = self.call_command("--model", "books.book")
+        self.assertIn("Generated: 0, up-to-date: {total}".format(total=total), output)
+
+        output = self.call_command("--model", "books.book", "--force")
+        self.assertIn("Generated: {total}, up-to-date: 0".format(total=total), output)
+
+    def test_generate_thumbnails_since(self):
+        """
+        Ensure that `generate_thumbnails --since` skips images modified earlier.
+        """
+        book = Book.objects.create(title="Test book", cover_image=make_image_file())
+        os.remove(book.cover_thumbnail_small.path)
+
+        output = self.call_command("--model", "books.book", "--since", "2100-01-01")
+        self.assertIn(
+            "Generated: 0, up-to-date: 0, not changed since: {total}".format(
+                total=len(THUMBNAIL_FIELDS)
+            ),
+            output,
+        )
+
+        output = self.call_command("--model", "books.book", "--since", "2000-01-01")
+        self.assertIn(
+            "Generated: 1, up-to-date: {up_to_date}".format(
+                up_to_date=len(THUMBNAIL_FIELDS) - 1
+            ),
+            output,
+        )
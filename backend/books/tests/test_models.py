@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from books.models import Tag, Publisher, Author, Book, List, ListItem, Note
+from books.ordering import ORDER_GAP
 from users.models import CustomUser
 
 
@@ -179,17 +180,17 @@ class BooksAppModelsTest(TestCase):
     def test_listitem_model(self):
         """
         Ensure that ListItem instances:
-        - are properly created and ordered (starting from 0);
+        - are properly created and ordered (with `ORDER_GAP` steps);
         - `__str__` works as expected.
         """
         list_instance = List.objects.first()
 
         for i, list_item in enumerate(list_instance.items.all()):
-            self.assertEqual(list_item.order, i)
+            self.assertEqual(list_item.order, ORDER_GAP * (i + 1))
             self.assertEqual(
                 str(list_item),
                 "#{order} в {list_title} - {book_title}".format(
-                    order=i,
+                    order=ORDER_GAP * (i + 1),
                     list_title=self.list_title,
                     book_title=list_item.book.title,
                 ),
@@ -0,0 +1,115 @@
+#
+# Tests for gap-based ordering of list items, see `books/ordering.py`.
+#
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.models import Book, List, ListItem
+from books.ordering import ORDER_GAP, get_orders_between
+from users.models import CustomUser
+
+
+class GapOrderedModelTest(TestCase):
+    """
+    Test sparse orders of `ListItem`s.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(username="reader", password="password")
+        cls.list_instance = List.objects.create(user=user, title="Test list")
+        cls.books = [Book.objects.create(title=f"Book {i}") for i in range(5)]
+
+    def setUp(self):
+        self.items = [
+            ListItem.objects.create(list=self.list_instance, book=book)
+            for book in self.books
+        ]
+
+    def get_list_books(self) -> list:
+        return list(self.list_instance.items.values_list("book__title", flat=True))
+
+    def get_orders(self) -> list:
+        return list(self.list_instance.items.values_list("order", flat=True))
+
+    def test_get_orders_between(self):
+        """
+        Ensure that orders are evenly spaced in the gap, and `None` is returned if there's no room.
+        """
+        self.assertEqual(get_orders_between(None, None, 2), [ORDER_GAP, ORDER_GAP * 2])
+        self.assertEqual(get_orders_between(10, None), [10 + ORDER_GAP])
+        self.assertEqual(get_orders_between(None, 10), [5])
+        self.assertEqual(get_orders_between(10, 20, 4), [12, 14, 16, 18])
+        self.assertIsNone(get_orders_between(10, 11))
+        self.assertIsNone(get_orders_between(None, 1))
+
+    def test_move_updates_single_row(self):
+        """
+        Ensure that moving or deleting an item doesn't change orders of other items.
+        """
+        orders = self.get_orders()
+        self.assertEqual(orders, [ORDER_GAP * (i + 1) for i in range(5)])
+
+        last = self.items[4]
+        with self.assertNumQueries(3):
+            # Neighbours, updated item
+            last.to(self.items[1].order)
+        self.assertEqual(self.get_list_books(), [f"Book {i}" for i in [0, 4, 1, 2, 3]])
+        self.assertEqual(
+            self.get_orders(), [orders[0], last.order, orders[1], orders[2], orders[3]]
+        )
+
+        self.items[2].bottom()
+        self.items[3].above(self.items[0])
+        self.items[0].delete()
+        self.assertEqual(self.get_list_books(), [f"Book {i}" for i in [3, 4, 1, 2]])
+        self.assertEqual(self.get_orders()[2:], [orders[1], orders[3] + ORDER_GAP])
+
+        # Appended after the last item.
+        item = ListItem.objects.create(list=self.list_instance, book=self.books[0])
+        self.assertEqual(item.order, orders[3] + ORDER_GAP * 2)
+
+    def test_move_rebalances_when_gap_is_exhausted(self):
+        """
+        Ensure that the list is renumbered when there's no room between neighbours.
+        """
+        first, second, third, fourth, fifth = self.items
+        ListItem.objects.filter(pk=second.pk).update(order=first.order + 1)
+        second.refresh_from_db()
+
+        fourth.move_between(first, second)
+
+        self.assertEqual(self.get_list_books(), [f"Book {i}" for i in [0, 3, 1, 2, 4]])
+        self.assertEqual(
+            self.get_orders(),
+            [ORDER_GAP, fourth.order, ORDER_GAP * 2, ORDER_GAP * 3, ORDER_GAP * 5],
+        )
+        self.assertTrue(ORDER_GAP < fourth.order < ORDER_GAP * 2)
+
+    def test_rebalance_list_items_command(self):
+        """
+        Ensure that `rebalance_list_items` renumbers only lists with small gaps, keeping order of items.
+        """
+        other_list = List.objects.create(
+            user=self.list_instance.user, title="Other list"
+        )
+        for book in self.books:
+            ListItem.objects.create(list=other_list, book=book)
+        other_orders = list(other_list.items.values_list("order", flat=True))
+        # Items appended concurrently may get equal orders.
+        ListItem.objects.filter(pk=self.items[2].pk).update(order=self.items[1].order)
+        ListItem.objects.filter(pk=self.items[3].pk).update(order=self.items[1].order)
+
+        stdout = io.StringIO()
+        call_command("rebalance_list_items", stdout=stdout)
+
+        self.assertEqual(
+            stdout.getvalue().strip(), "Lists renumbered: 1, items updated: 2"
+        )
+        self.assertEqual(self.get_list_books(), [f"Book {i}" for i in range(5)])
+        self.assertEqual(self.get_orders(), [ORDER_GAP * (i + 1) for i in range(5)])
+        self.assertEqual(
+            list(other_list.items.values_list("order", flat=True)), other_orders
+        )
@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test import TestCase
+
+from books.models import Book
+from books.pagination import EstimatedCountPaginator
+from books.search import search_books
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    """
+    Test `EstimatedCountPaginator`.
+    """
+
+    fixtures = ["books/tests/test_api_fixtures.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE books_book")
+
+    def test_exact_count_below_threshold(self):
+        """
+        Ensure that small results are counted exactly.
+        """
+        paginator = EstimatedCountPaginator(Book.objects.all(), 10)
+
+        self.assertEqual(paginator.count, Book.objects.count())
+        self.assertTrue(paginator.count_is_exact)
+
+    def test_estimated_count_of_unfiltered_queryset(self):
+        """
+        Ensure that unfiltered QuerySet is counted using table statistics.
+        """
+        paginator = EstimatedCountPaginator(
+            Book.objects.all(), 10, exact_count_threshold=1
+        )
+
+        self.assertEqual(paginator.count, Book.objects.count())
+        self.assertFalse(paginator.count_is_exact)
+        self.assertEqual(paginator.num_pages, (paginator.count + 9) // 10)
+
+    def test_estimated_count_of_filtered_queryset(self):
+        """
+        Ensure that filtered QuerySet is counted using planner's estimate.
+        """
+        queryset = search_books(Book.objects.all(), "python")
+        paginator = EstimatedCountPaginator(queryset, 10, exact_count_threshold=1)
+
+        self.assertGreater(paginator.count, 0)
+        self.assertFalse(paginator.count_is_exact)
+        self.assertEqual(len(paginator.page(1).object_list), min(queryset.count(), 10))
+
+    def test_exact_count_of_list(self):
+        """
+        Ensure that plain lists are counted exactly.
+        """
+        paginator = EstimatedCountPaginator(
+            list(range(25)), 10, exact_count_threshold=1
+        )
+
+        self.assertEqual(paginator.count, 25)
+        self.assertTrue(paginator.count_is_exact)
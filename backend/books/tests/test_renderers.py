@@ -0,0 +1,97 @@
+#
+# Tests for `ORJSONRenderer` and `ORJSONParser`.
+#
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from books.parsers import ORJSONParser
+from books.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """
+    Test `ORJSONRenderer`.
+    """
+
+    def test_output_is_identical_to_json_renderer(self):
+        """
+        Ensure that `ORJSONRenderer` renders data of various types exactly like `JSONRenderer`.
+        """
+        data = ReturnDict(
+            {
+                "id": 1,
+                "title": 'Чистый код\u2028\u2029 "quoted" \\ </script>',
+                "price": decimal.Decimal("12.50"),
+                "ratio": 0.1,
+                "is_public": True,
+                "description": None,
+                "label": _("название"),
+                "created": datetime.datetime(
+                    2026, 10, 17, 10, 0, 0, 123456, tzinfo=datetime.timezone.utc
+                ),
+                "date": datetime.date(2026, 10, 17),
+                "time": datetime.time(10, 0, 0, 500),
+                "duration": datetime.timedelta(days=1, seconds=5),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "items": ReturnList([{"id": 2}, (3, 4)], serializer=None),
+                5: "non-string key",
+            },
+            serializer=None,
+        )
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_fallback_to_json_renderer(self):
+        """
+        Ensure that `ORJSONRenderer` falls back to `JSONRenderer` for pretty printing and huge integers,
+        and renders `None` as empty content.
+        """
+        data = {"id": 1, "huge": 2**70}
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTest(SimpleTestCase):
+    """
+    Test `ORJSONParser`.
+    """
+
+    def test_parse(self):
+        """
+        Ensure that `ORJSONParser` parses JSON like `JSONParser`, also in non-UTF-8 encoding.
+        """
+        content = '{"title": "Чистый код", "authors": [1, 2], "year": null}'
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(content.encode())),
+            JSONParser().parse(io.BytesIO(content.encode())),
+        )
+        self.assertEqual(
+            ORJSONParser().parse(
+                io.BytesIO(content.encode("cp1251")),
+                parser_context={"encoding": "cp1251"},
+            ),
+            {"title": "Чистый код", "authors": [1, 2], "year": None},
+        )
+
+    def test_parse_error(self):
+        """
+        Ensure that `ORJSONParser` raises `ParseError` on invalid and non-strict JSON.
+        """
+        for content in [b'{"title": ', b'{"pages": NaN}', b"\xff"]:
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(content))
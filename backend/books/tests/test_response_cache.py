@@ -0,0 +1,110 @@
+#
+# Tests for the cache of anonymous visitors' responses, see `books/response_cache.py`.
+#
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from books.models import Book, List, ListItem, Note, Tag
+
+from .base_api_test_case import BaseAPITest
+
+
+class ResponseCacheTest(BaseAPITest):
+    """
+    Test caching and invalidation of catalogue responses.
+    """
+
+    def assertCached(self, url: str) -> bytes:
+        """
+        Request the URL, ensuring that the response is served from cache, and return its content.
+        """
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.content
+
+    def test_anonymous_responses_cached(self):
+        """
+        Ensure that responses to anonymous visitors are cached by URL with normalized query params.
+        """
+        for url in [
+            "/api/v1/books/",
+            f"/api/v1/books/{Book.objects.first().pk}/",
+            "/api/v1/authors/",
+            "/api/v1/publishers/",
+            "/api/v1/lists/",
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(self.assertCached(url), response.content)
+
+        response = self.client.get("/api/v1/authors/?query=а&fields=id,last_name")
+        self.assertEqual(
+            self.assertCached("/api/v1/authors/?fields=id,last_name&query=а"),
+            response.content,
+        )
+
+    def test_responses_cached_by_media_type(self):
+        """
+        Ensure that responses in different media types (or with different params) are cached separately,
+        and cached responses vary by `Accept` header.
+        """
+        url = "/api/v1/authors/"
+        for accept in ["application/json", "application/json; indent=4"]:
+            response = self.client.get(url, HTTP_ACCEPT=accept)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            with self.assertNumQueries(0):
+                cached = self.client.get(url, HTTP_ACCEPT=accept)
+            self.assertEqual(cached.content, response.content)
+            self.assertEqual(cached["Vary"], response["Vary"])
+            self.assertIn("Accept", cached["Vary"])
+
+        self.assertNotEqual(
+            self.client.get(url, HTTP_ACCEPT="application/json").content,
+            self.client.get(url, HTTP_ACCEPT="application/json; indent=4").content,
+        )
+
+    def test_cache_invalidated_by_changes(self):
+        """
+        Ensure that changes of objects invalidate only responses depending on their models.
+        """
+        book = Book.objects.first()
+        self.client.get("/api/v1/books/")
+        self.client.get("/api/v1/lists/")
+
+        Note.objects.create(user=self.new_user, book=book, text="New note")
+        self.assertCached("/api/v1/books/")
+
+        ListItem.objects.filter(list__is_public=True).first().delete()
+        self.assertCached("/api/v1/books/")
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/api/v1/lists/")
+        self.assertTrue(context.captured_queries)
+
+        book.title = "Changed title"
+        book.save()
+        response = self.client.get(f"/api/v1/books/{book.pk}/")
+        self.assertEqual(response.data["title"], "Changed title")
+
+        tag = Tag.objects.create(title="New tag")
+        self.client.get(f"/api/v1/books/{book.pk}/")
+        book.tags.add(tag)
+        response = self.client.get(f"/api/v1/books/{book.pk}/")
+        self.assertIn(tag.pk, [tag_data["id"] for tag_data in response.data["tags"]])
+
+    def test_authenticated_responses_not_cached(self):
+        """
+        Ensure that responses to authenticated users aren't cached and aren't served to anonymous visitors.
+        """
+        List.objects.create(user=self.new_user, title="Private list", is_public=False)
+        headers = {"HTTP_AUTHORIZATION": "Token " + self.auth_token}
+
+        response = self.client.get("/api/v1/lists/", **headers)
+        self.assertIn("Private list", [data["title"] for data in response.data])
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/api/v1/lists/", **headers)
+        self.assertTrue(context.captured_queries)
+
+        response = self.client.get("/api/v1/lists/")
+        self.assertNotIn("Private list", [data["title"] for data in response.data])
@@ -0,0 +1,193 @@
+#
+# Tests for content-addressed storage of uploaded files, see `core/storage.py`.
+#
+import datetime
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+
+from books.models import Book
+from core.models import StoredFile
+from core.storage import content_addressed_storage
+
+from .test_images import (
+    ALL_THUMBNAILS_EXIST,
+    THUMBNAIL_FIELDS,
+    TemporaryMediaRootTestCase,
+    make_image_file,
+)
+
+FILE_CONTENT = b"%PDF-1.4 test book"
+
+
+class ContentAddressedStorageTest(TemporaryMediaRootTestCase):
+    """
+    Test deduplication and reference counting of stored files.
+    """
+
+    def get_references(self, name: str) -> int:
+        stored_file = StoredFile.objects.filter(name=name).first()
+        return stored_file.references if stored_file else 0
+
+    def test_same_files_stored_once(self):
+        """
+        Ensure that the same file uploaded for different books is stored once, with shared thumbnails.
+        """
+        first = Book.objects.create(
+            title="First", cover_image=make_image_file("first.JPG")
+        )
+        second = Book.objects.create(
+            title="Second", cover_image=make_image_file("second.jpg")
+        )
+
+        sha256 = hashlib.sha256(make_image_file().read()).hexdigest()
+        name = "images/covers/{prefix}/{sha256}.jpg".format(
+            prefix=sha256[:2], sha256=sha256
+        )
+        self.assertEqual(first.cover_image.name, name)
+        self.assertEqual(second.cover_image.name, name)
+        self.assertEqual(
+            os.listdir(os.path.dirname(first.cover_image.path)), [sha256 + ".jpg"]
+        )
+        self.assertEqual(self.get_references(name), 2)
+        self.assertEqual(
+            [getattr(first, field).url for field in THUMBNAIL_FIELDS],
+            [getattr(second, field).url for field in THUMBNAIL_FIELDS],
+        )
+
+    def test_unreferenced_files_deleted(self):
+        """
+        Ensure that the file is deleted with its thumbnails when the last reference is released.
+        """
+        first = Book.objects.create(title="First", cover_image=make_image_file())
+        second = Book.objects.create(title="Second", cover_image=make_image_file())
+        name = first.cover_image.name
+        path = first.cover_image.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.get_references(name), 1)
+
+        # Replaced file is released too.
+        with self.captureOnCommitCallbacks(execute=True):
+            second.cover_image = None
+            second.save()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertEqual(self.thumbnails_exist(first), [False] * len(THUMBNAIL_FIELDS))
+
+        # Thumbnails are generated again when the same image is uploaded again.
+        third = Book.objects.create(title="Third", cover_image=make_image_file())
+        self.assertEqual(third.cover_image.name, name)
+        self.assertEqual(self.thumbnails_exist(third), ALL_THUMBNAILS_EXIST)
+
+    def test_claimed_files_kept(self):
+        """
+        Ensure that the file isn't deleted after its last reference is released, if it's reused meanwhile.
+        """
+        book = Book.objects.create(title="First", cover_image=make_image_file())
+        name = book.cover_image.name
+        path = book.cover_image.path
+
+        def reuse_file():
+            # Saved by another request before the file is deleted
+            self.assertEqual(
+                content_addressed_storage.save(
+                    "images/covers/reused.jpg", make_image_file()
+                ),
+                name,
+            )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            book.delete()
+        reuse_file()
+        for callback in callbacks:
+            callback()
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(StoredFile.objects.filter(name=name).exists())
+
+    def test_abandoned_files_deleted(self):
+        """
+        Ensure that `clean_stored_files` removes files claimed but never referenced (saving of the object failed
+        after the file was written) after the grace period, keeping referenced files.
+        """
+        book = Book.objects.create(title="First", cover_image=make_image_file())
+        # Counted references may drift, the file is still referenced by the book.
+        StoredFile.objects.filter(name=book.cover_image.name).update(references=0)
+        name = content_addressed_storage.save(
+            "images/covers/abandoned.jpg", make_image_file(color=(0, 0, 0))
+        )
+        path = content_addressed_storage.path(name)
+        self.assertEqual(self.get_references(name), 0)
+
+        stdout = io.StringIO()
+        call_command("clean_stored_files", stdout=stdout)
+        self.assertIn("Removed files: 0", stdout.getvalue())
+        self.assertTrue(os.path.exists(path))
+
+        # Claimed again - the grace period starts over.
+        abandoned = StoredFile.objects.filter(name=name)
+        abandoned.update(claimed=timezone.now() - datetime.timedelta(days=2))
+        content_addressed_storage.save(
+            "images/covers/abandoned.jpg", make_image_file(color=(0, 0, 0))
+        )
+        call_command("clean_stored_files", stdout=io.StringIO())
+        self.assertTrue(os.path.exists(path))
+
+        abandoned.update(claimed=timezone.now() - datetime.timedelta(days=2))
+        StoredFile.objects.filter(name=book.cover_image.name).update(
+            claimed=timezone.now() - datetime.timedelta(days=2)
+        )
+        stdout = io.StringIO()
+        call_command("clean_stored_files", stdout=stdout)
+        self.assertIn("Removed files: 1", stdout.getvalue())
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(abandoned.exists())
+        self.assertTrue(os.path.exists(book.cover_image.path))
+        self.assertTrue(StoredFile.objects.filter(name=book.cover_image.name).exists())
+
+    def test_fixtures_not_referenced(self):
+        """
+        Ensure that objects loaded from fixtures (`raw` saves) don't add references.
+        """
+        book = Book.objects.create(title="First", cover_image=make_image_file())
+        StoredFile.objects.all().delete()
+        book.save_base(raw=True)
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_deduplicate_files_command(self):
+        """
+        Ensure that `deduplicate_files` moves files uploaded before to content-addressed names.
+        """
+        books = []
+        for filename in ["first.pdf", "second.pdf"]:
+            name = "books/" + filename
+            content_addressed_storage._save(name, ContentFile(FILE_CONTENT))
+            book = Book.objects.create(title=filename)
+            # `update()` doesn't send signals, so references aren't counted - like for files uploaded before.
+            Book.objects.filter(pk=book.pk).update(file=name)
+            books.append(book)
+        other = Book.objects.create(
+            title="Other", file=SimpleUploadedFile("other.pdf", b"other")
+        )
+        self.assertFalse(StoredFile.objects.filter(name__startswith="books/first"))
+
+        call_command("deduplicate_files", stdout=io.StringIO())
+
+        sha256 = hashlib.sha256(FILE_CONTENT).hexdigest()
+        name = "books/{prefix}/{sha256}.pdf".format(prefix=sha256[:2], sha256=sha256)
+        for book in books:
+            book.refresh_from_db()
+            self.assertEqual(book.file.name, name)
+        with books[0].file.open("rb") as file:
+            self.assertEqual(file.read(), FILE_CONTENT)
+        self.assertFalse(content_addressed_storage.exists("books/first.pdf"))
+        self.assertFalse(content_addressed_storage.exists("books/second.pdf"))
+        self.assertEqual(self.get_references(name), 2)
+        self.assertEqual(self.get_references(other.file.name), 1)
@@ -0,0 +1,183 @@
+#
+# Tests for resumable chunked uploads, see `books/uploads.py`.
+#
+import datetime
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from books.models import Book, UploadSession
+from books.uploads import get_upload_path
+from users.models import CustomUser
+
+from .test_images import (
+    ALL_THUMBNAILS_EXIST,
+    TemporaryMediaRootTestCase,
+    make_image_file,
+)
+
+FILE_CONTENT = os.urandom(100 * 1024 + 17)
+CHUNK_SIZE = 32 * 1024
+
+
+class ChunkedUploadTest(TemporaryMediaRootTestCase):
+    """
+    Test chunked upload endpoints: `UploadSessionCreateView`, `UploadSessionDetailView`, `UploadSessionFinalizeView`.
+    """
+
+    client_class = APIClient
+
+    def setUp(self):
+        super().setUp()
+        self.uploads_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.uploads_root, ignore_errors=True)
+        settings_override = override_settings(UPLOADS_ROOT=self.uploads_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = CustomUser.objects.create_user("user")
+        self.book = Book.objects.create(title="Test book")
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + Token.objects.create(user=self.user).key
+        )
+
+    def create_session(self, content: bytes, **data) -> dict:
+        data = {
+            "book": self.book.pk,
+            "field": "file",
+            "filename": "book.pdf",
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+            **data,
+        }
+        response = self.client.post("/api/v1/uploads/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def put_chunk(self, session_id: str, content: bytes, first: int, last: int):
+        return self.client.put(
+            "/api/v1/uploads/{id}/".format(id=session_id),
+            content[first : last + 1],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE="bytes {first}-{last}/{size}".format(
+                first=first, last=last, size=len(content)
+            ),
+        )
+
+    def upload(self, session_id: str, content: bytes):
+        for first in range(0, len(content), CHUNK_SIZE):
+            last = min(first + CHUNK_SIZE, len(content)) - 1
+            response = self.put_chunk(session_id, content, first, last)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["offset"], last + 1)
+
+    def finalize(self, session_id: str):
+        return self.client.post("/api/v1/uploads/{id}/finalize/".format(id=session_id))
+
+    def test_chunked_upload(self):
+        """
+        Ensure that the file uploaded in chunks (with resume after conflict) is attached to the book.
+        """
+        session = self.create_session(FILE_CONTENT)
+        self.assertEqual(session["offset"], 0)
+
+        # Chunk not at the current offset - client must resume from `offset`.
+        response = self.put_chunk(
+            session["id"], FILE_CONTENT, CHUNK_SIZE, 2 * CHUNK_SIZE - 1
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 0)
+
+        # Incomplete upload can't be finalized.
+        self.assertEqual(
+            self.finalize(session["id"]).status_code, status.HTTP_409_CONFLICT
+        )
+
+        self.upload(session["id"], FILE_CONTENT)
+        response = self.finalize(session["id"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(
+            response.data["file"], f"/api/v1/books/{self.book.pk}/download/"
+        )
+        with self.book.file.open("rb") as file:
+            self.assertEqual(file.read(), FILE_CONTENT)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.listdir(self.uploads_root))
+
+    def test_cover_image_upload(self):
+        """
+        Ensure that uploaded cover image gets thumbnails and metadata.
+        """
+        content = make_image_file().read()
+        session = self.create_session(
+            content, field="cover_image", filename="cover.jpg"
+        )
+        self.upload(session["id"], content)
+
+        response = self.finalize(session["id"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        book = Book.objects.get(pk=self.book.pk)
+        self.assertEqual((book.cover_width, book.cover_height), (300, 400))
+        self.assertEqual(self.thumbnails_exist(book), ALL_THUMBNAILS_EXIST)
+
+    def test_checksum_mismatch(self):
+        """
+        Ensure that corrupted upload is rejected and removed.
+        """
+        session = self.create_session(
+            FILE_CONTENT, sha256=hashlib.sha256(b"other").hexdigest()
+        )
+        self.upload(session["id"], FILE_CONTENT)
+
+        response = self.finalize(session["id"])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UploadSession.objects.exists())
+        self.book.refresh_from_db()
+        self.assertFalse(self.book.file)
+
+    def test_access(self):
+        """
+        Ensure that upload is only available to the user who started it.
+        """
+        session = self.create_session(FILE_CONTENT)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token "
+            + Token.objects.create(user=CustomUser.objects.create_user("other")).key
+        )
+
+        response = self.put_chunk(session["id"], FILE_CONTENT, 0, CHUNK_SIZE - 1)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.finalize(session["id"]).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_clean_uploads(self):
+        """
+        Ensure that `clean_uploads` removes abandoned uploads with their files.
+        """
+        session = UploadSession.objects.get(pk=self.create_session(FILE_CONTENT)["id"])
+        self.put_chunk(str(session.pk), FILE_CONTENT, 0, CHUNK_SIZE - 1)
+        self.assertTrue(os.path.exists(get_upload_path(session)))
+
+        call_command("clean_uploads", stdout=io.StringIO())
+        self.assertTrue(UploadSession.objects.exists())
+
+        UploadSession.objects.update(
+            updated=timezone.now() - datetime.timedelta(days=2)
+        )
+        call_command("clean_uploads", stdout=io.StringIO())
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(get_upload_path(session)))
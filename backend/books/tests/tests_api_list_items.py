@@ -7,6 +7,7 @@ import json
 from rest_framework import status
 
 from books.models import List, Book, ListItem
+from books.ordering import ORDER_GAP
 
 from .base_api_test_case import BaseAPITest
 
@@ -32,15 +33,18 @@ class ListItemsAPITest(BaseAPITest):
         )
 
         url = "/api/v1/list_items/create/"
-        response = self.client.post(
-            url,
-            {
-                "book": book_instance.pk,
-                "list": list_instance.pk,
-                "description": "Test ListItem",
-            },
-            **{"HTTP_AUTHORIZATION": "Token " + self.auth_token},
-        )
+        with self.assertNumQueries(8):
+            # Auth token, list, book, savepoint, order and position of the last item, inserted item,
+            # counter of the list, savepoint release
+            response = self.client.post(
+                url,
+                {
+                    "book": book_instance.pk,
+                    "list": list_instance.pk,
+                    "description": "Test ListItem",
+                },
+                **{"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+            )
 
         list_item_data = json.loads(response.content)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -105,6 +109,13 @@ class ListItemsAPITest(BaseAPITest):
 
         list_item_data = json.loads(response.content)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            list_item_data,
+            [
+                f"Book pk={book_instance.pk} already added to the list pk={list_instance.pk}!"
+            ],
+        )
+        self.assertEqual(list_instance.items.count(), 1)
 
     def test_list_items_detail_delete_with_auth_api(self):
         """
@@ -168,3 +179,227 @@ class ListItemsAPITest(BaseAPITest):
         )
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ListItemsListAPITest(BaseAPITest):
+    """
+    Test `lists/<pk>/items/` DRF API endpoint.
+    """
+
+    def get_longest_public_list(self) -> List:
+        return List.objects.filter(is_public=True).order_by("-items_count").first()
+
+    def test_list_items_list_pagination_api(self):
+        """
+        Ensure that `ListItemListView` returns all items of the list in order, page by page.
+        """
+        list_instance = self.get_longest_public_list()
+        list_items = list(list_instance.items.order_by("order", "id"))
+        self.assertGreater(len(list_items), 3)
+
+        url = f"/api/v1/lists/{list_instance.pk}/items/?page_size=3"
+        items_data = []
+        while url:
+            with self.assertNumQueries(6):
+                # List, validators, items with books, publishers and users, position of the first item,
+                # books' authors, books' tags
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = json.loads(response.content)
+            self.assertLessEqual(len(page["results"]), 3)
+            items_data += page["results"]
+            url = page["next"]
+
+        self.assertEqual(len(items_data), len(list_items))
+        for list_item_data, list_item_instance in zip(items_data, list_items):
+            self.check_list_item_list_serialized_data(
+                list_item_data, list_item_instance
+            )
+
+    def test_list_items_list_detail_api(self):
+        """
+        Ensure that `ListItemListView` with `?detail=true` serializes items' books in detail.
+        """
+        list_instance = self.get_longest_public_list()
+        list_items = list(list_instance.items.order_by("order", "id")[:5])
+
+        url = f"/api/v1/lists/{list_instance.pk}/items/?detail=true&page_size=5"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items_data = json.loads(response.content)["results"]
+        self.assertEqual(len(items_data), len(list_items))
+        for list_item_data, list_item_instance in zip(items_data, list_items):
+            self.check_list_item_detail_serialized_data(
+                list_item_data, list_item_instance
+            )
+
+    def test_list_items_list_access_api(self):
+        """
+        Ensure that `ListItemListView` returns items only of public lists, or auth'd user's private lists.
+        """
+        others_private_list = (
+            List.objects.filter(is_public=False).exclude(user=self.new_user).first()
+        )
+        own_private_list = List.objects.create(
+            user=self.new_user, title="Private list", is_public=False
+        )
+        ListItem.objects.create(list=own_private_list, book=Book.objects.first())
+
+        for list_instance, headers, expected_status in [
+            (others_private_list, {}, status.HTTP_403_FORBIDDEN),
+            (
+                others_private_list,
+                {"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+                status.HTTP_403_FORBIDDEN,
+            ),
+            (own_private_list, {}, status.HTTP_403_FORBIDDEN),
+            (
+                own_private_list,
+                {"HTTP_AUTHORIZATION": "Token " + self.auth_token},
+                status.HTTP_200_OK,
+            ),
+        ]:
+            url = f"/api/v1/lists/{list_instance.pk}/items/"
+            response = self.client.get(url, **headers)
+            self.assertEqual(response.status_code, expected_status)
+
+        response = self.client.get("/api/v1/lists/999999/items/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ListItemsBatchAPITest(BaseAPITest):
+    """
+    Test `lists/<pk>/items/batch/` DRF API endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.list_instance = List.objects.create(
+            user=self.new_user, title="Batch list", is_public=True
+        )
+        self.books = list(Book.objects.order_by("pk")[:5])
+        for book in self.books[:3]:
+            ListItem.objects.create(list=self.list_instance, book=book)
+        self.url = f"/api/v1/lists/{self.list_instance.pk}/items/batch/"
+
+    def post(self, operations: list, token: str = None):
+        return self.client.post(
+            self.url,
+            {"operations": operations},
+            format="json",
+            **{"HTTP_AUTHORIZATION": "Token " + (token or self.auth_token)},
+        )
+
+    def get_list_books(self) -> list:
+        return list(
+            self.list_instance.items.order_by("order").values_list("book_id", "order")
+        )
+
+    def test_list_items_batch_api(self):
+        """
+        Ensure that `ListItemBatchView` applies all operations in order and returns the new order of items.
+        """
+        first, second, third, fourth, fifth = [book.pk for book in self.books]
+
+        with self.assertNumQueries(10):
+            # Auth token, savepoint, locked list, items, added books, removed items, inserted items,
+            # updated orders, counter of the list, savepoint release
+            response = self.post(
+                [
+                    {"op": "add", "book": fourth, "description": "Fourth"},
+                    {"op": "remove", "book": first},
+                    {"op": "move", "book": third, "position": 0},
+                    {"op": "add", "book": fifth, "position": 1},
+                ]
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = [third, fifth, second, fourth]
+        self.assertEqual([item["book"] for item in response.data], expected)
+        list_books = self.get_list_books()
+        self.assertEqual([book for book, order in list_books], expected)
+        self.assertEqual(
+            [item["order"] for item in response.data], list(range(len(expected)))
+        )
+        # Items which weren't moved keep their orders, orders are in gaps between them.
+        self.assertEqual(list_books[2], (second, ORDER_GAP * 2))
+        self.assertEqual(list_books[3], (fourth, ORDER_GAP * 3))
+        self.assertTrue(0 < list_books[0][1] < list_books[1][1] < ORDER_GAP * 2)
+        self.assertEqual(
+            ListItem.objects.get(list=self.list_instance, book=fourth).description,
+            "Fourth",
+        )
+
+    def test_list_items_batch_fails_with_invalid_operations_api(self):
+        """
+        Ensure that `ListItemBatchView` changes nothing if any operation can't be applied.
+        """
+        first, second, third, fourth, fifth = [book.pk for book in self.books]
+        list_books = self.get_list_books()
+
+        response = self.post(
+            [
+                {"op": "add", "book": fourth},
+                {"op": "add", "book": second},
+                {"op": "remove", "book": fifth},
+                {"op": "add", "book": 999999},
+                {"op": "move", "book": first},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data["operations"].keys()), [4])
+
+        response = self.post(
+            [
+                {"op": "add", "book": fourth},
+                {"op": "add", "book": second},
+                {"op": "remove", "book": fifth},
+                {"op": "add", "book": 999999},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data["operations"].keys()), [1, 2, 3])
+        self.assertEqual(self.get_list_books(), list_books)
+
+    def test_list_items_batch_fails_for_other_users_list_api(self):
+        """
+        Ensure that `ListItemBatchView` doesn't change other user's Lists.
+        """
+        others_list = List.objects.exclude(user=self.new_user).first()
+        self.url = f"/api/v1/lists/{others_list.pk}/items/batch/"
+        list_books = list(others_list.items.values_list("book_id", "order"))
+
+        response = self.post([{"op": "add", "book": self.books[4].pk}])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            list(others_list.items.values_list("book_id", "order")), list_books
+        )
+
+    def test_list_items_batch_remove_api(self):
+        """
+        Ensure that items removed by `ListItemBatchView` (without signals) are uncounted, and cached responses
+        and ETags of the list's items are invalidated.
+        """
+        first, second = self.books[0].pk, self.books[1].pk
+        items_url = f"/api/v1/lists/{self.list_instance.pk}/items/"
+        response = self.client.get(items_url)
+        etag = response["ETag"]
+
+        response = self.post(
+            [{"op": "remove", "book": first}, {"op": "remove", "book": second}]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["book"] for item in response.data], [self.books[2].pk])
+        self.list_instance.refresh_from_db()
+        self.assertEqual(self.list_instance.items_count, 1)
+        response = self.client.get(items_url)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            [item["book"]["id"] for item in response.data["results"]],
+            [self.books[2].pk],
+        )
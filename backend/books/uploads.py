@@ -0,0 +1,148 @@
+"""
+Resumable chunked uploads of books' files and cover images.
+
+Large files don't fit into one request (and restart from scratch when connection drops), so they are uploaded
+in chunks using `UploadSession`:
+
+1. `POST /api/v1/uploads/` with book, field, file name, size and SHA-256 checksum - create the session;
+2. `PUT /api/v1/uploads/<id>/` with chunk as request body and `Content-Range: bytes <first>-<last>/<size>`
+   header - chunks are written straight to the session's file in `UPLOADS_ROOT`. Chunks must be sent in order:
+   to resume the upload, get the number of received bytes with `GET /api/v1/uploads/<id>/`;
+3. `POST /api/v1/uploads/<id>/finalize/` - the checksum is verified, the file is moved to the book's field.
+
+Abandoned sessions are removed by `python manage.py clean_uploads`.
+"""
+import hashlib
+import os
+import re
+from typing import Tuple
+
+from django.conf import settings
+from django.core.files import File
+from PIL import Image
+
+from core.images import update_image_metadata
+
+from .models import Book, UploadSession
+
+# Size of blocks read from request body and from assembled file
+UPLOAD_BLOCK_SIZE = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadError(Exception):
+    """
+    The upload can't be finalized: the file is incomplete or corrupted.
+    """
+
+
+class AssembledFile(File):
+    """
+    Uploaded file assembled from chunks. Storage moves it instead of copying, like `TemporaryUploadedFile`.
+    Its verified SHA-256 is passed to content-addressed storage, so the file isn't hashed again.
+    """
+
+    def __init__(self, file, sha256: str):
+        super().__init__(file)
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        return self.file.name
+
+
+def get_upload_path(session: UploadSession) -> str:
+    """
+    Return path of the file receiving chunks of the upload session.
+    """
+    return os.path.join(settings.UPLOADS_ROOT, str(session.pk))
+
+
+def parse_content_range(header: str) -> Tuple[int, int, int]:
+    """
+    Parse `Content-Range` header of the chunk, e.g. "bytes 0-1048575/73400320".
+    Return first byte position, chunk length and total size. Raise `ValueError` if the header is invalid.
+    """
+    match = CONTENT_RANGE_RE.match(header.strip())
+    if match is None:
+        raise ValueError("Invalid Content-Range header: {header}".format(header=header))
+
+    first, last, total = (int(value) for value in match.groups())
+    if last < first or last >= total:
+        raise ValueError("Invalid Content-Range header: {header}".format(header=header))
+    return first, last - first + 1, total
+
+
+def write_chunk(session: UploadSession, stream, length: int) -> int:
+    """
+    Write `length` bytes read from `stream` (request body) to the session's file at current offset.
+    Return number of written bytes - less than `length` if the stream ended early.
+    """
+    path = get_upload_path(session)
+    os.makedirs(settings.UPLOADS_ROOT, exist_ok=True)
+
+    written = 0
+    with open(path, "r+b" if os.path.exists(path) else "wb") as file:
+        file.seek(session.offset)
+        while written < length:
+            block = stream.read(min(UPLOAD_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            file.write(block)
+            written += len(block)
+        file.truncate()
+    return written
+
+
+def get_sha256(path: str) -> str:
+    """
+    Return SHA-256 hex digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(UPLOAD_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_upload(session: UploadSession) -> Book:
+    """
+    Verify the uploaded file and save it as the book's file or cover image. Raise `UploadError` if the file is
+    incomplete, corrupted or isn't a valid image.
+    """
+    path = get_upload_path(session)
+
+    if session.offset != session.size:
+        raise UploadError(
+            "Upload is incomplete: {offset} of {size} bytes received.".format(
+                offset=session.offset, size=session.size
+            )
+        )
+    if get_sha256(path) != session.sha256:
+        raise UploadError("SHA-256 checksum doesn't match.")
+    if session.field == UploadSession.FIELD_COVER_IMAGE:
+        try:
+            with Image.open(path) as image:
+                image.verify()
+        except Exception:
+            raise UploadError("Uploaded file is not a valid image.")
+
+    book = session.book
+    with open(path, "rb") as file:
+        getattr(book, session.field).save(
+            session.filename, AssembledFile(file, session.sha256), save=False
+        )
+    if session.field == UploadSession.FIELD_COVER_IMAGE:
+        # The file is already saved to the storage, so metadata isn't updated on `save()`.
+        update_image_metadata(book, force=True)
+    book.save()
+    return book
+
+
+def delete_upload(session: UploadSession):
+    """
+    Remove the upload session and its file.
+    """
+    path = get_upload_path(session)
+    if os.path.exists(path):
+        os.remove(path)
+    session.delete()
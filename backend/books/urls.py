@@ -4,34 +4,50 @@ from .views import (
     BookListView,
     BookDetailView,
     BookCreateView,
+    BookDownloadView,
+    BookDownloadLinkView,
     PublisherListView,
     PublisherDetailView,
     AuthorListView,
     AuthorDetailView,
     AuthorCreateView,
+    AutocompleteView,
     NoteListView,
     NoteCreateView,
     NoteDetailView,
     ListListView,
     ListDetailView,
+    ListItemListView,
     ListItemCreateView,
+    ListItemBatchView,
     ListItemDetailView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+    UploadSessionFinalizeView,
 )
 
 urlpatterns = [
     path("books/", BookListView.as_view()),
     path("books/<int:pk>/", BookDetailView.as_view()),
     path("books/create/", BookCreateView.as_view()),
+    path("books/<int:pk>/download/", BookDownloadView.as_view(), name="book-download"),
+    path("books/<int:pk>/download_link/", BookDownloadLinkView.as_view()),
+    path("uploads/", UploadSessionCreateView.as_view()),
+    path("uploads/<uuid:pk>/", UploadSessionDetailView.as_view()),
+    path("uploads/<uuid:pk>/finalize/", UploadSessionFinalizeView.as_view()),
     path("authors/", AuthorListView.as_view()),
     path("authors/<int:pk>/", AuthorDetailView.as_view()),
     path("authors/create/", AuthorCreateView.as_view()),
     path("publishers/", PublisherListView.as_view()),
     path("publishers/<int:pk>/", PublisherDetailView.as_view()),
+    path("autocomplete/<str:kind>/", AutocompleteView.as_view()),
     path("notes/", NoteListView.as_view()),
     path("notes/create/", NoteCreateView.as_view()),
     path("notes/<int:pk>/", NoteDetailView.as_view()),
     path("lists/", ListListView.as_view()),
     path("lists/<int:pk>/", ListDetailView.as_view()),
+    path("lists/<int:pk>/items/", ListItemListView.as_view()),
+    path("lists/<int:pk>/items/batch/", ListItemBatchView.as_view()),
     path("list_items/create/", ListItemCreateView.as_view()),
     path("list_items/<int:pk>/", ListItemDetailView.as_view()),
 ]
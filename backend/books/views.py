@@ -1,5 +1,6 @@
-from django.db.models import QuerySet, Q
-from rest_framework import authentication, permissions, status
+from django.db.models import Prefetch, QuerySet, Q
+from rest_framework import permissions, status
+from rest_framework.fields import BooleanField
 from rest_framework.generics import (
     ListAPIView,
     RetrieveUpdateDestroyAPIView,
@@ -12,8 +13,19 @@ from rest_framework.mixins import (
     RetrieveModelMixin,
     DestroyModelMixin,
 )
-from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.authentication import CachedTokenAuthentication
 
 from .serializers import (
     BookListSerializer,
@@ -24,30 +36,79 @@ from .serializers import (
     AuthorCreateSerializer,
     NoteDetailSerializer,
     ListListSerializer,
+    ListSummarySerializer,
     ListDetailSerializer,
+    ListItemListSerializer,
+    ListItemDetailSerializer,
     ListItemMinimalSerializer,
+    ListItemBatchSerializer,
+    UploadSessionSerializer,
+)
+from .downloads import (
+    DOWNLOAD_SIGNATURE_PARAM,
+    get_download_filename,
+    get_download_url,
+    is_download_signature_valid,
+    serve_file,
+)
+from .fast_serializers import BookListFastSerializer
+from .conditional import ConditionalGetMixin
+from .fieldsets import FIELDS_PARAM, OMIT_PARAM, SparseFieldsetsViewMixin
+from .autocomplete import (
+    get_index,
+    DEFAULT_AUTOCOMPLETE_LIMIT,
+    MAX_AUTOCOMPLETE_LIMIT,
+)
+from .models import (
+    Author,
+    Book,
+    Publisher,
+    Tag,
+    Note,
+    List,
+    ListItem,
+    UploadSession,
 )
-from .models import Author, Book, Publisher, Note, List, ListItem
+from .lists import apply_list_operations
+from .pagination import (
+    StandardResultsSetPagination,
+    EstimatedCountResultsSetPagination,
+    BookCursorPagination,
+    ListItemCursorPagination,
+)
+from .response_cache import CachedAnonymousResponseMixin
+from .search import search_books, fuzzy_search, parse_similarity_threshold
+from .uploads import (
+    UploadError,
+    delete_upload,
+    finalize_upload,
+    parse_content_range,
+    write_chunk,
+)
+
+# Serialized books depend on these models without `updated` timestamps (see `books/conditional.py`)
+BOOK_RELATED_MODELS = [
+    Author,
+    Publisher,
+    Tag,
+    get_user_model(),
+    Book.authors.through,
+    Book.tags.through,
+]
+# Changes of these models invalidate cached responses with books (see `books/response_cache.py`)
+BOOK_CACHE_MODELS = [Book] + BOOK_RELATED_MODELS
+# Timestamps, numbers and orders of lists' items and their books, see `ConditionalGetMixin`
+LIST_UPDATED_FIELDS = ["updated", "items__updated", "items__book__updated"]
+LIST_COUNT_FIELDS = ["pk", "items"]
+LIST_ORDER_FIELDS = ["items__order"]
 
 
-class StandardResultsSetPagination(PageNumberPagination):
+def is_query_param_true(request: Request, name: str) -> bool:
     """
-    Basic pagination class for Book list.
+    Return `True` if GET parameter `name` is "true", "1" etc. (same values as DRF `BooleanField` accepts),
+    so that `?fuzzy=false` or `?fuzzy=0` is false.
     """
-
-    page_size = 10
-
-    def get_paginated_response(self, data):
-        return Response(
-            {
-                "count": self.page.paginator.count,
-                "next": self.get_next_link(),
-                "previous": self.get_previous_link(),
-                "page": self.page.number,
-                "total_pages": self.page.paginator.num_pages,
-                "results": data,
-            }
-        )
+    return request.query_params.get(name) in BooleanField.TRUE_VALUES
 
 
 class CreateAsAuthenticatedUser(CreateModelMixin):
@@ -68,17 +129,55 @@ class CreateAsAuthenticatedUser(CreateModelMixin):
         )
 
 
-class BookListView(ListAPIView):
+class BookListView(
+    CachedAnonymousResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetsViewMixin,
+    ListAPIView,
+):
     """
     List all available books with pagination.
+
+    GET parameters:
+    - `?pagination=cursor`: use keyset pagination with opaque `next` / `previous` cursors instead of page numbers.
+      Results are ordered by `(-created, id)` in this mode, also when searching;
+    - `?count=estimate`: count large results approximately, see `EstimatedCountPaginator`.
+      The last pages by the estimated `total_pages` may be empty or missing;
+    - `?fields=` / `?omit=`: sparse fieldsets, see `books/fieldsets.py`.
+
+    NB: without sparse fieldsets, books are serialized by `BookListFastSerializer` (same output as `serializer_class`).
     """
 
     serializer_class = BookListSerializer
+    fast_serializer_class = BookListFastSerializer
+    cache_models = BOOK_CACHE_MODELS
+    conditional_models = BOOK_RELATED_MODELS
     pagination_class = StandardResultsSetPagination
+    estimated_count_pagination_class = EstimatedCountResultsSetPagination
+    cursor_pagination_class = BookCursorPagination
+
+    @property
+    def paginator(self) -> BasePagination:
+        """
+        Use cursor pagination when requested with `?pagination=cursor` (or when following cursor link),
+        and estimated count when requested with `?count=estimate`.
+        """
+        if not hasattr(self, "_paginator"):
+            query_params = self.request.query_params
+            if (
+                query_params.get("pagination") == "cursor"
+                or self.cursor_pagination_class.cursor_query_param in query_params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            elif query_params.get("count") == "estimate":
+                self._paginator = self.estimated_count_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self) -> QuerySet:
         """
-        Filter QuerySet using passed GET parameter `query`.
+        Filter QuerySet using passed GET parameter `query` (full-text search, results ordered by relevance).
         """
         queryset = (
             Book.objects.all()
@@ -94,22 +193,36 @@ class BookListView(ListAPIView):
         query = self.request.query_params.get("query", "")
 
         if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query)
-                | Q(authors__last_name__icontains=query)
-                | Q(contents__icontains=query)
-                | Q(description__icontains=query)
-            ).distinct()
+            queryset = search_books(queryset, query)
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        Use fast serializer, unless sparse fieldsets are requested.
+        """
+        query_params = request.query_params
+        if FIELDS_PARAM in query_params or OMIT_PARAM in query_params:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.fast_serializer_class.get_values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.fast_serializer_class(page).data)
+
 
-class BookDetailView(RetrieveUpdateDestroyAPIView):
+class BookDetailView(
+    CachedAnonymousResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetsViewMixin,
+    RetrieveUpdateDestroyAPIView,
+):
     """
     Retrieve / update / delete Book detail view.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     queryset = (
@@ -124,6 +237,8 @@ class BookDetailView(RetrieveUpdateDestroyAPIView):
         )
     )
     serializer_class = BookDetailSerializer
+    cache_models = BOOK_CACHE_MODELS
+    conditional_models = BOOK_RELATED_MODELS
 
 
 class BookCreateView(CreateAsAuthenticatedUser, CreateAPIView):
@@ -132,34 +247,234 @@ class BookCreateView(CreateAsAuthenticatedUser, CreateAPIView):
     Set `user` field to authenticated user.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = Book.objects.all()
     serializer_class = BookCreateSerializer
 
 
-class PublisherListView(CreateAsAuthenticatedUser, ListCreateAPIView):
+class BookDownloadLinkView(GenericAPIView):
+    """
+    Return signed link to download the book's file with `BookDownloadView` (for staff users only).
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    queryset = Book.objects.only("pk", "file")
+
+    def get(self, request, *args, **kwargs):
+        book: Book = self.get_object()
+        if not book.file:
+            raise Http404
+        return Response(
+            {
+                "url": get_download_url(book.pk),
+                "expires_in": settings.BOOK_DOWNLOAD_LINK_MAX_AGE,
+            }
+        )
+
+
+class BookDownloadView(GenericAPIView):
+    """
+    Download the book's file, see `books/downloads.py`. The file is sent by nginx in production.
+
+    GET parameters:
+    - `?signature=`: signature of the link returned by `BookDownloadLinkView`;
+    - `?attachment=true`: ask browser to save the file instead of opening it.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.AllowAny]
+
+    queryset = Book.objects.only("pk", "title", "file")
+
+    def get(self, request, *args, **kwargs):
+        """
+        Only allow staff users, or requests with valid signed link.
+        """
+        book: Book = self.get_object()
+        signature = request.query_params.get(DOWNLOAD_SIGNATURE_PARAM)
+        if not (
+            request.user.is_staff or is_download_signature_valid(book.pk, signature)
+        ):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        if not book.file or not book.file.storage.exists(book.file.name):
+            raise Http404
+
+        return serve_file(
+            request,
+            book.file,
+            get_download_filename(book.title, book.file.name),
+            as_attachment=bool(request.query_params.get("attachment")),
+        )
+
+
+class UploadSessionCreateView(CreateAsAuthenticatedUser, CreateAPIView):
+    """
+    Start chunked upload of the book's file or cover image, see `books/uploads.py`.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+
+
+class UploadSessionDetailView(RetrieveModelMixin, GenericAPIView):
+    """
+    Get upload progress (GET), upload next chunk (PUT), or cancel the upload (DELETE).
+    Only available to the user who started the upload.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    serializer_class = UploadSessionSerializer
+
+    def get_queryset(self) -> QuerySet:
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        return self.retrieve(request, *args, **kwargs)
+
+    def put(self, request, *args, **kwargs):
+        """
+        Write the chunk (request body) to the upload's file. `Content-Range: bytes <first>-<last>/<size>` header
+        is required, chunks must be sent in order. Respond with the upload's state, including received `offset`.
+        """
+        try:
+            first, length, total = parse_content_range(
+                request.headers.get("Content-Range", "")
+            )
+        except ValueError as error:
+            return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {
+                    "detail": "Chunk size must not exceed {max_size} bytes.".format(
+                        max_size=settings.UPLOAD_CHUNK_MAX_SIZE
+                    )
+                },
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        with transaction.atomic():
+            session: UploadSession = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=kwargs["pk"]
+            )
+            if total != session.size:
+                return Response(
+                    {"detail": "Total size doesn't match the upload's size."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if first != session.offset:
+                # Client should resume from the received offset.
+                return Response(
+                    self.get_serializer(session).data,
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            written = (
+                write_chunk(session, request.stream, length) if request.stream else 0
+            )
+            session.offset += written
+            session.save(update_fields=["offset", "updated"])
+
+        if written < length:
+            return Response(
+                self.get_serializer(session).data, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(self.get_serializer(session).data)
+
+    def delete(self, request, *args, **kwargs):
+        delete_upload(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionFinalizeView(GenericAPIView):
+    """
+    Verify the uploaded file and attach it to the book. Respond with the book's details.
+    If the file is corrupted, the upload is removed and must be started again.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    serializer_class = UploadSessionSerializer
+
+    def get_queryset(self) -> QuerySet:
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            session: UploadSession = get_object_or_404(
+                self.get_queryset().select_for_update().select_related("book"),
+                pk=kwargs["pk"],
+            )
+            if session.offset != session.size:
+                return Response(
+                    self.get_serializer(session).data,
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                book = finalize_upload(session)
+            except UploadError as error:
+                delete_upload(session)
+                return Response(
+                    {"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST
+                )
+            delete_upload(session)
+
+        return Response(BookDetailSerializer(book).data)
+
+
+class PublisherListView(
+    CachedAnonymousResponseMixin, CreateAsAuthenticatedUser, ListCreateAPIView
+):
     """
     List all available publishers (not paginated).
     Create new publisher. Set `user` field to authenticated user.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     queryset = Publisher.objects.all()
     serializer_class = PublisherDetailSerializer
+    cache_models = [Publisher]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["title", "books_count"]
 
     def get_queryset(self) -> QuerySet:
         """
         Filter QuerySet by `title` using passed GET parameter `query`.
+
+        GET parameters:
+        - `?fuzzy=true`: typo-tolerant search, results ordered by similarity to `query`;
+        - `?threshold=0.3`: minimal similarity of results for fuzzy search (0.3..1);
+        - `?ordering=-books_count`: order by `title` or number of books (`-` for descending order).
         """
         queryset = Publisher.objects.all()
         query = self.request.query_params.get("query", "")
 
         if query:
-            queryset = queryset.filter(title__icontains=query)
+            if is_query_param_true(self.request, "fuzzy"):
+                queryset = fuzzy_search(
+                    queryset,
+                    query,
+                    fields=["title"],
+                    threshold=parse_similarity_threshold(
+                        self.request.query_params.get("threshold")
+                    ),
+                )
+            else:
+                queryset = queryset.filter(title__icontains=query)
 
         return queryset
 
@@ -169,29 +484,49 @@ class PublisherDetailView(RetrieveUpdateDestroyAPIView):
     Retrieve / update / delete publisher detail view.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     queryset = Publisher.objects.all()
     serializer_class = PublisherDetailSerializer
 
 
-class AuthorListView(ListAPIView):
+class AuthorListView(
+    CachedAnonymousResponseMixin, SparseFieldsetsViewMixin, ListAPIView
+):
     """
     List all available authors (not paginated).
     """
 
     serializer_class = AuthorDetailSerializer
+    cache_models = [Author, get_user_model()]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["last_name", "books_count"]
 
     def get_queryset(self) -> QuerySet:
         """
         Filter QuerySet by `last_name` using passed GET parameter `query`.
+
+        GET parameters:
+        - `?fuzzy=true`: typo-tolerant search by last, first and middle names, results ordered by similarity to `query`;
+        - `?threshold=0.3`: minimal similarity of results for fuzzy search (0.3..1);
+        - `?ordering=-books_count`: order by `last_name` or number of books (`-` for descending order).
         """
         queryset = Author.objects.all().prefetch_related("user")
         query = self.request.query_params.get("query", "")
 
         if query:
-            queryset = queryset.filter(last_name__icontains=query)
+            if is_query_param_true(self.request, "fuzzy"):
+                queryset = fuzzy_search(
+                    queryset,
+                    query,
+                    fields=["last_name", "first_name", "middle_name"],
+                    threshold=parse_similarity_threshold(
+                        self.request.query_params.get("threshold")
+                    ),
+                )
+            else:
+                queryset = queryset.filter(last_name__icontains=query)
 
         return queryset
 
@@ -202,31 +537,68 @@ class AuthorCreateView(CreateAsAuthenticatedUser, CreateAPIView):
     Set `user` field to authenticated user.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = Author.objects.all()
     serializer_class = AuthorCreateSerializer
 
 
-class AuthorDetailView(RetrieveUpdateDestroyAPIView):
+class AuthorDetailView(SparseFieldsetsViewMixin, RetrieveUpdateDestroyAPIView):
     """
     Retrieve / update / delete author detail view.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     queryset = Author.objects.all()
     serializer_class = AuthorDetailSerializer
 
 
-class NoteListView(ListAPIView):
+class AutocompleteView(APIView):
+    """
+    Return `id` and `label` of authors / publishers / tags matching GET parameter `query` (not paginated).
+    Served from in-memory index, see `books/autocomplete.py`.
+
+    GET parameters:
+    - `?query`: words of the label to search for, by prefix;
+    - `?limit`: max number of results.
+    """
+
+    # Public, cheap endpoint - skip authentication entirely.
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    @staticmethod
+    def get(request: Request, kind: str) -> Response:
+        """
+        Return matching objects of given `kind` ("authors", "publishers" or "tags").
+        """
+        index = get_index(kind)
+
+        if index is None:
+            raise Http404
+
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = DEFAULT_AUTOCOMPLETE_LIMIT
+        limit = min(max(limit, 1), MAX_AUTOCOMPLETE_LIMIT)
+
+        response = Response(
+            index.search(request.query_params.get("query", ""), limit=limit)
+        )
+        patch_cache_control(response, max_age=settings.AUTOCOMPLETE_CACHE_MAX_AGE)
+        return response
+
+
+class NoteListView(ConditionalGetMixin, ListAPIView):
     """
     List all available Notes created by authorized user (not paginated).
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = Note.objects.all()
@@ -252,20 +624,20 @@ class NoteCreateView(CreateAsAuthenticatedUser, CreateAPIView):
     Set `user` field to authenticated user.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = Note.objects.all()
     serializer_class = NoteDetailSerializer
 
 
-class NoteDetailView(RetrieveUpdateDestroyAPIView):
+class NoteDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Retrieve / partial update / delete Note view.
     Only allow to retrieve, update and delete notes created by authenticated user.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = Note.objects.all()
@@ -277,7 +649,9 @@ class NoteDetailView(RetrieveUpdateDestroyAPIView):
         """
         instance: Note = self.get_object()
         if instance.user == request.user:
-            return self.retrieve(request, *args, **kwargs)
+            return self.get_conditional_response(
+                request, self.retrieve, *args, **kwargs
+            )
         return Response(status=status.HTTP_403_FORBIDDEN)
 
     def patch(self, request, *args, **kwargs):
@@ -300,13 +674,41 @@ class NoteDetailView(RetrieveUpdateDestroyAPIView):
         return Response(status=status.HTTP_403_FORBIDDEN)
 
 
-class ListListView(ListAPIView):
+class ListListView(
+    CachedAnonymousResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetsViewMixin,
+    ListAPIView,
+):
     """
     List all available book Lists - public or created by authenticated user (not paginated).
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     serializer_class = ListListSerializer
+    summary_serializer_class = ListSummarySerializer
+    # Only public lists are cached - for anonymous visitors
+    cache_models = [List, ListItem] + BOOK_CACHE_MODELS
+    conditional_updated_fields = LIST_UPDATED_FIELDS
+    conditional_count_fields = LIST_COUNT_FIELDS
+    conditional_order_fields = LIST_ORDER_FIELDS
+    conditional_models = BOOK_RELATED_MODELS
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["created", "title", "items_count"]
+    # Number of covers in lists' summaries
+    summary_covers_count = 12
+
+    @property
+    def is_summary(self) -> bool:
+        return True if self.request.query_params.get("summary") else False
+
+    def get_serializer_class(self):
+        """
+        With `?summary=true`, lists are serialized with `items_count` and first covers instead of all items.
+        """
+        if self.is_summary:
+            return self.summary_serializer_class
+        return super().get_serializer_class()
 
     def get_queryset(self) -> QuerySet:
         """
@@ -315,17 +717,45 @@ class ListListView(ListAPIView):
         GET parameters:
         - `?book_id`: filter lists only with the book.
         - `?only_own_lists=true`: get only auth'd user's lists (public and private!).
+        - `?summary=true`: get number of items and first covers of each list, not the items themselves
+          (get items from the list detail endpoint).
+        - `?ordering=-items_count`: order by `created`, `title` or number of items (`-` for descending order).
         """
-        queryset = (
-            List.objects.all()
-            .prefetch_related(
-                "items__book__publisher",
-                "items__book__user",
-                "items__book__authors",
-                "items__book__tags",
+        if self.is_summary:
+            cover_items = (
+                ListItem.objects.exclude(book__cover_image="")
+                .exclude(book__cover_image__isnull=True)
+                .select_related("book")
+                .only(
+                    "list_id",
+                    "order",
+                    "book__title",
+                    "book__cover_image",
+                    "book__cover_placeholder",
+                )
+            )
+            queryset = (
+                List.objects.all()
+                .prefetch_related(
+                    Prefetch(
+                        "items",
+                        queryset=cover_items[: self.summary_covers_count],
+                        to_attr="cover_items",
+                    )
+                )
+                .select_related("user")
+            )
+        else:
+            queryset = (
+                List.objects.all()
+                .prefetch_related(
+                    "items__book__publisher",
+                    "items__book__user",
+                    "items__book__authors",
+                    "items__book__tags",
+                )
+                .select_related("user")
             )
-            .select_related("user")
-        )
 
         if self.request.auth:
             only_own_lists = (
@@ -353,13 +783,25 @@ class ListListView(ListAPIView):
         return queryset
 
 
-class ListDetailView(RetrieveModelMixin, DestroyModelMixin, GenericAPIView):
+class ListDetailView(
+    ConditionalGetMixin,
+    SparseFieldsetsViewMixin,
+    RetrieveModelMixin,
+    DestroyModelMixin,
+    GenericAPIView,
+):
     """
     Detailed `List` view / delete view.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     serializer_class = ListDetailSerializer
+    conditional_updated_fields = LIST_UPDATED_FIELDS
+    conditional_count_fields = LIST_COUNT_FIELDS
+    conditional_order_fields = LIST_ORDER_FIELDS
+    conditional_models = BOOK_RELATED_MODELS
+    # Used to check access in `get()`
+    sparse_fieldsets_required_fields = ["is_public", "user"]
 
     def get_queryset(self) -> QuerySet:
         """
@@ -381,9 +823,14 @@ class ListDetailView(RetrieveModelMixin, DestroyModelMixin, GenericAPIView):
         """
         Only allow to retrieve public Lists, or created by authenticated user.
         """
-        instance: List = self.get_object()
-        if instance.is_public or instance.user == request.user:
-            return self.retrieve(request, *args, **kwargs)
+        # Items aren't prefetched before the client's copy is checked.
+        instance: List = get_object_or_404(
+            List.objects.only("is_public", "user_id"), pk=kwargs["pk"]
+        )
+        if instance.is_public or instance.user_id == request.user.id:
+            return self.get_conditional_response(
+                request, self.retrieve, *args, **kwargs
+            )
         return Response(status=status.HTTP_403_FORBIDDEN)
 
     def delete(self, request, *args, **kwargs):
@@ -396,12 +843,89 @@ class ListDetailView(RetrieveModelMixin, DestroyModelMixin, GenericAPIView):
         return Response(status=status.HTTP_403_FORBIDDEN)
 
 
+class ListItemListView(ConditionalGetMixin, SparseFieldsetsViewMixin, ListAPIView):
+    """
+    Items of the book `List`, with cursor pagination in list order - for long lists, instead of getting all items
+    from `ListDetailView`.
+
+    GET parameters:
+    - `?detail=true`: serialize items' books with `BookDetailSerializer` (with description, contents and authors'
+      details), by default - with compact `BookListSerializer`;
+    - `?page_size=`: number of items on the page, see `ListItemCursorPagination`;
+    - `?fields=` / `?omit=`: sparse fieldsets, see `books/fieldsets.py`.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    serializer_class = ListItemListSerializer
+    detail_serializer_class = ListItemDetailSerializer
+    pagination_class = ListItemCursorPagination
+    conditional_updated_fields = ["updated", "book__updated"]
+    conditional_order_fields = ["order"]
+    conditional_models = BOOK_RELATED_MODELS
+
+    @property
+    def is_detail(self) -> bool:
+        return True if self.request.query_params.get("detail") else False
+
+    def get_serializer_class(self):
+        if self.is_detail:
+            return self.detail_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Prefetch related fields to reduce number of SQL queries.
+        """
+        return (
+            ListItem.objects.filter(list_id=self.kwargs["pk"])
+            .prefetch_related(
+                "book__authors__user" if self.is_detail else "book__authors",
+                "book__tags",
+            )
+            .select_related(
+                "book__publisher",
+                "book__user",
+            )
+        )
+
+    def paginate_queryset(self, queryset):
+        """
+        Count the position of the first item of the page - positions of the others follow it
+        (see `ListItemPositionListSerializer`).
+        """
+        page = super().paginate_queryset(queryset)
+        self.positions_start = page[0].get_position() if page else 0
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["positions_start"] = getattr(self, "positions_start", 0)
+        return context
+
+    def get_conditional_queryset(self) -> QuerySet:
+        """
+        All items of the list - `pk` URL kwarg is the list's pk, not the lookup of an item.
+        """
+        return self.filter_queryset(self.get_queryset())
+
+    def get(self, request, *args, **kwargs):
+        """
+        Only allow to get items of public Lists, or created by authenticated user.
+        """
+        instance: List = get_object_or_404(
+            List.objects.only("is_public", "user_id"), pk=kwargs["pk"]
+        )
+        if instance.is_public or instance.user_id == request.user.id:
+            return self.get_conditional_response(request, self.list, *args, **kwargs)
+        return Response(status=status.HTTP_403_FORBIDDEN)
+
+
 class ListItemCreateView(CreateAPIView):
     """
     Create new `ListItem`.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = ListItem.objects.all()
@@ -411,11 +935,47 @@ class ListItemCreateView(CreateAPIView):
         """
         Only allow auth'd user to add `ListItem`s to his own Lists.
         """
-        list_pk = request.data.get("list")
-        list_instance = List.objects.get(pk=list_pk)
-        if list_instance.user == request.user:
-            return super().create(request, *args, **kwargs)
-        return Response(status=status.HTTP_403_FORBIDDEN)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # The List is fetched by the serializer's validation already.
+        if serializer.validated_data["list"].user_id != request.user.id:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
+
+class ListItemBatchView(GenericAPIView):
+    """
+    Add, remove and move many `ListItem`s of the List in single transaction, see `books/lists.py`.
+    Returns all items of the List in new order.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ListItemBatchSerializer
+
+    def post(self, request, *args, **kwargs):
+        """
+        Only allow auth'd user to change `ListItem`s of his own Lists.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            list_instance: List = get_object_or_404(
+                List.objects.select_for_update(), pk=kwargs["pk"]
+            )
+            if list_instance.user_id != request.user.id:
+                return Response(status=status.HTTP_403_FORBIDDEN)
+            items = apply_list_operations(
+                list_instance, serializer.validated_data["operations"]
+            )
+
+        return Response(ListItemMinimalSerializer(items, many=True).data)
 
 
 class ListItemDetailView(DestroyModelMixin, GenericAPIView):
@@ -423,7 +983,7 @@ class ListItemDetailView(DestroyModelMixin, GenericAPIView):
     "Detail" `ListItem` view - for now only DELETE implemented.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     queryset = ListItem.objects.all()
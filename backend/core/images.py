@@ -0,0 +1,418 @@
+"""
+Generation of thumbnails (`ImageSpecField`s) when images are uploaded.
+
+`UploadTimeStrategy` is set as the default `django-imagekit` cache file strategy in settings. Thumbnail files are
+never generated while serving read requests - getting thumbnail URL doesn't touch the storage. Instead, thumbnails
+are generated when the source image is saved, depending on `THUMBNAILS_GENERATION` setting:
+
+- "sync": right away, in the request which uploaded the image;
+- "queue": by background worker, `python manage.py process_thumbnails`, using `ThumbnailTask` queue.
+
+Dimensions and a tiny inline placeholder (LQIP) of uploaded images are stored in the model when it's saved,
+see `update_image_metadata()`, so clients can reserve space for images and show placeholders without requests.
+
+Each thumbnail is available in several formats (JPEG, WebP and - if `pillow-avif-plugin` is installed - AVIF),
+serialized as `srcset`s by MIME type with `SrcsetField`.
+
+Thumbnails for images uploaded before (or lost, or outdated after specs were changed) are generated by
+`python manage.py generate_thumbnails`.
+"""
+import base64
+import datetime
+import io
+import logging
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from django.utils import timezone
+from imagekit.cachefiles import ImageCacheFile
+from imagekit.models import ImageSpecField
+from imagekit.models.fields.utils import ImageSpecFileDescriptor
+from PIL import Image
+from rest_framework import serializers
+
+try:
+    # Registers AVIF format in Pillow
+    import pillow_avif  # noqa: F401
+
+    AVIF_SUPPORTED = True
+except ImportError:  # pragma: no cover
+    AVIF_SUPPORTED = False
+
+logger = logging.getLogger(__name__)
+
+THUMBNAILS_GENERATION_SYNC = "sync"
+THUMBNAILS_GENERATION_QUEUE = "queue"
+
+# Options of modern format renditions - optimized for size, not for the best quality
+WEBP_OPTIONS = {"quality": 80, "method": 6}
+AVIF_OPTIONS = {"quality": 60}
+
+# MIME types of thumbnail formats, in order of preference
+FORMAT_MIME_TYPES = {
+    "AVIF": "image/avif",
+    "WEBP": "image/webp",
+    "JPEG": "image/jpeg",
+}
+
+# Placeholder is a WebP image fitting into the size, ~150-250 bytes as data URI
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_OPTIONS = {"quality": 40}
+
+# Number of source images with cached thumbnail URLs, see `get_rendition_urls()`
+RENDITION_URLS_CACHE_SIZE = 5000
+
+# Results of `regenerate_thumbnails()`
+THUMBNAIL_GENERATED = "generated"
+THUMBNAIL_UP_TO_DATE = "up_to_date"
+THUMBNAIL_FAILED = "failed"
+THUMBNAIL_SOURCE_MISSING = "source_missing"
+THUMBNAIL_SOURCE_NOT_CHANGED = "source_not_changed"
+
+
+def get_spec_field_names(model: Type[Model], source_field_name: str) -> List[str]:
+    """
+    Return names of `model`'s `ImageSpecField`s generated from `source_field_name` image field.
+    """
+    return [
+        name
+        for name, attribute in vars(model).items()
+        if isinstance(attribute, ImageSpecFileDescriptor)
+        and attribute.source_field_name == source_field_name
+    ]
+
+
+def get_spec(model: Type[Model], spec_field_name: str, name: str):
+    """
+    Return image spec of `ImageSpecField` of `model` for the source image stored as `name`.
+    """
+    spec_field = getattr(model, spec_field_name)
+    source_field = model._meta.get_field(spec_field.source)
+    source = source_field.attr_class(None, source_field, name)
+    return spec_field.get_spec(source=source)
+
+
+@lru_cache(maxsize=RENDITION_URLS_CACHE_SIZE)
+def get_rendition_urls(
+    model: Type[Model], source_field_name: str, name: str
+) -> Dict[str, str]:
+    """
+    Return URLs of all thumbnails of `model`'s `source_field_name` image stored as `name`, by spec field name.
+
+    Computing thumbnail file name (pickling and hashing the spec) takes most of the time spent on serializing
+    images, so URLs are computed once per source image and process. The cache never gets stale: the name
+    of the source image changes when another image is uploaded.
+    """
+    return {
+        spec_field_name: ImageCacheFile(get_spec(model, spec_field_name, name)).url
+        for spec_field_name in get_spec_field_names(model, source_field_name)
+    }
+
+
+def spec_url(model: Type[Model], spec_field_name: str, name: Optional[str]) -> str:
+    """
+    Return URL of `ImageSpecField` of `model` for the source image stored as `name`, or empty string if there's
+    no source image. Same as `instance.spec_field.url if instance.source_field else ""`, but cached.
+    """
+    if not name:
+        return ""
+    source_field_name = getattr(model, spec_field_name).source
+    return get_rendition_urls(model, source_field_name, name)[spec_field_name]
+
+
+@lru_cache(maxsize=None)
+def get_renditions(
+    model: Type[Model], source_field_name: str
+) -> List[Tuple[str, str, int]]:
+    """
+    Return `(spec_field_name, mime_type, width)` of thumbnails of `model`'s `source_field_name` image,
+    ordered by format preference and width.
+    """
+    renditions = []
+
+    for spec_field_name in get_spec_field_names(model, source_field_name):
+        spec = getattr(model, spec_field_name).get_spec(source=None)
+        mime_type = FORMAT_MIME_TYPES.get((spec.format or "").upper())
+        widths = [
+            processor.width
+            for processor in spec.processors
+            if getattr(processor, "width", None)
+        ]
+        if mime_type and widths:
+            renditions.append((spec_field_name, mime_type, widths[-1]))
+
+    mime_types = list(FORMAT_MIME_TYPES.values())
+    return sorted(
+        renditions,
+        key=lambda rendition: (mime_types.index(rendition[1]), rendition[2]),
+    )
+
+
+def get_srcset(
+    model: Type[Model], source_field_name: str, name: Optional[str]
+) -> Dict[str, str]:
+    """
+    Return `srcset`s of thumbnails by MIME type, e.g.
+    `{"image/webp": "/media/a.webp 64w, /media/b.webp 128w", "image/jpeg": "/media/a.jpg 64w, /media/b.jpg 128w"}`,
+    or empty dict if there's no source image.
+    """
+    if not name:
+        return {}
+
+    urls = get_rendition_urls(model, source_field_name, name)
+    srcset = defaultdict(list)
+    for spec_field_name, mime_type, width in get_renditions(model, source_field_name):
+        srcset[mime_type].append(
+            "{url} {width}w".format(url=urls[spec_field_name], width=width)
+        )
+
+    return {mime_type: ", ".join(sources) for mime_type, sources in srcset.items()}
+
+
+class SrcsetField(serializers.ReadOnlyField):
+    """
+    Serialize image field (passed as `source`) as `srcset`s of its thumbnails by MIME type, see `get_srcset()`.
+    Can be used in HTML as `<picture><source type="{mime_type}" srcset="{srcset}">...</picture>`.
+    """
+
+    def to_representation(self, value) -> Dict[str, str]:
+        return get_srcset(value.field.model, value.field.name, value.name)
+
+
+def get_image_metadata(file) -> Tuple[int, int, str]:
+    """
+    Return width, height and placeholder (tiny blurry version of the image as data URI) of the image file.
+    """
+    position = file.tell()
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+            image.draft("RGB", (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            placeholder = image.convert("RGB")
+    finally:
+        file.seek(position)
+
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    content = io.BytesIO()
+    placeholder.save(content, format="WEBP", **PLACEHOLDER_OPTIONS)
+    return (
+        width,
+        height,
+        "data:image/webp;base64," + base64.b64encode(content.getvalue()).decode(),
+    )
+
+
+def update_image_metadata(instance: Model, force: bool = False) -> bool:
+    """
+    Set dimensions and placeholder of the image of the instance (see `IMAGE_METADATA_FIELDS` setting), if the image was
+    just uploaded (or with `force`). Clear them if there's no image. Errors are logged, not raised.
+    Return `True` if the fields were changed.
+    """
+    source_field_name, prefix = settings.IMAGE_METADATA_FIELDS[
+        instance._meta.label_lower
+    ]
+    file = getattr(instance, source_field_name)
+    metadata = (None, None, "")
+
+    if file:
+        if file._committed and not force:
+            return False
+        try:
+            if file._committed:
+                with file.open("rb"):
+                    metadata = get_image_metadata(file)
+            else:
+                metadata = get_image_metadata(file)
+        except Exception:
+            logger.exception("Failed to read image %s", file.name)
+
+    for suffix, value in zip(["_width", "_height", "_placeholder"], metadata):
+        setattr(instance, prefix + suffix, value)
+    return True
+
+
+class ThumbnailField(serializers.ReadOnlyField):
+    """
+    Serialize `ImageSpecField` (with the source image field passed as `source`) as its URL, see `spec_url()`.
+    Unlike serializing `ImageSpecField` itself, doesn't compute thumbnail file name for each object.
+    """
+
+    def to_representation(self, value) -> str:
+        return spec_url(value.field.model, self.field_name, value.name)
+
+
+class ThumbnailFieldsSerializerMixin:
+    """
+    Serialize `ImageSpecField`s listed in `ModelSerializer`'s `Meta.fields` with `ThumbnailField`s.
+    """
+
+    def build_property_field(self, field_name: str, model_class: Type[Model]):
+        spec_field = getattr(model_class, field_name, None)
+        if isinstance(spec_field, ImageSpecField):
+            return ThumbnailField, {"source": spec_field.source}
+        return super().build_property_field(field_name, model_class)
+
+
+def generate_thumbnail(file: ImageCacheFile, force: bool = False) -> bool:
+    """
+    Generate the thumbnail file, unless it already exists. Errors are logged, not raised - missing thumbnail
+    must not break the upload. Return `True` on success.
+    """
+    try:
+        file.generate(force=force)
+    except Exception:
+        logger.exception("Failed to generate thumbnail %s", file.name)
+        return False
+    return True
+
+
+def generate_thumbnails(
+    model: Type[Model], source_field_name: str, name: str, force: bool = False
+) -> bool:
+    """
+    Generate all thumbnails of `model`'s `source_field_name` image stored as `name`. Return `True` on success.
+    """
+    results = [
+        generate_thumbnail(
+            ImageCacheFile(get_spec(model, spec_field_name, name)), force=force
+        )
+        for spec_field_name in get_spec_field_names(model, source_field_name)
+    ]
+    return all(results)
+
+
+def get_image_sources() -> List[Tuple[Type[Model], str]]:
+    """
+    Return `(model, source_field_name)` for all image fields used as sources of `ImageSpecField`s.
+    """
+    return [
+        (model, source_field_name)
+        for model in apps.get_models()
+        for source_field_name in sorted(
+            {
+                attribute.source_field_name
+                for attribute in vars(model).values()
+                if isinstance(attribute, ImageSpecFileDescriptor)
+            }
+        )
+    ]
+
+
+def regenerate_thumbnails(
+    model: Type[Model],
+    source_field_name: str,
+    name: str,
+    force: bool = False,
+    since: Optional[datetime.datetime] = None,
+) -> Counter:
+    """
+    Generate missing or outdated (older than the source image) thumbnails of `model`'s `source_field_name` image
+    stored as `name`. With `force`, all thumbnails are generated again. With `since`, source images modified
+    earlier are skipped.
+
+    Return counts of thumbnails by result (`THUMBNAIL_GENERATED`, `THUMBNAIL_UP_TO_DATE`, ...).
+    """
+    results = Counter()
+    spec_field_names = get_spec_field_names(model, source_field_name)
+    storage = model._meta.get_field(source_field_name).storage
+
+    if not storage.exists(name):
+        results[THUMBNAIL_SOURCE_MISSING] += len(spec_field_names)
+        return results
+
+    source_modified = get_modified_time(storage, name)
+    if since is not None and source_modified is not None and source_modified < since:
+        results[THUMBNAIL_SOURCE_NOT_CHANGED] += len(spec_field_names)
+        return results
+
+    for spec_field_name in spec_field_names:
+        file = ImageCacheFile(get_spec(model, spec_field_name, name))
+
+        if file.storage.exists(file.name):
+            modified = get_modified_time(file.storage, file.name)
+            is_outdated = (
+                source_modified is not None
+                and modified is not None
+                and modified < source_modified
+            )
+            if not force and not is_outdated:
+                results[THUMBNAIL_UP_TO_DATE] += 1
+                continue
+            # Otherwise storage would save new file with another name.
+            file.storage.delete(file.name)
+
+        if generate_thumbnail(file, force=True):
+            results[THUMBNAIL_GENERATED] += 1
+        else:
+            results[THUMBNAIL_FAILED] += 1
+
+    return results
+
+
+def get_modified_time(storage, name: str) -> Optional[datetime.datetime]:
+    """
+    Return last modification time of the file, or `None` if the storage doesn't support it.
+    """
+    try:
+        return storage.get_modified_time(name)
+    except NotImplementedError:
+        return None
+
+
+def get_model(label: str) -> Optional[Type[Model]]:
+    """
+    Return model by its label (e.g. "books.book"), or `None` if there's no such model.
+    """
+    try:
+        return apps.get_model(label)
+    except (LookupError, ValueError):
+        return None
+
+
+class UploadTimeStrategy:
+    """
+    `django-imagekit` cache file strategy, which generates thumbnails when source image is saved,
+    and never - when thumbnail is accessed (e.g. its URL is requested).
+    """
+
+    def on_existence_required(self, file: ImageCacheFile):
+        """
+        Called when thumbnail's URL or path is requested - assume the file was generated on upload.
+        """
+
+    def on_content_required(self, file: ImageCacheFile):
+        """
+        Called when thumbnail's content is read - generate the file if it's missing.
+        """
+        file.generate()
+
+    def on_source_saved(self, file: ImageCacheFile):
+        """
+        Called for each thumbnail when the source image is saved.
+        """
+        from .models import ThumbnailTask
+
+        if settings.THUMBNAILS_GENERATION != THUMBNAILS_GENERATION_QUEUE:
+            generate_thumbnail(file)
+            return
+
+        # All thumbnails of the source image are generated by single task. The failed task of the same image
+        # is retried right away.
+        source = file.generator.source
+        ThumbnailTask.objects.update_or_create(
+            model=source.field.model._meta.label_lower,
+            field=source.field.name,
+            name=source.name,
+            defaults={"attempts": 0, "run_after": timezone.now()},
+        )
+
+    def should_verify_existence(self, file: ImageCacheFile) -> bool:
+        """
+        Don't check storage when thumbnail is tested for truthiness.
+        """
+        return False
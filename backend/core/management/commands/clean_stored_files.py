@@ -0,0 +1,32 @@
+"""
+Remove stored files which were claimed but never referenced (see `core/storage.py`), e.g. when saving the object
+failed after its file was written.
+
+Usage:
+    python manage.py clean_stored_files              # files claimed more than 24 hours ago
+    python manage.py clean_stored_files --hours 1
+"""
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.storage import delete_abandoned_files
+
+
+class Command(BaseCommand):
+    help = "Remove stored files which were never referenced."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=24,
+            help="Remove files claimed more than this number of hours ago (default: 24).",
+        )
+
+    def handle(self, *args, **options):
+        claimed_before = timezone.now() - datetime.timedelta(hours=options["hours"])
+        removed = delete_abandoned_files(claimed_before)
+
+        self.stdout.write("Removed files: {removed}".format(removed=removed))
@@ -0,0 +1,194 @@
+"""
+Generate thumbnails (`ImageSpecField`s) of all uploaded images: books' covers, authors' portraits,
+users' profile images. Useful after specs were changed or `media/` was restored from backup.
+
+Usage:
+    python manage.py generate_thumbnails                        # missing and outdated thumbnails
+    python manage.py generate_thumbnails --since 2026-10-17     # only for images modified since the date
+    python manage.py generate_thumbnails --force --workers 8    # all thumbnails, using 8 processes
+"""
+import datetime
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core.images import (
+    THUMBNAIL_FAILED,
+    THUMBNAIL_GENERATED,
+    THUMBNAIL_SOURCE_MISSING,
+    THUMBNAIL_SOURCE_NOT_CHANGED,
+    THUMBNAIL_UP_TO_DATE,
+    get_image_sources,
+    get_model,
+    regenerate_thumbnails,
+)
+
+
+def regenerate_thumbnails_job(
+    model_label: str,
+    source_field_name: str,
+    name: str,
+    force: bool,
+    since: Optional[datetime.datetime],
+) -> Counter:
+    """
+    Run `regenerate_thumbnails()` in a worker process.
+    """
+    return regenerate_thumbnails(
+        get_model(model_label), source_field_name, name, force=force, since=since
+    )
+
+
+def parse_since(value: str) -> datetime.datetime:
+    """
+    Parse `--since` option: date or date and time in ISO 8601 format, in current time zone if not specified.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError("Invalid --since value: {value}".format(value=value))
+        since = datetime.datetime.combine(date, datetime.time.min)
+
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = "Generate missing or outdated thumbnails of all uploaded images in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only process images modified since the date or date and time (ISO 8601).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Generate all thumbnails, also up-to-date ones.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPUs).",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Only process images of the model, e.g. `books.book`. Can be used multiple times.",
+        )
+
+    def handle(self, *args, **options):
+        since = parse_since(options["since"]) if options["since"] else None
+        jobs = self.get_jobs(options["models"])
+        job_args = [(*job, options["force"], since) for job in jobs]
+        total = len(job_args)
+        self.stdout.write(
+            "Images to process: {total}, workers: {workers}".format(
+                total=total,
+                workers=options["workers"],
+            )
+        )
+
+        results = Counter()
+        started = time.monotonic()
+        progress_step = max(1, total // 20)
+
+        for done, job_results in enumerate(
+            self.run_jobs(job_args, options["workers"]), start=1
+        ):
+            results.update(job_results)
+            if done % progress_step == 0 or done == total:
+                self.write_progress(done, total, results, time.monotonic() - started)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated: {generated}, up-to-date: {up_to_date}, not changed since: {not_changed}, "
+                "missing source images: {missing}, failed: {failed}.".format(
+                    generated=results[THUMBNAIL_GENERATED],
+                    up_to_date=results[THUMBNAIL_UP_TO_DATE],
+                    not_changed=results[THUMBNAIL_SOURCE_NOT_CHANGED],
+                    missing=results[THUMBNAIL_SOURCE_MISSING],
+                    failed=results[THUMBNAIL_FAILED],
+                )
+            )
+        )
+
+    def get_jobs(self, models: Optional[list]) -> list:
+        """
+        Return `(model_label, source_field_name, name)` for all distinct uploaded images.
+        """
+        jobs = []
+        sources = get_image_sources()
+        labels = {model._meta.label_lower for model, _ in sources}
+        selected = {label.lower() for label in models} if models else labels
+
+        if selected - labels:
+            raise CommandError(
+                "Unknown models: {unknown}. Models with thumbnails: {labels}".format(
+                    unknown=", ".join(sorted(selected - labels)),
+                    labels=", ".join(sorted(labels)),
+                )
+            )
+
+        for model, source_field_name in sources:
+            label = model._meta.label_lower
+            if label not in selected:
+                continue
+
+            names = (
+                model.objects.exclude(**{source_field_name: ""})
+                .exclude(**{source_field_name + "__isnull": True})
+                .values_list(source_field_name, flat=True)
+                .distinct()
+                .order_by()
+            )
+            jobs += [(label, source_field_name, name) for name in names]
+
+        return jobs
+
+    def run_jobs(self, job_args: list, workers: int):
+        """
+        Run jobs using process pool, yield results as jobs are done.
+        """
+        if workers <= 1:
+            for args in job_args:
+                yield regenerate_thumbnails_job(*args)
+            return
+
+        # DB connections must not be shared with forked processes.
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        ) as executor:
+            futures = [
+                executor.submit(regenerate_thumbnails_job, *args) for args in job_args
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def write_progress(self, done: int, total: int, results: Counter, elapsed: float):
+        self.stdout.write(
+            "{done}/{total} images, {generated} thumbnails generated, "
+            "{speed:.1f} images/s, {thumbnails_speed:.1f} thumbnails/s".format(
+                done=done,
+                total=total,
+                generated=results[THUMBNAIL_GENERATED],
+                speed=done / elapsed if elapsed else 0,
+                thumbnails_speed=results[THUMBNAIL_GENERATED] / elapsed
+                if elapsed
+                else 0,
+            )
+        )
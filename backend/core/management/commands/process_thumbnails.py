@@ -0,0 +1,114 @@
+"""
+Background worker generating thumbnails queued as `ThumbnailTask`s (when `THUMBNAILS_GENERATION` is "queue").
+
+Usage:
+    python manage.py process_thumbnails            # run forever, polling the queue
+    python manage.py process_thumbnails --once     # process queued tasks and exit
+
+Several workers can run at once - tasks are locked with `SELECT ... FOR UPDATE SKIP LOCKED`.
+
+Failed tasks stay in the queue and are retried after growing delays (`--retry-delay` seconds, doubled on each
+attempt), up to `--max-attempts` times. Tasks failed that many times are kept for inspection - uploading the same
+image again queues it right away.
+"""
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.images import generate_thumbnails, get_model
+from core.models import ThumbnailTask
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails queued for uploaded images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process queued tasks and exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Number of tasks taken from the queue at once.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="Number of attempts to process the task before giving up.",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            type=float,
+            default=60.0,
+            help="Seconds to wait before retrying the failed task, doubled on each attempt.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process_batch(
+                options["batch_size"], options["max_attempts"], options["retry_delay"]
+            )
+
+            if not processed:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+
+    def process_batch(
+        self, batch_size: int, max_attempts: int, retry_delay: float
+    ) -> int:
+        """
+        Generate thumbnails for a batch of due tasks, remove succeeded tasks from the queue and postpone failed ones.
+        Return number of processed tasks.
+        """
+        with transaction.atomic():
+            tasks = list(
+                ThumbnailTask.objects.select_for_update(skip_locked=True)
+                .filter(run_after__lte=timezone.now(), attempts__lt=max_attempts)
+                .order_by("created", "id")[:batch_size]
+            )
+
+            succeeded_pks = []
+            for task in tasks:
+                model = get_model(task.model)
+                if model is None:
+                    self.stderr.write("Unknown model: {task}".format(task=task))
+                # django-imagekit may have cached the state of thumbnails of the failed attempt.
+                elif generate_thumbnails(
+                    model, task.field, task.name, force=task.attempts > 0
+                ):
+                    self.stdout.write("Generated: {task}".format(task=task))
+                    succeeded_pks.append(task.pk)
+                    continue
+                else:
+                    self.stderr.write(
+                        "Failed (attempt {attempt} of {max_attempts}): {task}".format(
+                            attempt=task.attempts + 1,
+                            max_attempts=max_attempts,
+                            task=task,
+                        )
+                    )
+
+                ThumbnailTask.objects.filter(pk=task.pk).update(
+                    attempts=F("attempts") + 1,
+                    run_after=timezone.now()
+                    + datetime.timedelta(seconds=retry_delay * 2**task.attempts),
+                )
+
+            ThumbnailTask.objects.filter(pk__in=succeeded_pks).delete()
+
+        return len(tasks)
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-17 23:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+# Models moved from `books` app: tables are renamed by `books.0028_move_stored_files_to_core`.
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='StoredFile',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('name', models.CharField(max_length=255, unique=True, verbose_name='имя файла')),
+                        ('references', models.PositiveIntegerField(default=0, verbose_name='число ссылок')),
+                        ('created', models.DateTimeField(auto_now_add=True, verbose_name='создан')),
+                        ('claimed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='занят')),
+                    ],
+                    options={
+                        'verbose_name': 'сохранённый файл',
+                        'verbose_name_plural': 'сохранённые файлы',
+                        'ordering': ['name'],
+                    },
+                ),
+                migrations.CreateModel(
+                    name='ThumbnailTask',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('model', models.CharField(max_length=100, verbose_name='модель')),
+                        ('field', models.CharField(max_length=100, verbose_name='поле')),
+                        ('name', models.CharField(max_length=255, verbose_name='имя файла')),
+                        ('attempts', models.PositiveIntegerField(default=0, verbose_name='попытки')),
+                        ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='выполнить после')),
+                        ('created', models.DateTimeField(auto_now_add=True, verbose_name='создана')),
+                    ],
+                    options={
+                        'verbose_name': 'задача генерации миниатюр',
+                        'verbose_name_plural': 'задачи генерации миниатюр',
+                        'ordering': ['created'],
+                    },
+                ),
+                migrations.AddConstraint(
+                    model_name='thumbnailtask',
+                    constraint=models.UniqueConstraint(fields=('model', 'field', 'name'), name='unique_thumbnail_task'),
+                ),
+            ],
+            database_operations=[],
+        ),
+    ]
@@ -0,0 +1,85 @@
+"""
+Models of uploaded files and images shared by all apps, see `core/images.py` and `core/storage.py`.
+"""
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class ThumbnailTask(models.Model):
+    """
+    Queued generation of thumbnails (`ImageSpecField`s) for the uploaded image.
+    Processed by `process_thumbnails` management command, when `THUMBNAILS_GENERATION` setting is "queue".
+    """
+
+    model = models.CharField(
+        verbose_name=_("модель"),
+        max_length=100,
+    )
+    field = models.CharField(
+        verbose_name=_("поле"),
+        max_length=100,
+    )
+    name = models.CharField(
+        verbose_name=_("имя файла"),
+        max_length=255,
+    )
+    # Failed tasks are retried with growing delays, see `process_thumbnails` command.
+    attempts = models.PositiveIntegerField(
+        verbose_name=_("попытки"),
+        default=0,
+    )
+    run_after = models.DateTimeField(
+        verbose_name=_("выполнить после"),
+        default=timezone.now,
+    )
+    created = models.DateTimeField(verbose_name=_("создана"), auto_now_add=True)
+
+    class Meta:
+        ordering = ["created"]
+        verbose_name = _("задача генерации миниатюр")
+        verbose_name_plural = _("задачи генерации миниатюр")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model", "field", "name"],
+                name="unique_thumbnail_task",
+            ),
+        ]
+
+    def __str__(self):
+        return "{model}.{field}: {name}".format(
+            model=self.model,
+            field=self.field,
+            name=self.name,
+        )
+
+
+class StoredFile(models.Model):
+    """
+    File in content-addressed storage with the number of references to it from file fields, see `core/storage.py`.
+    The file is removed when the last reference is released.
+    """
+
+    name = models.CharField(
+        verbose_name=_("имя файла"),
+        max_length=255,
+        unique=True,
+    )
+    references = models.PositiveIntegerField(
+        verbose_name=_("число ссылок"),
+        default=0,
+    )
+    created = models.DateTimeField(verbose_name=_("создан"), auto_now_add=True)
+    # Updated when the file is saved again, see `claim_name()`.
+    claimed = models.DateTimeField(verbose_name=_("занят"), default=timezone.now)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = _("сохранённый файл")
+        verbose_name_plural = _("сохранённые файлы")
+
+    def __str__(self):
+        return "{name} ({references})".format(
+            name=self.name,
+            references=self.references,
+        )
@@ -0,0 +1,262 @@
+"""
+Content-addressed storage of uploaded files (books' files, covers, portraits and profile images).
+
+Files are stored by SHA-256 of their content: `<upload_to>/<first 2 hex digits>/<sha256><extension>`, e.g.
+`images/covers/3f/3f9a...c1.jpg`. The same file uploaded again (for another book, or by another user) isn't
+written twice - the existing file is reused. Thumbnails are named after the source image
+(see `imagekit.cachefiles.namers.source_name_as_path`), so they are shared too and generated only once.
+
+Stored files are reference-counted with `StoredFile`: references are added and released by signal handlers
+(see `books/signals.py`) when objects are saved with another file or deleted. When the last reference is
+released, the file is removed from the storage along with its thumbnails. The name of the file is claimed (its
+`StoredFile` is created) before the existing file is reused, and removal of the file inserts and locks the row
+by the unique name - so the file isn't removed while a concurrent transaction is saving a reference to it.
+Claims of files whose objects failed to save (e.g. the request failed after the file was written) are never
+referenced: such files are removed after a grace period by `python manage.py clean_stored_files`.
+
+Files uploaded before (named after the uploaded file) are moved to the content-addressed layout, and references
+are recounted, by `python manage.py deduplicate_files`.
+"""
+import datetime
+import hashlib
+import logging
+import os
+import re
+from collections import Counter
+from typing import List, Tuple, Type
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, FileField, Model
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from imagekit.cachefiles import ImageCacheFile
+
+from .images import get_image_sources, get_spec, get_spec_field_names
+
+logger = logging.getLogger(__name__)
+
+# Size of blocks read from the file to compute its hash
+HASH_BLOCK_SIZE = 64 * 1024
+CONTENT_ADDRESSED_NAME_RE = re.compile(r"(^|/)([0-9a-f]{2})/\2[0-9a-f]{62}(\.\w+)?$")
+# Longer extensions are dropped to fit the name into `FileField.max_length`
+MAX_EXTENSION_LENGTH = 10
+
+
+def get_content_hash(content: File) -> str:
+    """
+    Return SHA-256 hex digest of the file's content. The hash of the file assembled from chunked upload is known
+    already (see `books.uploads.AssembledFile`).
+    """
+    sha256 = getattr(content, "sha256", None)
+    if sha256:
+        return sha256
+
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks(chunk_size=HASH_BLOCK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def is_content_addressed(name: str) -> bool:
+    """
+    Check if the file is stored under content-addressed name.
+    """
+    return CONTENT_ADDRESSED_NAME_RE.search(name) is not None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage which names files by SHA-256 of their content and doesn't store the same content twice.
+    """
+
+    def get_content_name(self, name: str, content: File) -> str:
+        """
+        Return content-addressed name of the file to be saved as `name` (the directory is kept).
+        """
+        sha256 = get_content_hash(content)
+        extension = os.path.splitext(name)[1].lower()
+        if len(extension) > MAX_EXTENSION_LENGTH:
+            extension = ""
+        return os.path.join(os.path.dirname(name), sha256[:2], sha256 + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = self.get_content_name(name, content)
+        # Claimed before the check - see `delete_unreferenced_file()`.
+        claim_name(name)
+        if self.exists(name):
+            return name
+        # If the same file is being saved concurrently, the name gets a suffix - the file is stored twice,
+        # but nothing breaks.
+        return super().save(name, content, max_length=max_length)
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def get_content_addressed_fields(model: Type[Model]) -> List[str]:
+    """
+    Return names of `model`'s file fields stored in `ContentAddressedStorage`.
+    """
+    return [
+        field.name
+        for field in model._meta.get_fields()
+        if isinstance(field, FileField)
+        and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def get_all_content_addressed_fields() -> List[Tuple[Type[Model], str]]:
+    """
+    Return `(model, field_name)` for all file fields stored in `ContentAddressedStorage`.
+    """
+    return [
+        (model, field_name)
+        for model in apps.get_models()
+        for field_name in get_content_addressed_fields(model)
+    ]
+
+
+def add_reference(name: str):
+    """
+    Add reference to the stored file.
+    """
+    from .models import StoredFile
+
+    with transaction.atomic():
+        stored_file, created = StoredFile.objects.get_or_create(name=name)
+        StoredFile.objects.filter(pk=stored_file.pk).update(
+            references=F("references") + 1
+        )
+
+
+def release_reference(name: str):
+    """
+    Release reference to the stored file. The last reference removes the file with its thumbnails,
+    after the transaction is committed.
+    """
+    from .models import StoredFile
+
+    with transaction.atomic():
+        stored_file = StoredFile.objects.select_for_update().filter(name=name).first()
+        if stored_file is None:
+            # The file was uploaded before references were counted - keep it.
+            return
+        if stored_file.references > 1:
+            StoredFile.objects.filter(pk=stored_file.pk).update(
+                references=F("references") - 1
+            )
+            return
+        stored_file.delete()
+
+    transaction.on_commit(lambda: delete_unreferenced_file(name))
+
+
+def claim_name(name: str):
+    """
+    Create `StoredFile` of the file being saved (without references yet, they are added after the object is saved),
+    so that the file isn't removed as unreferenced meanwhile.
+    """
+    from .models import StoredFile
+
+    with transaction.atomic():
+        # Locking waits for the transaction releasing the last reference: its deleted row isn't found then.
+        StoredFile.objects.select_for_update().update_or_create(
+            name=name, defaults={"claimed": timezone.now()}
+        )
+
+
+def delete_unreferenced_file(name: str):
+    """
+    Remove the stored file and its thumbnails, unless it was claimed or referenced again.
+    """
+    from .models import StoredFile
+
+    with transaction.atomic():
+        # Inserting the row by the unique name waits for transactions claiming the name concurrently,
+        # and makes new claims wait until the file is removed (and then save it again).
+        stored_file, created = StoredFile.objects.select_for_update().get_or_create(
+            name=name
+        )
+        if not created:
+            return
+        content_addressed_storage.delete(name)
+        delete_thumbnails(name)
+        stored_file.delete()
+
+
+def is_referenced(name: str) -> bool:
+    """
+    Check if any object references the stored file, in the database.
+    """
+    return any(
+        model._default_manager.filter(**{field_name: name}).exists()
+        for model, field_name in get_all_content_addressed_fields()
+    )
+
+
+def delete_abandoned_files(claimed_before: datetime.datetime) -> int:
+    """
+    Remove stored files (with thumbnails) claimed before `claimed_before` and never referenced, e.g. when saving
+    of the object failed after the file was written. Return number of removed files.
+    """
+    from .models import StoredFile
+
+    abandoned = StoredFile.objects.filter(references=0, claimed__lt=claimed_before)
+    removed = 0
+    for pk in abandoned.values_list("pk", flat=True):
+        with transaction.atomic():
+            # Claimed again or referenced meanwhile - the locked row doesn't match anymore.
+            stored_file = abandoned.select_for_update().filter(pk=pk).first()
+            if stored_file is None or is_referenced(stored_file.name):
+                continue
+            content_addressed_storage.delete(stored_file.name)
+            delete_thumbnails(stored_file.name)
+            stored_file.delete()
+            removed += 1
+    return removed
+
+
+def delete_thumbnails(name: str):
+    """
+    Remove thumbnails of all image fields generated from the source image stored as `name`.
+    """
+    for model, source_field_name in get_image_sources():
+        if source_field_name not in get_content_addressed_fields(model):
+            continue
+        for spec_field_name in get_spec_field_names(model, source_field_name):
+            file = ImageCacheFile(get_spec(model, spec_field_name, name))
+            try:
+                file.storage.delete(file.name)
+            except Exception:
+                logger.exception("Failed to delete thumbnail %s", file.name)
+            # `django-imagekit` caches the state of thumbnail files - the same image may be uploaded again.
+            backend = file.cachefile_backend
+            backend.cache.delete(backend.get_key(file))
+
+
+def count_references() -> Counter:
+    """
+    Return number of references to stored files by name, counted in the database.
+    """
+    references = Counter()
+    for model, field_name in get_all_content_addressed_fields():
+        names = (
+            model._default_manager.exclude(**{field_name: ""})
+            .exclude(**{field_name + "__isnull": True})
+            .values_list(field_name, flat=True)
+        )
+        references.update(names)
+    return references
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 import os.path
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from environs import Env
 
 env = Env()
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.forms",
+    "django.contrib.postgres",
     # 3rd party apps
     "rest_framework",
     "rest_framework.authtoken",
@@ -62,6 +64,7 @@ INSTALLED_APPS = [
     # Local apps
     "users.apps.UsersConfig",
     "books.apps.BooksConfig",
+    "core.apps.CoreConfig",
 ]
 
 MIDDLEWARE = [
@@ -158,6 +161,109 @@ STATIC_ROOT = env.str("STATIC_ROOT", "staticfiles")
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Thumbnails (`ImageSpecField`s) are generated when images are uploaded, never when they are requested
+# (see `core/images.py`):
+# - "sync": in the request which uploaded the image;
+# - "queue": by background worker process, `python manage.py process_thumbnails`.
+
+THUMBNAILS_GENERATION = env.str("THUMBNAILS_GENERATION", "sync")
+IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY = "core.images.UploadTimeStrategy"
+
+# Image fields with dimensions and placeholder stored on upload: model label -> (image field, prefix of metadata
+# fields). E.g. `Book.cover_image` has `cover_width`, `cover_height` and `cover_placeholder` fields.
+IMAGE_METADATA_FIELDS = {
+    "books.book": ("cover_image", "cover"),
+    "books.author": ("portrait", "portrait"),
+    "users.customuser": ("profile_image", "profile_image"),
+}
+
+# Book files are downloaded through `/api/v1/books/<pk>/download/` (see `books/downloads.py`) and sent by:
+# - "django": `FileResponse` with HTTP Range support (development);
+# - "x-accel-redirect": nginx, from internal location `BOOK_FILES_ACCEL_REDIRECT_LOCATION`;
+# - "x-sendfile": Apache / lighttpd with `mod_xsendfile`.
+# Signed download links expire in `BOOK_DOWNLOAD_LINK_MAX_AGE` seconds.
+
+BOOK_FILES_DELIVERY = env.str("BOOK_FILES_DELIVERY", "django")
+BOOK_FILES_ACCEL_REDIRECT_LOCATION = env.str(
+    "BOOK_FILES_ACCEL_REDIRECT_LOCATION", "/protected-media/"
+)
+BOOK_DOWNLOAD_LINK_MAX_AGE = env.int("BOOK_DOWNLOAD_LINK_MAX_AGE", 6 * 60 * 60)
+
+# Resumable chunked uploads of large files (see `books/uploads.py`). Chunks are written to `UPLOADS_ROOT`,
+# which must not be served by web server. Chunk size must be less than nginx `client_max_body_size`.
+
+UPLOADS_ROOT = env.str("UPLOADS_ROOT", str(BASE_DIR / "uploads"))
+UPLOAD_MAX_SIZE = env.int("UPLOAD_MAX_SIZE", 2 * 1024**3)
+UPLOAD_CHUNK_MAX_SIZE = env.int("UPLOAD_CHUNK_MAX_SIZE", 32 * 1024**2)
+
+# Django REST Framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+# Render and parse JSON with `orjson` (falls back to standard `json` module if `orjson` is not installed)
+USE_ORJSON = env.bool("USE_ORJSON", True)
+
+REST_FRAMEWORK = {
+    # Token authentication is also used by djoser's views (e.g. `token/logout/`)
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.CachedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "books.renderers.ORJSONRenderer"
+        if USE_ORJSON
+        else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "books.parsers.ORJSONParser"
+        if USE_ORJSON
+        else "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Cache backend (used by autocomplete indexes and response cache):
+# - "locmem": memory of the process (development, single worker);
+# - "file": directory `CACHE_LOCATION`;
+# - "redis": Redis server at `CACHE_LOCATION` URL, e.g. "redis://redis:6379/1".
+# Use shared backend ("file" or "redis") with several workers - invalidation is propagated through the cache.
+
+CACHE_BACKEND = env.str("CACHE_BACKEND", "locmem")
+CACHE_LOCATION = env.str("CACHE_LOCATION", "")
+if CACHE_BACKEND in ("file", "redis") and not CACHE_LOCATION:
+    raise ImproperlyConfigured(
+        f'CACHE_LOCATION must be set for "{CACHE_BACKEND}" cache backend.'
+    )
+CACHES = {
+    "default": {
+        "BACKEND": {
+            "locmem": "django.core.cache.backends.locmem.LocMemCache",
+            "file": "django.core.cache.backends.filebased.FileBasedCache",
+            "redis": "django.core.cache.backends.redis.RedisCache",
+        }[CACHE_BACKEND],
+        "LOCATION": CACHE_LOCATION,
+    }
+}
+
+# Users authenticated by tokens are cached (see `users/authentication.py`): in every process - up to
+# `TOKEN_CACHE_SIZE` tokens for `TOKEN_CACHE_TTL` seconds (changes of users made by other processes are seen
+# after this time), and in Django cache if `TOKEN_CACHE_SHARED` is set (use with shared cache backend).
+
+TOKEN_CACHE_SIZE = env.int("TOKEN_CACHE_SIZE", 1024)
+TOKEN_CACHE_TTL = env.int("TOKEN_CACHE_TTL", 60)
+TOKEN_CACHE_SHARED = env.bool("TOKEN_CACHE_SHARED", False)
+
+# Responses to anonymous catalogue requests are cached for this number of seconds, unless invalidated
+# by changes of the data (see `books/response_cache.py`)
+
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", 10 * 60)
+
+# Autocomplete endpoint responses may be cached by clients for this number of seconds
+
+AUTOCOMPLETE_CACHE_MAX_AGE = env.int("AUTOCOMPLETE_CACHE_MAX_AGE", 30)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,173 @@
+"""
+Token authentication with cached tokens: authenticated users are looked up in the database once per token, not
+on every request.
+
+Authenticated `(user, token)` pairs are cached:
+- in every process: LRU cache of `TOKEN_CACHE_SIZE` tokens, entries expire in `TOKEN_CACHE_TTL` seconds;
+- in Django cache, shared by all processes, if `TOKEN_CACHE_SHARED` is set (use with shared cache backend,
+  see `CACHE_BACKEND` setting). Tokens aren't stored in cache keys, only their hashes.
+
+Cached tokens are invalidated by signal handlers in `users/signals.py` when the token is deleted (on logout
+with djoser) and when the user is changed or deleted. Invalidation reaches the in-process cache of the process
+which made the change and the shared cache - other processes see the change in at most `TOKEN_CACHE_TTL` seconds.
+
+Only the token's creation time and the user's fields except the password hash are cached (pickled, so requests
+never share and change the same user instance); the user is rebuilt with the password deferred, so it's read from
+the database only when accessed.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from rest_framework import authentication
+
+# Authenticated users are stored in the shared cache for this number of seconds
+SHARED_CACHE_TIMEOUT = 60 * 60
+# Fields of users which are never cached
+UNCACHED_USER_FIELDS = ["password"]
+
+
+def get_shared_cache_key(key: str) -> str:
+    return "auth-token:{digest}".format(digest=hashlib.sha256(key.encode()).hexdigest())
+
+
+class TokenCache:
+    """
+    Thread-safe LRU cache of pickled credentials (see `dump_credentials()`) by token keys, with expiring entries.
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Token key -> (expiration time, user pk, pickled credentials)
+        self._entries: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, user_pk: int, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user_pk, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_pk: int) -> None:
+        with self._lock:
+            for key in [
+                key for key, entry in self._entries.items() if entry[1] == user_pk
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
+
+
+def invalidate_token(key: str) -> None:
+    """
+    Remove the token from caches, now and once more after the transaction is committed - requests authenticated
+    meanwhile could cache the token read before the commit.
+    """
+
+    def invalidate():
+        token_cache.delete(key)
+        if settings.TOKEN_CACHE_SHARED:
+            cache.delete(get_shared_cache_key(key))
+
+    invalidate()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(invalidate)
+
+
+def invalidate_user_tokens(user_pk: int) -> None:
+    """
+    Remove tokens of the user from caches (see `invalidate_token()`).
+    """
+    from rest_framework.authtoken.models import Token
+
+    token_cache.delete_user(user_pk)
+    if settings.TOKEN_CACHE_SHARED:
+        for key in Token.objects.filter(user_id=user_pk).values_list("key", flat=True):
+            invalidate_token(key)
+    elif transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: token_cache.delete_user(user_pk))
+
+
+def dump_credentials(user, token) -> bytes:
+    """
+    Pickle the user's fields except `UNCACHED_USER_FIELDS` and the token's creation time.
+    """
+    user_values = {
+        field.attname: field.get_prep_value(field.value_from_object(user))
+        for field in user._meta.concrete_fields
+        if field.name not in UNCACHED_USER_FIELDS
+    }
+    return pickle.dumps((user_values, token.created))
+
+
+def load_credentials(token_model, key: str, value: bytes) -> tuple:
+    """
+    Rebuild `(user, token)` pair pickled by `dump_credentials()`, with uncached fields of the user deferred.
+    """
+    user_values, token_created = pickle.loads(value)
+    user_model = get_user_model()
+    user = user_model.from_db(
+        router.db_for_read(user_model), list(user_values), list(user_values.values())
+    )
+    token = token_model.from_db(
+        router.db_for_read(token_model),
+        ["key", "user_id", "created"],
+        [key, user.pk, token_created],
+    )
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """
+    `TokenAuthentication`, which caches authenticated users by tokens.
+    """
+
+    def authenticate_credentials(self, key):
+        value = token_cache.get(key)
+        if value is not None:
+            # NB: the entry isn't refreshed, so changes made in other processes are seen after it expires.
+            return load_credentials(self.get_model(), key, value)
+
+        if settings.TOKEN_CACHE_SHARED:
+            value = cache.get(get_shared_cache_key(key))
+
+        if value is not None:
+            user, token = load_credentials(self.get_model(), key, value)
+        else:
+            user, token = super().authenticate_credentials(key)
+            value = dump_credentials(user, token)
+            if settings.TOKEN_CACHE_SHARED:
+                cache.set(get_shared_cache_key(key), value, SHARED_CACHE_TIMEOUT)
+
+        token_cache.set(key, user.pk, value)
+        return user, token
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-17 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_customuser_profile_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='высота изображения профиля'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_placeholder',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1000, verbose_name='заглушка изображения профиля'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='ширина изображения профиля'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-17 21:08
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='profile_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to='images/profiles/', verbose_name='изображение профиля'),
+        ),
+    ]
@@ -5,6 +5,9 @@ from django.utils.translation import gettext_lazy as _
 from imagekit.models import ImageSpecField
 from imagekit.processors import SmartResize
 
+from core.images import AVIF_OPTIONS, AVIF_SUPPORTED, WEBP_OPTIONS
+from core.storage import content_addressed_storage
+
 
 class CustomUser(AbstractUser):
     """
@@ -16,6 +19,27 @@ class CustomUser(AbstractUser):
         null=True,
         blank=True,
         upload_to="images/profiles/",
+        storage=content_addressed_storage,
+    )
+    # Set on upload, see `core.images.update_image_metadata()`.
+    profile_image_width = models.PositiveIntegerField(
+        verbose_name=_("ширина изображения профиля"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    profile_image_height = models.PositiveIntegerField(
+        verbose_name=_("высота изображения профиля"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    profile_image_placeholder = models.CharField(
+        verbose_name=_("заглушка изображения профиля"),
+        max_length=1000,
+        blank=True,
+        default="",
+        editable=False,
     )
     # NB: from `django-imagekit` docs: ImageSpecFields are virtual — they add no fields to your database and don't
     # require a database.
@@ -31,6 +55,32 @@ class CustomUser(AbstractUser):
         format="JPEG",
         options={"quality": 100},
     )
+    # Smaller renditions in modern formats, see `core.images.SrcsetField`.
+    profile_image_thumbnail_small_webp = ImageSpecField(
+        source="profile_image",
+        processors=[SmartResize(width=32, height=32, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    profile_image_thumbnail_large_webp = ImageSpecField(
+        source="profile_image",
+        processors=[SmartResize(width=300, height=300, upscale=True)],
+        format="WEBP",
+        options=WEBP_OPTIONS,
+    )
+    if AVIF_SUPPORTED:
+        profile_image_thumbnail_small_avif = ImageSpecField(
+            source="profile_image",
+            processors=[SmartResize(width=32, height=32, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
+        profile_image_thumbnail_large_avif = ImageSpecField(
+            source="profile_image",
+            processors=[SmartResize(width=300, height=300, upscale=True)],
+            format="AVIF",
+            options=AVIF_OPTIONS,
+        )
 
     def __str__(self):
         return self.username
@@ -1,11 +1,15 @@
 from rest_framework import serializers
 
 from .models import CustomUser
+from core.images import SrcsetField, ThumbnailFieldsSerializerMixin
 
 
-class CustomUserURLRepresentationMixin(serializers.ModelSerializer):
+class CustomUserURLRepresentationMixin(
+    ThumbnailFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Deliver consistent relative URLs of user profile images.
+    NB: thumbnails are serialized with cached URLs by `ThumbnailFieldsSerializerMixin`.
     """
 
     def to_representation(self, instance):
@@ -14,15 +18,11 @@ class CustomUserURLRepresentationMixin(serializers.ModelSerializer):
         Issue: https://forum.djangoproject.com/t/drf-imagefield-serializes-entire-url-with-domain-name/6975
         """
         ret = super().to_representation(instance)
-        ret["profile_image"] = (
-            instance.profile_image.url if instance.profile_image else ""
-        )
-        ret["profile_image_thumbnail_small"] = (
-            instance.profile_image_thumbnail_small.url if instance.profile_image else ""
-        )
-        ret["profile_image_thumbnail_large"] = (
-            instance.profile_image_thumbnail_large.url if instance.profile_image else ""
-        )
+        # NB: fields may be omitted by `SparseFieldsetsSerializerMixin` of the parent serializer.
+        if "profile_image" in ret:
+            ret["profile_image"] = (
+                instance.profile_image.url if instance.profile_image else ""
+            )
         return ret
 
 
@@ -33,6 +33,8 @@ class CustomUserDetailSerializer(
     Detailed Serializer for CustomUser model.
     """
 
+    profile_image_srcset = SrcsetField(source="profile_image")
+
     class Meta:
         model = CustomUser
         fields = [
@@ -44,6 +46,10 @@ class CustomUserDetailSerializer(
             "profile_image",
             "profile_image_thumbnail_small",
             "profile_image_thumbnail_large",
+            "profile_image_srcset",
+            "profile_image_width",
+            "profile_image_height",
+            "profile_image_placeholder",
             "is_active",
             "is_staff",
             "is_superuser",
@@ -59,6 +65,8 @@ class CustomUserMinimalSerializer(
     Serializer for CustomUser model - minimal public data.
     """
 
+    profile_image_srcset = SrcsetField(source="profile_image")
+
     class Meta:
         model = CustomUser
         fields = [
@@ -67,4 +75,8 @@ class CustomUserMinimalSerializer(
             "profile_image",
             "profile_image_thumbnail_small",
             "profile_image_thumbnail_large",
+            "profile_image_srcset",
+            "profile_image_width",
+            "profile_image_height",
+            "profile_image_placeholder",
         ]
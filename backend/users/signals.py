@@ -0,0 +1,28 @@
+"""
+Signal handlers for models from `users` app.
+
+Connected in `UsersConfig.ready()`.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance: Token, **kwargs):
+    """
+    Stop authenticating with the deleted token (e.g. on logout).
+    """
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_changed_user_tokens(sender, instance, **kwargs):
+    """
+    Authenticate with the changed user's tokens again, to get current user (e.g. deactivated).
+    """
+    invalidate_user_tokens(instance.pk)
@@ -0,0 +1,126 @@
+import json
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from users.authentication import (
+    CachedTokenAuthentication,
+    TokenCache,
+    get_shared_cache_key,
+    token_cache,
+)
+from users.models import CustomUser
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    """
+    Test caching of authenticated users by `CachedTokenAuthentication`.
+    """
+
+    username = "testuser"
+    password = "password"
+    url = "/api/v1/user/details/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.new_user = CustomUser.objects.create_user(
+            cls.username, password=cls.password, first_name="Ivan"
+        )
+
+    def setUp(self):
+        token_cache.clear()
+        response = self.client.post(
+            "/api/v1/token/login/",
+            {"username": self.username, "password": self.password},
+        )
+        self.headers = {
+            "HTTP_AUTHORIZATION": "Token " + json.loads(response.content)["auth_token"]
+        }
+
+    def get_user_details(self):
+        return self.client.get(self.url, **self.headers)
+
+    def test_authenticated_user_cached(self):
+        """
+        Ensure that the user is looked up once per token, and changes of the user are seen.
+        """
+        with self.assertNumQueries(1):
+            response = self.get_user_details()
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.get_user_details()
+        self.assertEqual(json.loads(response.content)["first_name"], "Ivan")
+
+        self.new_user.first_name = "Petr"
+        self.new_user.save()
+        response = self.get_user_details()
+        self.assertEqual(json.loads(response.content)["first_name"], "Petr")
+
+        self.new_user.is_active = False
+        self.new_user.save()
+        self.assertEqual(self.get_user_details().status_code, 401)
+
+    @override_settings(TOKEN_CACHE_SHARED=True)
+    def test_logout_invalidates_token(self):
+        """
+        Ensure that the token deleted on logout isn't authenticated from in-process or shared cache.
+        """
+        self.assertEqual(self.get_user_details().status_code, 200)
+        token_cache.clear()
+        with self.assertNumQueries(0):
+            # From shared cache
+            self.assertEqual(self.get_user_details().status_code, 200)
+
+        response = self.client.post("/api/v1/token/logout/", **self.headers)
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(self.get_user_details().status_code, 401)
+
+    @override_settings(TOKEN_CACHE_SHARED=True)
+    def test_password_not_cached(self):
+        """
+        Ensure that the password hash isn't stored in the shared cache and is read from the database when accessed.
+        """
+        key = self.headers["HTTP_AUTHORIZATION"].split()[1]
+        self.assertEqual(self.get_user_details().status_code, 200)
+        self.assertNotIn(
+            self.new_user.password.encode(), cache.get(get_shared_cache_key(key))
+        )
+
+        token_cache.clear()
+        with self.assertNumQueries(0):
+            user, token = CachedTokenAuthentication().authenticate_credentials(key)
+        self.assertEqual((user.pk, user.first_name), (self.new_user.pk, "Ivan"))
+        self.assertEqual((token.key, token.user_id), (key, self.new_user.pk))
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password(self.password))
+
+
+class TokenCacheTest(TestCase):
+    """
+    Test LRU cache of tokens.
+    """
+
+    def test_size_and_ttl(self):
+        """
+        Ensure that least recently used and expired entries are removed.
+        """
+        cache = TokenCache(size=2, ttl=60)
+        cache.set("first", 1, b"first")
+        cache.set("second", 2, b"second")
+        cache.get("first")
+        cache.set("third", 1, b"third")
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("first"), b"first")
+
+        cache.delete_user(1)
+        self.assertIsNone(cache.get("first"))
+        self.assertIsNone(cache.get("third"))
+
+        cache = TokenCache(size=2, ttl=0.01)
+        cache.set("first", 1, b"first")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("first"))
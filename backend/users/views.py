@@ -1,9 +1,9 @@
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import CustomUser
+from .authentication import CachedTokenAuthentication
 from .serializers import CustomUserDetailSerializer
 
 
@@ -12,7 +12,7 @@ class AuthenticatedUserDetailView(APIView):
     Return logged in user's detailed info.
     """
 
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     @staticmethod
@@ -20,6 +20,7 @@ class AuthenticatedUserDetailView(APIView):
         """
         Return logged in user's detailed info.
         """
-        user = CustomUser.objects.filter(pk=request.user.pk).first()
-        serializer = CustomUserDetailSerializer(user, many=False)
+        # NB: the user may be cached by `CachedTokenAuthentication`: changes made in this process are seen at once,
+        # changes made by other processes - in up to `TOKEN_CACHE_TTL` seconds.
+        serializer = CustomUserDetailSerializer(request.user, many=False)
         return Response(serializer.data)
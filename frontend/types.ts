@@ -53,7 +53,7 @@ export interface Book {
   cover_thumbnail_small?: string;
   cover_thumbnail_medium?: string;
   cover_thumbnail_large?: string;
-  file?: string;
+  file?: string; // API URL of the file (staff only, see `BookDownloadView`), or empty string
   created?: Date;
   updated?: Date;
 }
@@ -79,6 +79,12 @@ export interface ListPage<T> {
 export interface AuthToken {
   auth_token: string;
 }
+
+export interface DownloadLink {
+  // This corresponds to `BookDownloadLinkView` response
+  url: string; // signed link to download book's file
+  expires_in: number; // link lifetime, in seconds
+}
 export interface BookListItem {
   // This corresponds to `ListItemDetailSerializer`
   id: ID;
@@ -100,3 +106,24 @@ export interface BookList {
   created: Date;
   updated: Date;
 }
+
+export interface BookListCover {
+  // This corresponds to `ListItemCoverSerializer`
+  book: ID;
+  title: string;
+  cover_thumbnail_small: string;
+  cover_placeholder: string;
+}
+
+export interface BookListSummary {
+  // This corresponds to `ListSummarySerializer` (`/lists/?summary=true`)
+  id: ID;
+  user: User;
+  title: string;
+  description: string;
+  is_public: boolean;
+  items_count: number; // number of books in the list
+  covers: BookListCover[]; // first covers of books in the list
+  created: Date;
+  updated: Date;
+}
@@ -12,7 +12,9 @@ import type {
   Note,
   User,
   AuthToken,
+  DownloadLink,
   BookList,
+  BookListSummary,
   BookListItem,
 } from "@/types";
 
@@ -110,6 +112,16 @@ export async function updateBookFiles(
   return await get<Book>(`/books/${bookId}/`);
 }
 
+export async function openBookFile(bookId: ID) {
+  // Open Book's file using signed download link (files are only downloaded through API, staff only).
+  const authStore = useAuthStore();
+  const { get } = useApi(undefined, "GET", authStore.token);
+  const { data } = await get<DownloadLink>(`/books/${bookId}/download_link/`);
+  if (data.value) {
+    await navigateTo(getMediaUrl(data.value.url), { external: true });
+  }
+}
+
 /************************************************************************************************************
  *  Publishers API
  *************************************************************************************************************/
@@ -195,11 +207,11 @@ export async function updateNote(noteId: number, text: string) {
  *************************************************************************************************************/
 
 export async function fetchAllBookLists() {
-  // Get all public lists and lists created by authenticated user.
+  // Get summaries (number of books and first covers) of all public lists and lists created by authenticated user.
   // If user is not authenticated, then there will be only public lists.
   const authStore = useAuthStore();
   const { get } = useApi(undefined, "GET", authStore.token);
-  return await get<BookList[]>("/lists/");
+  return await get<BookListSummary[]>("/lists/?summary=true");
 }
 
 export async function fetchBookList(listId: ID | string) {